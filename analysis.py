@@ -0,0 +1,294 @@
+"""
+Ad-hoc Analysis for RSE Sport Monitoring Platform
+Embedded DuckDB engine over the columnar project table: a small query builder
+(dimensions x measures) and read-only SQL, returning Arrow tables
+"""
+
+import threading
+
+import numpy as np
+
+from catalogs import AGENDA_2063, SDG_OPTIONS
+from models import IMPACT_FIELDS, ProjectTable
+
+try:
+    import duckdb
+    import pyarrow as pa
+except ImportError:  # analysis page disabled, the rest of the platform works
+    duckdb = None
+    pa = None
+
+# Dimensions: (label, column of the projects table, bridge table or None).
+# A multi-valued field (sports, levels, audiences, SDGs, aspirations) is stored
+# as the id of its label set; the bridge table lists the labels of each set.
+DIMENSIONS = {
+    "country": ("Pays", "country", None),
+    "organization": ("Organisation", "organization", None),
+    "location": ("Localisation", "location", None),
+    "monitoring_frequency": ("Fréquence de suivi", "monitoring_frequency", None),
+    "impact_social": ("Impact social (1-5)", "impact_social", None),
+    "impact_environmental": ("Impact environnemental (1-5)", "impact_environmental", None),
+    "impact_economic": ("Impact économique (1-5)", "impact_economic", None),
+    "sport": ("Sport", "sport_set", "sport_sets"),
+    "sport_level": ("Niveau sportif", "sport_level_set", "sport_level_sets"),
+    "target_audience": ("Public cible", "target_audience_set", "target_audience_sets"),
+    "sdg": ("ODD", "sdg_mask", "sdg_sets"),
+    "aspiration": ("Aspiration Agenda 2063", "aspiration_mask", "aspiration_sets"),
+}
+
+# Sums computed per group of identical projects before the label sets are
+# expanded, so measures are combinations of them
+PARTIALS = {
+    "n": "COUNT(*)",
+    "sum_budget": "SUM(budget)",
+    "sum_beneficiaries": "SUM(beneficiaries)",
+    "sum_participants": "SUM(indicator_participants)",
+    "sum_sessions": "SUM(indicator_sessions)",
+    "sum_hours": "SUM(indicator_hours)",
+    "sum_social": "SUM(impact_social)",
+    "sum_environmental": "SUM(impact_environmental)",
+    "sum_economic": "SUM(impact_economic)",
+}
+
+MEASURES = {
+    "projects": ("Projets", "CAST(SUM(n) AS BIGINT)"),
+    "budget": ("Budget total (€)", "SUM(sum_budget)"),
+    "average_budget": ("Budget moyen (€)", "SUM(sum_budget) / SUM(n)"),
+    "beneficiaries": ("Bénéficiaires", "CAST(SUM(sum_beneficiaries) AS BIGINT)"),
+    "budget_per_beneficiary": ("Budget par bénéficiaire (€)", "SUM(sum_budget) / NULLIF(SUM(sum_beneficiaries), 0)"),
+    "participants": ("Participants", "CAST(SUM(sum_participants) AS BIGINT)"),
+    "sessions": ("Sessions", "CAST(SUM(sum_sessions) AS BIGINT)"),
+    "hours": ("Heures", "CAST(SUM(sum_hours) AS BIGINT)"),
+    "impact_social": ("Impact social moyen", "SUM(sum_social) / SUM(n)"),
+    "impact_environmental": ("Impact environnemental moyen", "SUM(sum_environmental) / SUM(n)"),
+    "impact_economic": ("Impact économique moyen", "SUM(sum_economic) / SUM(n)"),
+}
+
+# Example queries offered in the SQL box
+PRESETS = {
+    "Budget par bénéficiaire selon le niveau sportif": """
+SELECT l.sport_level AS niveau,
+       SUM(g.projets) AS projets,
+       SUM(g.budget) / NULLIF(SUM(g.beneficiaires), 0) AS budget_par_beneficiaire
+FROM (SELECT sport_level_set, COUNT(*) AS projets, SUM(budget) AS budget, SUM(beneficiaries) AS beneficiaires
+      FROM projects GROUP BY ALL) g
+JOIN sport_level_sets l USING (sport_level_set)
+GROUP BY ALL
+ORDER BY budget_par_beneficiaire DESC""",
+    "Co-occurrence des ODD": """
+SELECT a.sdg AS odd_a, b.sdg AS odd_b, SUM(g.projets) AS projets
+FROM (SELECT sdg_mask, COUNT(*) AS projets FROM projects GROUP BY ALL) g
+JOIN sdg_sets a USING (sdg_mask)
+JOIN sdg_sets b ON b.sdg_mask = g.sdg_mask AND a.sdg < b.sdg
+GROUP BY ALL
+ORDER BY projets DESC
+LIMIT 20""",
+    "Public cible × pays": """
+SELECT a.target_audience AS public, g.country AS pays, SUM(g.projets) AS projets, SUM(g.beneficiaires) AS beneficiaires
+FROM (SELECT target_audience_set, country, COUNT(*) AS projets, SUM(beneficiaries) AS beneficiaires
+      FROM projects GROUP BY ALL) g
+JOIN target_audience_sets a USING (target_audience_set)
+GROUP BY ALL
+ORDER BY public, projets DESC""",
+    "Projets par niveau (vue simple, une ligne par projet et niveau)": """
+SELECT sport_level, COUNT(*) AS projets
+FROM project_levels
+GROUP BY ALL
+ORDER BY projets DESC""",
+}
+
+# Tables and views a SQL query can read, for the schema help
+TABLES = {
+    "projects": "un projet par ligne (row, id, name, country, budget, beneficiaries, indicateurs, "
+                "impacts 1-5, sdg_mask, aspiration_mask, *_set)",
+    "sport_sets, sport_level_sets, target_audience_sets": "libellés de chaque ensemble (*_set, valeur)",
+    "sdg_sets, aspiration_sets": "numéros et libellés de chaque masque (sdg_mask, sdg, sdg_label...)",
+    "project_sports, project_levels, project_audiences, project_sdgs, project_aspirations":
+        "vues une ligne par (row, valeur)",
+}
+
+# One row per (project, value) views for hand-written SQL
+VIEWS = {
+    "project_sports": ("sport_set", "sport_sets"),
+    "project_levels": ("sport_level_set", "sport_level_sets"),
+    "project_audiences": ("target_audience_set", "target_audience_sets"),
+    "project_sdgs": ("sdg_mask", "sdg_sets"),
+    "project_aspirations": ("aspiration_mask", "aspiration_sets"),
+}
+
+MAX_SQL_ROWS = 10000
+
+
+class AnalysisError(Exception):
+    """Invalid or refused analysis query (message in French)"""
+
+
+def _quoted(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _dictionary(codes, labels):
+    return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int32()), pa.array(labels, type=pa.string()))
+
+
+def _encode(values):
+    """Dictionary-encode interned labels (few distinct values)"""
+    lookup = {}
+    codes = np.fromiter((lookup.setdefault(v, len(lookup)) for v in values), dtype=np.int32, count=len(values))
+    return _dictionary(codes, list(lookup))
+
+
+def _label_sets(values, column):
+    """
+    Set ids of a list column holding shared tuples, and the bridge table
+    (set id, label) of the distinct sets
+    """
+    sets = {}
+    ids = np.fromiter((sets.setdefault(labels, len(sets)) for labels in values), dtype=np.int32, count=len(values))
+    bridge_ids = [i for labels, i in sets.items() for _ in labels or ()]
+    labels = [label for labels in sets for label in labels or ()]
+    return ids, pa.table({f"{column}_set": pa.array(bridge_ids, type=pa.int32()), column: _encode(labels)})
+
+
+def _mask_sets(masks, column, labels):
+    """Bridge table (mask, number, label) of the distinct bit masks of a column"""
+    distinct = np.unique(masks)
+    bits = np.arange(len(labels))
+    present = (distinct[:, None].astype(np.int64) >> bits[None, :]) & 1
+    mask_index, bit = np.nonzero(present)
+    return pa.table({
+        f"{column}_mask": distinct[mask_index],
+        column: pa.array((bit + 1).astype(np.int8)),
+        f"{column}_label": _dictionary(bit.astype(np.int32), labels),
+    })
+
+
+class PortfolioAnalysis:
+    """
+    DuckDB connection over one version of a portfolio
+
+    The columnar project table is exposed to DuckDB as Arrow tables (numeric
+    columns without copy) and results come back as Arrow tables, which
+    ``st.dataframe`` renders directly. The connection cannot read files or
+    change its configuration, and only SELECT statements are accepted.
+    """
+
+    def __init__(self, projects):
+        if duckdb is None:
+            raise AnalysisError("Le module duckdb n'est pas installé (pip install duckdb pyarrow).")
+        table = projects if isinstance(projects, ProjectTable) else ProjectTable.from_projects(projects)
+        rows = np.arange(len(table), dtype=np.int32)
+        columns = table.columns
+        projects_table = {
+            "row": rows,
+            "id": pa.array(columns["id"], type=pa.string()),
+            "name": pa.array(columns["name"], type=pa.string()),
+            **{
+                name: _dictionary(columns[name], table.categories[name])
+                for name in ProjectTable.DICTIONARY_COLUMNS
+            },
+            "location": _encode(columns["location"]),
+            "start_date": pa.array(columns["start_date"], type=pa.string()),
+            "end_date": pa.array(columns["end_date"], type=pa.string()),
+            **{name: columns[name] for name in ProjectTable.NUMERIC_COLUMNS},
+            **{name: np.ascontiguousarray(table.impacts[:, i]) for i, name in enumerate(IMPACT_FIELDS)},
+        }
+        tables = {
+            "sdg_sets": _mask_sets(columns["sdg_mask"], "sdg", SDG_OPTIONS),
+            "aspiration_sets": _mask_sets(columns["aspiration_mask"], "aspiration", AGENDA_2063),
+        }
+        for field, column in (("sports", "sport"), ("sport_level", "sport_level"),
+                              ("target_audience", "target_audience")):
+            projects_table[f"{column}_set"], tables[f"{column}_sets"] = _label_sets(columns[field], column)
+        tables["projects"] = pa.table(projects_table)
+
+        self._connection = duckdb.connect()
+        for name, arrow_table in tables.items():
+            self._connection.register(name, arrow_table)
+        for view, (column, bridge) in VIEWS.items():
+            self._connection.execute(
+                f"CREATE VIEW {view} AS SELECT p.row, b.* EXCLUDE ({column}) FROM projects p JOIN {bridge} b USING ({column})"
+            )
+        self._connection.execute("SET enable_external_access = false")
+        self._connection.execute("SET lock_configuration = true")
+        # A connection runs one query at a time; sessions share it
+        self._lock = threading.Lock()
+        self.size = len(table)
+
+    def _run(self, sql, params=None):
+        with self._lock:
+            return self._connection.execute(sql, params or []).to_arrow_table()
+
+    def aggregate(self, dimensions, measures, filters=None, limit=None):
+        """
+        Group projects by ``dimensions`` (keys of DIMENSIONS) and compute
+        ``measures`` (keys of MEASURES); ``filters`` maps dimensions to the
+        values to keep. Returns an Arrow table with French column names.
+        """
+        if not measures:
+            raise AnalysisError("Choisissez au moins une mesure.")
+        for key in [*dimensions, *(filters or {})]:
+            if key not in DIMENSIONS:
+                raise AnalysisError(f"Dimension inconnue : {key}")
+        for key in measures:
+            if key not in MEASURES:
+                raise AnalysisError(f"Mesure inconnue : {key}")
+
+        # Projects are first summed per distinct combination of the grouped
+        # columns (label sets included): few rows, then joined to the bridges
+        where, params = [], []
+        for key, values in (filters or {}).items():
+            if not values:
+                continue
+            _, column, bridge = DIMENSIONS[key]
+            label = column if bridge is None else key
+            condition = f"CAST({label} AS VARCHAR) IN ({', '.join('?' * len(values))})"
+            if bridge is not None:
+                condition = f"{column} IN (SELECT {column} FROM {bridge} WHERE {condition})"
+            where.append(condition)
+            params.extend(str(value) for value in values)
+        grouped = list(dict.fromkeys(DIMENSIONS[key][1] for key in dimensions))
+        partials = ", ".join(f"{expression} AS {name}" for name, expression in PARTIALS.items())
+        inner = f"SELECT {''.join(c + ', ' for c in grouped)}{partials} FROM projects"
+        if where:
+            inner += " WHERE " + " AND ".join(where)
+        if grouped:
+            inner += " GROUP BY " + ", ".join(grouped)
+
+        joins = "".join(
+            f" JOIN {DIMENSIONS[key][2]} USING ({DIMENSIONS[key][1]})" for key in dimensions if DIMENSIONS[key][2]
+        )
+        selected = [
+            f"{key if DIMENSIONS[key][2] else DIMENSIONS[key][1]} AS {_quoted(DIMENSIONS[key][0])}"
+            for key in dimensions
+        ]
+        selected += [f"{MEASURES[key][1]} AS {_quoted(MEASURES[key][0])}" for key in measures]
+        sql = f"SELECT {', '.join(selected)} FROM ({inner}) g{joins}"
+        if dimensions:
+            sql += " GROUP BY " + ", ".join(str(i + 1) for i in range(len(dimensions)))
+            sql += f" ORDER BY {len(dimensions) + 1} DESC NULLS LAST"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self._run(sql, params)
+
+    def values(self, dimension):
+        """Distinct values of a dimension, sorted (e.g. for filter choices)"""
+        _, column, bridge = DIMENSIONS[dimension]
+        source = f"{bridge}" if bridge else "projects"
+        label = dimension if bridge else column
+        return self._run(f"SELECT DISTINCT {label} AS value FROM {source} ORDER BY 1").column("value").to_pylist()
+
+    def sql(self, query, max_rows=MAX_SQL_ROWS):
+        """Run one read-only SQL query; at most ``max_rows`` rows are returned"""
+        try:
+            with self._lock:
+                statements = self._connection.extract_statements(query)
+        except duckdb.Error as e:
+            raise AnalysisError(f"Requête invalide : {e}")
+        if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+            raise AnalysisError("Une seule requête SELECT est acceptée.")
+        try:
+            # On its own lines, so a trailing -- comment cannot swallow the parenthesis
+            return self._run(f"SELECT * FROM (\n{statements[0].query}\n) LIMIT {int(max_rows)}")
+        except duckdb.Error as e:
+            raise AnalysisError(str(e))
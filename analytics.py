@@ -0,0 +1,84 @@
+"""
+Portfolio Analytics for RSE Sport Monitoring Platform
+Dashboard aggregates shared by the Streamlit app and the REST API
+
+Projects are normalized at ingestion (see validation.py), so every field is
+present with its canonical type and is read without defensive defaults.
+"""
+
+IMPACT_MAP = {"Très faible": 1, "Faible": 2, "Moyen": 3, "Fort": 4, "Très fort": 5}
+
+
+def parse_sdg_num(sdg_text):
+    """Extract the SDG number from a label such as 'ODD 3: Bonne santé'"""
+    return int(sdg_text.split(':')[0].replace('ODD', '').strip())
+
+
+def impact_score(project):
+    """Mean of the social, environmental and economic impact levels (1-5)"""
+    return (
+        IMPACT_MAP[project['impact_social']]
+        + IMPACT_MAP[project['impact_environmental']]
+        + IMPACT_MAP[project['impact_economic']]
+    ) / 3
+
+
+def compute_kpis(projects):
+    """Headline metrics displayed at the top of the dashboard"""
+    return {
+        "total_projects": len(projects),
+        "total_budget": sum(p['budget'] for p in projects),
+        "total_beneficiaries": sum(p['beneficiaries'] for p in projects),
+        "unique_countries": len(set(p['country'] for p in projects)),
+    }
+
+
+def country_distribution(projects):
+    """Number of projects per country"""
+    country_counts = {}
+    for p in projects:
+        country = p['country'] or 'Inconnu'
+        country_counts[country] = country_counts.get(country, 0) + 1
+    return country_counts
+
+
+def sport_distribution(projects):
+    """Number of projects practicing each sport"""
+    sport_counts = {}
+    for p in projects:
+        for sport in p['sports']:
+            sport_counts[sport] = sport_counts.get(sport, 0) + 1
+    return sport_counts
+
+
+def sdg_distribution(projects):
+    """Number of projects aligned with each SDG, keyed by SDG number"""
+    sdg_counts = {}
+    for p in projects:
+        for sdg_text in p['sdgs']:
+            sdg_num = parse_sdg_num(sdg_text)
+            sdg_counts[sdg_num] = sdg_counts.get(sdg_num, 0) + 1
+    return sdg_counts
+
+
+def impact_averages(projects):
+    """Average social / environmental / economic impact on a 1-5 scale"""
+    if not projects:
+        return {"Social": 0, "Environnemental": 0, "Économique": 0}
+    n = len(projects)
+    return {
+        "Social": sum(IMPACT_MAP[p['impact_social']] for p in projects) / n,
+        "Environnemental": sum(IMPACT_MAP[p['impact_environmental']] for p in projects) / n,
+        "Économique": sum(IMPACT_MAP[p['impact_economic']] for p in projects) / n,
+    }
+
+
+def dashboard_aggregates(projects):
+    """All dashboard aggregates in a single JSON-serializable dictionary"""
+    return {
+        "kpis": compute_kpis(projects),
+        "countries": country_distribution(projects),
+        "sports": sport_distribution(projects),
+        "sdgs": sdg_distribution(projects),
+        "impact": impact_averages(projects),
+    }
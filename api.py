@@ -0,0 +1,642 @@
+"""
+REST/JSON API for RSE Sport Monitoring Platform
+Headless access to projects, dashboard aggregates, recommendations and PDF reports
+
+Routes are served for the default portfolio at the root and for any client
+portfolio under ``/tenants/{tenant_id}/``.
+
+Run with:
+    uvicorn api:app --host 0.0.0.0 --port 8000 --workers 4
+"""
+
+import html
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from urllib.parse import quote
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import HTMLResponse, JSONResponse, Response
+from starlette.routing import Mount, Route
+
+from analytics import dashboard_aggregates
+from benchmarking import Benchmark
+from coverage import OBJECTIVES, coverage_report
+from diagnostics import PortfolioDiagnostics
+from geo import geo_aggregates
+from history import describe
+from html_report import generate_html_report, generate_portfolio_html
+from optimizer import optimize_budget
+from pdf_generator import generate_pdf_report, generate_portfolio_report
+from report_templates import DEFAULT_TEMPLATE, REPORT_TEMPLATES
+from similarity import SimilarityIndex
+from recommendations import generate_recommendations
+from scoring import DEFAULT_PROFILE, FEATURES, ImpactModel, WEIGHT_PROFILES, weight_vector
+from search import SearchIndex, snippet
+from snapshots import PortfolioSnapshot, diff
+from storage import DEFAULT_TENANT, EditConflict, ProjectNotFound, TenantRegistry
+from validation import ValidationError, normalize_changes, normalize_project
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Each tenant has its own store and its own cache of derived results
+tenants = TenantRegistry(os.environ.get("RSE_DATA_DIR"))
+
+# Benchmarks, similarity and full-text indexes outlive store versions: they
+# follow writes incrementally instead of being dropped with the version cache,
+# and go away with unloaded tenants
+TRACKED_INDEXES = {
+    "benchmark": Benchmark, "similarity": SimilarityIndex, "search": SearchIndex, "impact": ImpactModel,
+}
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+# Portfolio snapshots of past versions are immutable: the most recently used
+# ones are kept per tenant, and new ones share their unchanged chunks
+SNAPSHOT_CACHE = 8
+_snapshots = weakref.WeakKeyDictionary()
+
+MAX_SIMILAR = 50
+DEFAULT_SEARCH_RESULTS = 20
+MAX_SEARCH_RESULTS = 100
+
+
+class InvalidTenant(Exception):
+    pass
+
+
+async def _store(request):
+    """Resolve the tenant store of a request (default tenant outside /tenants/)"""
+    # Loading a tenant and catching up with the log block: run them in the
+    # thread pool so a large portfolio never stalls requests for the others
+    try:
+        store = await run_in_threadpool(tenants.get, request.path_params.get("tenant_id", DEFAULT_TENANT))
+    except ValueError as e:
+        raise InvalidTenant(str(e))
+    await run_in_threadpool(store.refresh)
+    return store
+
+
+def _etag(*parts):
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+async def _conditional(request, etag, build_response):
+    """Answer 304 when the client already holds the current representation"""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    # Aggregates, indexes and templates are CPU bound: build off the event loop
+    response = await run_in_threadpool(build_response)
+    response.headers["ETag"] = etag
+    return response
+
+
+def _int_param(request, name, default, minimum=1, maximum=None):
+    try:
+        value = int(request.query_params.get(name, default))
+    except ValueError:
+        value = default
+    value = max(minimum, value)
+    return min(value, maximum) if maximum else value
+
+
+async def _invalid_tenant(request, exc):
+    return JSONResponse({"detail": str(exc)}, status_code=400)
+
+
+def _not_found(project_id):
+    return JSONResponse({"detail": f"Projet introuvable : {project_id}"}, status_code=404)
+
+
+async def _validation_error(request, exc):
+    return JSONResponse({"detail": exc.errors}, status_code=422)
+
+
+async def _edit_conflict(request, exc):
+    return JSONResponse({"detail": str(exc), "fields": exc.fields, "current": exc.current}, status_code=409)
+
+
+async def _json_body(request):
+    body = await request.json()
+    if not isinstance(body, dict):
+        raise ValidationError(["Le corps de la requête doit être un objet JSON."])
+    return body
+
+
+# ============================================================================
+# PROJECTS
+# ============================================================================
+
+def _project_etag(project):
+    # Changes with every write to the project, and only then
+    return _etag(project["id"], "rev", project.get("revision", 0))
+
+
+def _expected_revision(request, body=None):
+    """
+    Revision the client edited, from an If-Match header (project ETag or
+    plain number) or a ``revision`` field of the body; None if not given
+    """
+    value = request.headers.get("if-match") or (body or {}).get("revision")
+    if value is None:
+        return None
+    try:
+        return int(str(value).strip('W/"').rsplit("-", 1)[-1])
+    except ValueError:
+        raise ValidationError([f"If-Match : révision invalide ({value})"])
+
+
+async def list_projects(request):
+    store = await _store(request)
+    page = _int_param(request, "page", 1)
+    per_page = _int_param(request, "per_page", DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE)
+    at = min(_int_param(request, "at", store.version, minimum=0), store.version)
+
+    def build():
+        # Point-in-time view: the list as it was after write number ``at``
+        projects = store.list_projects() if at == store.version else store.projects_at(at)
+        start = (page - 1) * per_page
+        return JSONResponse({
+            "items": projects[start:start + per_page],
+            "page": page,
+            "per_page": per_page,
+            "total": len(projects),
+        })
+
+    return await _conditional(request, _etag(store.version, page, per_page, at), build)
+
+
+async def create_project(request):
+    store = await _store(request)
+    project_data = normalize_project(await _json_body(request))
+    project = await run_in_threadpool(store.create, project_data)
+    return JSONResponse(project, status_code=201, headers={"ETag": _project_etag(project)})
+
+
+async def get_project(request):
+    store = await _store(request)
+    project_id = request.path_params["project_id"]
+    try:
+        project = store.get(project_id)
+    except ProjectNotFound:
+        return _not_found(project_id)
+    return await _conditional(request, _project_etag(project), lambda: JSONResponse(project))
+
+
+async def update_project(request):
+    store = await _store(request)
+    project_id = request.path_params["project_id"]
+    body = await _json_body(request)
+    changes = normalize_changes(body) if request.method == "PATCH" else normalize_project(body)
+    # With a revision, edits made meanwhile by others are merged field by
+    # field; overlapping ones answer 409 with the current project
+    try:
+        project = await run_in_threadpool(store.update, project_id, changes, _expected_revision(request, body))
+    except ProjectNotFound:
+        return _not_found(project_id)
+    return JSONResponse(project, headers={"ETag": _project_etag(project)})
+
+
+async def delete_project(request):
+    store = await _store(request)
+    project_id = request.path_params["project_id"]
+    try:
+        await run_in_threadpool(store.delete, project_id, _expected_revision(request))
+    except ProjectNotFound:
+        return _not_found(project_id)
+    return Response(status_code=204)
+
+
+# ============================================================================
+# HISTORY
+# ============================================================================
+
+def _event_summary(event):
+    return {
+        "version": event["version"],
+        "type": event["type"],
+        "timestamp": event["timestamp"],
+        "target": event.get("target"),
+        "projects": [(after or before)["id"] for _, before, after in event["changes"]],
+        "description": describe(event),
+    }
+
+
+async def history(request):
+    store = await _store(request)
+    since = _int_param(request, "since", 0, minimum=0)
+    project_id = request.path_params.get("project_id")
+    if project_id is not None:
+        try:
+            store.get(project_id)
+        except ProjectNotFound:
+            # Deleted projects keep their audit trail
+            if not await run_in_threadpool(store.history, since, project_id):
+                return _not_found(project_id)
+    full = request.query_params.get("changes") == "1"
+    return await _conditional(
+        request,
+        _etag(store.version, "history", project_id, since, full),
+        lambda: JSONResponse([
+            event if full else _event_summary(event)
+            for event in store.history(since, project_id)
+        ]),
+    )
+
+
+def _snapshot(store, version):
+    with _indexes_lock:
+        cache = _snapshots.setdefault(store, OrderedDict())
+        snapshot = cache.get(version)
+        if snapshot is not None:
+            cache.move_to_end(version)
+            return snapshot
+        projects = store.list_projects() if version == store.version else store.projects_at(version)
+        previous = cache[min(cache, key=lambda v: abs(v - version))] if cache else None
+        snapshot = cache[version] = PortfolioSnapshot.take(projects, previous, version)
+        while len(cache) > SNAPSHOT_CACHE:
+            cache.popitem(last=False)
+        return snapshot
+
+
+def _version_param(store, value):
+    """Version number or reporting period label; None if unknown"""
+    if value is None:
+        return store.version
+    if value.isdigit():
+        return int(value) if int(value) <= store.version else None
+    period = store.periods().get(value)
+    return period["version"] if period else None
+
+
+async def list_snapshots(request):
+    store = await _store(request)
+    return JSONResponse(store.periods())
+
+
+async def create_snapshot(request):
+    store = await _store(request)
+    label = str((await _json_body(request)).get("label") or "").strip()
+    if not label or label.isdigit():
+        raise ValidationError(["Le libellé de la période est obligatoire et ne peut pas être un simple nombre."])
+    period = await run_in_threadpool(store.mark_period, label)
+    return JSONResponse({"label": label, **period}, status_code=201)
+
+
+async def portfolio_diff(request):
+    store = await _store(request)
+    params = request.query_params
+    old, new = _version_param(store, params.get("from", "0")), _version_param(store, params.get("to"))
+    if old is None or new is None:
+        return JSONResponse({"detail": "Version ou période inconnue."}, status_code=404)
+
+    def build():
+        result = diff(_snapshot(store, old), _snapshot(store, new))
+        result["from"], result["to"] = params.get("from", "0"), params.get("to", str(store.version))
+        return JSONResponse(result)
+
+    return await _conditional(request, _etag(store.version, "diff", old, new), build)
+
+
+async def _revert(request, revert):
+    store = await _store(request)
+    event = await run_in_threadpool(revert, store)
+    if event is None:
+        return JSONResponse({"detail": "Aucune modification à annuler ou rétablir."}, status_code=409)
+    return JSONResponse(_event_summary(event), headers={"ETag": _etag(store.version)})
+
+
+async def undo(request):
+    return await _revert(request, lambda store: store.undo())
+
+
+async def redo(request):
+    return await _revert(request, lambda store: store.redo())
+
+
+# ============================================================================
+# ANALYTICS & REPORTS
+# ============================================================================
+
+async def dashboard(request):
+    store = await _store(request)
+    return await _conditional(
+        request,
+        _etag(store.version, "dashboard"),
+        lambda: JSONResponse(store.cached("dashboard", lambda: dashboard_aggregates(store.list_projects()))),
+    )
+
+
+async def geo_map(request):
+    store = await _store(request)
+    return await _conditional(
+        request,
+        _etag(store.version, "geo"),
+        lambda: JSONResponse(store.cached("geo", lambda: geo_aggregates(store.list_projects()))),
+    )
+
+
+async def portfolio_coverage(request):
+    store = await _store(request)
+    objective = request.query_params.get("objective", "sdg")
+    if objective not in OBJECTIVES:
+        return JSONResponse(
+            {"detail": f"Objectif inconnu : {objective}", "objectives": sorted(OBJECTIVES)},
+            status_code=400,
+        )
+    return await _conditional(
+        request,
+        _etag(store.version, "coverage", objective),
+        lambda: JSONResponse(store.cached(
+            ("coverage", objective), lambda: coverage_report(store.table(), objective)
+        )),
+    )
+
+
+async def optimize_portfolio(request):
+    store = await _store(request)
+    body = await _json_body(request)
+    try:
+        options = {
+            name: float(body[name])
+            for name in ("total_budget", "min_budget", "min_share", "max_growth")
+            if body.get(name) is not None
+        }
+        options["country_caps"] = {str(country): float(cap) for country, cap in (body.get("country_caps") or {}).items()}
+        options["sdg_targets"] = {int(num): float(share) for num, share in (body.get("sdg_targets") or {}).items()}
+    except (AttributeError, TypeError, ValueError):
+        raise ValidationError(["Paramètres d'optimisation invalides : montants et parts numériques attendus."])
+    return JSONResponse(await run_in_threadpool(lambda: optimize_budget(store.table(), **options)))
+
+
+async def portfolio_recommendations(request):
+    store = await _store(request)
+    return await _conditional(
+        request,
+        _etag(store.version, "recommendations"),
+        lambda: JSONResponse(store.cached("recommendations", lambda: generate_recommendations(
+            store.list_projects(), _tracked(store, "benchmark"), _tracked(store, "similarity")))),
+    )
+
+
+async def project_recommendations(request):
+    store = await _store(request)
+    project_id = request.path_params["project_id"]
+    try:
+        project = store.get(project_id)
+    except ProjectNotFound:
+        return _not_found(project_id)
+    return await _conditional(
+        request,
+        _etag(store.version, project_id, "recommendations"),
+        lambda: JSONResponse(store.cached(("recommendations", project_id), lambda: generate_recommendations([project]))),
+    )
+
+
+def _render_portfolio_report(store):
+    projects = store.list_projects()
+    return generate_portfolio_report(projects, generate_recommendations(projects)).getvalue()
+
+
+async def portfolio_report(request):
+    store = await _store(request)
+    etag = _etag(store.version, "portfolio-pdf")
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    version = store.version
+    pdf = await run_in_threadpool(store.cache_get, "portfolio-pdf")
+    if pdf is None:
+        pdf = await run_in_threadpool(_render_portfolio_report, store)
+        store.cache_put("portfolio-pdf", pdf, version)
+
+    filename = f"Rapport_Portefeuille_RSE_{datetime.now().strftime('%Y%m%d')}.pdf"
+    return Response(pdf, media_type="application/pdf", headers={
+        "ETag": etag,
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+    })
+
+
+async def portfolio_report_html(request):
+    store = await _store(request)
+    return await _conditional(
+        request,
+        _etag(store.version, "portfolio-html"),
+        lambda: HTMLResponse(store.cached("portfolio-html", lambda: generate_portfolio_html(
+            store.list_projects(), generate_recommendations(store.list_projects())))),
+    )
+
+
+async def project_report_html(request):
+    store = await _store(request)
+    project_id = request.path_params["project_id"]
+    try:
+        project = store.get(project_id)
+    except ProjectNotFound:
+        return _not_found(project_id)
+    return await _conditional(
+        request,
+        _etag(store.version, project_id, "html"),
+        lambda: HTMLResponse(store.cached(("html", project_id), lambda: generate_html_report(
+            project, store.list_projects(), generate_recommendations([project]), diagnostics=_diagnostics(store)))),
+    )
+
+
+def _tracked(store, kind):
+    """Incremental index of a tenant (see TRACKED_INDEXES), brought up to date with the store's latest writes"""
+    with _indexes_lock:
+        entries = _indexes.setdefault(store, {})
+        entry = entries.get(kind)
+        if entry is None:
+            entry = entries[kind] = [None, TRACKED_INDEXES[kind]()]
+        if entry[0] != store.version:
+            version = store.version
+            entry[1].sync(store.list_projects())
+            entry[0] = version
+        return entry[1]
+
+
+async def project_benchmark(request):
+    store = await _store(request)
+    project_id = request.path_params["project_id"]
+    try:
+        store.get(project_id)
+    except ProjectNotFound:
+        return _not_found(project_id)
+
+    def build():
+        # The index knows projects by identity: read the project after the
+        # sync, and catch up once with a write landing in between
+        for _ in range(2):
+            benchmark = _tracked(store, "benchmark")
+            try:
+                return JSONResponse(benchmark.ranks(store.get(project_id)))
+            except KeyError:
+                continue
+        return _not_found(project_id)
+
+    return await _conditional(request, _etag(store.version, project_id, "benchmark"), build)
+
+
+async def impact_scores(request):
+    store = await _store(request)
+    params = request.query_params
+    profile = params.get("profile", DEFAULT_PROFILE)
+    if profile not in WEIGHT_PROFILES:
+        raise ValidationError([f"Profil de pondération inconnu : {profile}"])
+    # Weights of the profile, overridden feature by feature (?social=3&reach=2)
+    weights = {**WEIGHT_PROFILES[profile][1], **{name: params[name] for name in FEATURES if name in params}}
+    vector = weight_vector(weights)
+    limit = _int_param(request, "limit", max(store.count(), 1))
+    return await _conditional(
+        request,
+        _etag(store.version, "scores", limit, *vector.tolist()),
+        lambda: JSONResponse({
+            "profile": profile,
+            "weights": dict(zip(FEATURES, vector.tolist())),
+            "projects": _tracked(store, "impact").ranking(weights, limit),
+        }),
+    )
+
+
+async def similar_projects(request):
+    store = await _store(request)
+    project_id = request.path_params["project_id"]
+    try:
+        project = store.get(project_id)
+    except ProjectNotFound:
+        return _not_found(project_id)
+    k = _int_param(request, "k", 5, maximum=MAX_SIMILAR)
+
+    def build():
+        neighbours = _tracked(store, "similarity").similar(project, k)
+        return JSONResponse([
+            {"id": other["id"], "name": other["name"], "country": other["country"], "similarity": round(score, 4)}
+            for other, score in neighbours
+        ])
+
+    return await _conditional(request, _etag(store.version, project_id, "similar", k), build)
+
+
+async def search_projects(request):
+    store = await _store(request)
+    query = request.query_params.get("q", "").strip()
+    if not query:
+        return JSONResponse({"detail": "Paramètre de recherche 'q' manquant."}, status_code=400)
+    limit = _int_param(request, "limit", DEFAULT_SEARCH_RESULTS, maximum=MAX_SEARCH_RESULTS)
+
+    def build():
+        results = []
+        for project, score in _tracked(store, "search").search(query, limit):
+            field, extract = snippet(project, query, "<mark>", "</mark>", html.escape)
+            results.append({
+                "id": project["id"], "name": project["name"], "country": project["country"],
+                "score": round(score, 4), "field": field, "snippet": extract,
+            })
+        return JSONResponse(results)
+
+    return await _conditional(request, _etag(store.version, "search", quote(query), limit), build)
+
+
+def _diagnostics(store):
+    """Portfolio diagnostics, computed once per store version and shared by every project report"""
+    return store.cached("diagnostics", lambda: PortfolioDiagnostics(store.list_projects()), shared=False)
+
+
+def _render_report(store, project, template):
+    projects = store.list_projects()
+    buffer = generate_pdf_report(project, projects, generate_recommendations([project]), template, _diagnostics(store))
+    return buffer.getvalue()
+
+
+async def project_report(request):
+    store = await _store(request)
+    project_id = request.path_params["project_id"]
+    try:
+        project = store.get(project_id)
+    except ProjectNotFound:
+        return _not_found(project_id)
+    template = request.query_params.get("template", DEFAULT_TEMPLATE)
+    if template not in REPORT_TEMPLATES:
+        return JSONResponse(
+            {"detail": f"Modèle de rapport inconnu : {template}", "templates": sorted(REPORT_TEMPLATES)},
+            status_code=400,
+        )
+
+    etag = _etag(store.version, project_id, "pdf", template)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # ReportLab layout is CPU bound: keep it off the event loop
+    version = store.version
+    pdf = await run_in_threadpool(store.cache_get, ("pdf", project_id, template))
+    if pdf is None:
+        pdf = await run_in_threadpool(_render_report, store, project, template)
+        store.cache_put(("pdf", project_id, template), pdf, version)
+
+    filename = f"Rapport_RSE_{project.get('name', 'projet').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
+    return Response(pdf, media_type="application/pdf", headers={
+        "ETag": etag,
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+    })
+
+
+async def health(request):
+    return JSONResponse({"status": "ok", "active_tenants": len(tenants.active_tenants())})
+
+
+async def list_tenants(request):
+    return JSONResponse({"tenants": tenants.list_tenants()})
+
+
+portfolio_routes = [
+    Route("/projects", list_projects, methods=["GET"]),
+    Route("/projects", create_project, methods=["POST"]),
+    Route("/projects/{project_id}", get_project, methods=["GET"]),
+    Route("/projects/{project_id}", update_project, methods=["PUT", "PATCH"]),
+    Route("/projects/{project_id}", delete_project, methods=["DELETE"]),
+    Route("/projects/{project_id}/history", history),
+    Route("/projects/{project_id}/recommendations", project_recommendations),
+    Route("/projects/{project_id}/benchmark", project_benchmark),
+    Route("/projects/{project_id}/similar", similar_projects),
+    Route("/projects/{project_id}/report.pdf", project_report),
+    Route("/projects/{project_id}/report.html", project_report_html),
+    Route("/search", search_projects),
+    Route("/scores", impact_scores),
+    Route("/history", history),
+    Route("/snapshots", list_snapshots, methods=["GET"]),
+    Route("/snapshots", create_snapshot, methods=["POST"]),
+    Route("/diff", portfolio_diff),
+    Route("/undo", undo, methods=["POST"]),
+    Route("/redo", redo, methods=["POST"]),
+    Route("/dashboard", dashboard),
+    Route("/geo", geo_map),
+    Route("/coverage", portfolio_coverage),
+    Route("/optimize", optimize_portfolio, methods=["POST"]),
+    Route("/recommendations", portfolio_recommendations),
+    Route("/report.pdf", portfolio_report),
+    Route("/report.html", portfolio_report_html),
+]
+
+routes = [
+    Route("/health", health),
+    Route("/tenants", list_tenants),
+    Mount("/tenants/{tenant_id}", routes=portfolio_routes),
+    *portfolio_routes,
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(GZipMiddleware, minimum_size=1000)],
+    exception_handlers={
+        InvalidTenant: _invalid_tenant,
+        ValidationError: _validation_error,
+        EditConflict: _edit_conflict,
+    },
+)
@@ -6,11 +6,30 @@ from datetime import datetime
 import base64
 from io import BytesIO
 
+from analysis import DIMENSIONS as ANALYSIS_DIMENSIONS, MEASURES as ANALYSIS_MEASURES, PRESETS as SQL_PRESETS, TABLES as SQL_TABLES
+from analysis import AnalysisError, PortfolioAnalysis
+from analytics import compute_kpis, country_distribution, sport_distribution, impact_averages
+from benchmarking import METRICS, DIMENSIONS
+from optimizer import MAX_GROWTH, MIN_SHARE, optimize_budget
+from coverage import GAP_SHARE, WEIGHTS as COVERAGE_WEIGHTS, coverage_report
+from geo import geo_aggregates
+from history import describe, logged
+from snapshots import diff, kpi_deltas
+from scoring import DEFAULT_PROFILE, FEATURES as SCORE_FEATURES, WEIGHT_PROFILES
+from search import FIELD_LABELS as SEARCH_FIELD_LABELS, snippet
+from storage import DEFAULT_TENANT, TENANT_ID_PATTERN, EditConflict, ProjectNotFound
+from workspace import PortfolioHandle, footprint, memory_report, release_idle, workspace
+from catalogs import SDGS
+from models import ProjectTable
+from ui import branding, csv_import, escape_markdown, footer, project_form, tenant_registry
+from validation import ValidationError, normalize_changes
+
 # Import custom modules
 try:
     from mock_data import generate_mock_projects
     from recommendations import generate_recommendations
-    from pdf_generator import generate_pdf_report
+    from pdf_generator import generate_pdf_report, generate_portfolio_report, template_choices
+    from html_report import generate_html_report, static_site_zip
 except ImportError as e:
     # Log the error for debugging
     import streamlit as st
@@ -20,7 +39,15 @@ except ImportError as e:
         return []
     def generate_recommendations(projects):
         return []
-    def generate_pdf_report(project, all_projects=None, recommendations=None):
+    def generate_pdf_report(project, all_projects=None, recommendations=None, template="afd"):
+        return None
+    def template_choices():
+        return {"afd": "AFD - Agence Française de Développement"}
+    def generate_portfolio_report(projects, recommendations=None):
+        return None
+    def generate_html_report(project, all_projects=None, recommendations=None, index_url=None):
+        return None
+    def static_site_zip(projects, recommendations=None, project_recommendations=None):
         return None
 except Exception as e:
     import streamlit as st
@@ -29,7 +56,15 @@ except Exception as e:
         return []
     def generate_recommendations(projects):
         return []
-    def generate_pdf_report(project, all_projects=None, recommendations=None):
+    def generate_pdf_report(project, all_projects=None, recommendations=None, template="afd"):
+        return None
+    def template_choices():
+        return {"afd": "AFD - Agence Française de Développement"}
+    def generate_portfolio_report(projects, recommendations=None):
+        return None
+    def generate_html_report(project, all_projects=None, recommendations=None, index_url=None):
+        return None
+    def static_site_zip(projects, recommendations=None, project_recommendations=None):
         return None
 
 # Configuration de la page
@@ -40,271 +75,15 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# ============================================================================
-# DATA STRUCTURES - Sports, SDGs, Agenda 2063
-# ============================================================================
-
-# Comprehensive Sports List (categorized)
-SPORTS_LIST = {
-    "Sports Collectifs": [
-        "Football", "Basketball", "Volleyball", "Handball", "Rugby", "Hockey sur gazon",
-        "Hockey sur glace", "Water-polo", "Baseball", "Softball", "Cricket", "Futsal",
-        "Beach-volley", "Rugby à 7", "Football américain", "Polo", "Lacrosse", "Kabaddi",
-        "Sepak takraw", "Ultimate frisbee", "Dodgeball", "Netball", "Hurling", "Camogie"
-    ],
-    "Sports Individuels": [
-        "Athlétisme", "Natation", "Cyclisme", "Tennis", "Badminton", "Tennis de table",
-        "Golf", "Boxe", "Judo", "Karaté", "Taekwondo", "Lutte", "Escrime", "Tir",
-        "Tir à l'arc", "Équitation", "Gymnastique", "Haltérophilie", "Triathlon",
-        "Pentathlon moderne", "Ski alpin", "Ski de fond", "Snowboard", "Patinage artistique",
-        "Patinage de vitesse", "Biathlon", "Saut à ski", "Combiné nordique", "Skeleton",
-        "Bobsleigh", "Luge", "Curling", "Surf", "Skateboard", "Escalade sportive",
-        "Voile", "Aviron", "Canoë-kayak", "Plongeon", "Nage synchronisée", "Para-natation"
-    ],
-    "Sports Paralympiques": [
-        "Athlétisme handisport", "Natation handisport", "Basketball fauteuil", "Rugby fauteuil",
-        "Tennis fauteuil", "Tennis de table handisport", "Escrime fauteuil", "Boccia",
-        "Goalball", "Cécifoot", "Volley assis", "Para-cyclisme", "Para-équitation",
-        "Para-aviron", "Para-canoë", "Para-judo", "Para-tir", "Para-tir à l'arc",
-        "Para-triathlon", "Para-haltérophilie", "Para-taekwondo", "Para-badminton"
-    ],
-    "Sports Traditionnels": [
-        "Lutte sénégalaise", "Capoeira", "Kung-fu", "Wushu", "Sumo", "Muay Thai",
-        "Kendo", "Aïkido", "Vovinam", "Silat", "Pétanque", "Boules lyonnaises",
-        "Boomerang", "Sports gaéliques", "Pelote basque"
-    ],
-    "E-Sport": [
-        "League of Legends", "Dota 2", "Counter-Strike", "Valorant", "Fortnite",
-        "FIFA", "eFootball", "NBA 2K", "Rocket League", "Overwatch", "StarCraft",
-        "Rainbow Six Siege", "Call of Duty", "PUBG", "Mobile Legends"
-    ],
-    "Sports de Combat": [
-        "MMA", "Kickboxing", "Boxe française (savate)", "Sambo", "Krav Maga",
-        "Jiu-jitsu brésilien", "Catch", "Pancrace"
-    ],
-    "Sports Nautiques": [
-        "Planche à voile", "Kitesurf", "Stand-up paddle", "Wakeboard", "Ski nautique",
-        "Jet-ski", "Plongée sous-marine", "Nage en eau libre", "Sauvetage côtier"
-    ],
-    "Sports Aériens": [
-        "Parachutisme", "Parapente", "Vol à voile", "Deltaplane", "Base jump", "Wingsuit"
-    ],
-    "Sports Mécaniques": [
-        "Formule 1", "Rallye", "MotoGP", "Karting", "Endurance moto", "Trial",
-        "Speedway", "Rallycross", "Drift", "Formule E"
-    ],
-    "Sports de Montagne": [
-        "Alpinisme", "Randonnée", "Trail running", "VTT", "Ski-alpinisme",
-        "Cascade de glace", "Via ferrata", "Slackline"
-    ],
-    "Autres Sports": [
-        "Danse sportive", "Cheerleading", "Crossfit", "Fitness", "Yoga sportif",
-        "Parkour", "Roller", "BMX", "Squash", "Padel", "Billard", "Fléchettes",
-        "Bowling", "Arts martiaux mixtes", "Powerlifting", "Strongman"
-    ]
-}
-
-# Flatten sports list
-ALL_SPORTS = []
-for category, sports in SPORTS_LIST.items():
-    ALL_SPORTS.extend(sports)
-ALL_SPORTS = sorted(set(ALL_SPORTS))
-
-# 17 SDGs
-SDGS = [
-    {"num": 1, "title": "Pas de pauvreté", "color": "#E5243B"},
-    {"num": 2, "title": "Faim « zéro »", "color": "#DDA63A"},
-    {"num": 3, "title": "Bonne santé et bien-être", "color": "#4C9F38"},
-    {"num": 4, "title": "Éducation de qualité", "color": "#C5192D"},
-    {"num": 5, "title": "Égalité entre les sexes", "color": "#FF3A21"},
-    {"num": 6, "title": "Eau propre et assainissement", "color": "#26BDE2"},
-    {"num": 7, "title": "Énergie propre et d'un coût abordable", "color": "#FCC30B"},
-    {"num": 8, "title": "Travail décent et croissance économique", "color": "#A21942"},
-    {"num": 9, "title": "Industrie, innovation et infrastructure", "color": "#FD6925"},
-    {"num": 10, "title": "Inégalités réduites", "color": "#DD1367"},
-    {"num": 11, "title": "Villes et communautés durables", "color": "#FD9D24"},
-    {"num": 12, "title": "Consommation et production responsables", "color": "#BF8B2E"},
-    {"num": 13, "title": "Mesures relatives à la lutte contre les changements climatiques", "color": "#3F7E44"},
-    {"num": 14, "title": "Vie aquatique", "color": "#0A97D9"},
-    {"num": 15, "title": "Vie terrestre", "color": "#56C02B"},
-    {"num": 16, "title": "Paix, justice et institutions efficaces", "color": "#00689D"},
-    {"num": 17, "title": "Partenariats pour la réalisation des objectifs", "color": "#19486A"},
-]
-
-SDG_OPTIONS = [f"ODD {sdg['num']}: {sdg['title']}" for sdg in SDGS]
-
-# Agenda 2063
-AGENDA_2063 = [
-    "Aspiration 1 : Une Afrique prospère basée sur la croissance inclusive et le développement durable",
-    "Aspiration 2 : Un continent intégré, politiquement uni, ancré dans les idéaux du panafricanisme",
-    "Aspiration 3 : Une Afrique où règnent la bonne gouvernance, la démocratie, le respect des droits humains, la justice et l'État de droit",
-    "Aspiration 4 : Une Afrique vivant dans la paix et la sécurité",
-    "Aspiration 5 : Une Afrique dotée d'une identité culturelle, d'un patrimoine, de valeurs et d'une éthique forts",
-    "Aspiration 6 : Une Afrique dont le développement est axé sur les populations, qui s'appuie sur le potentiel de ses populations, notamment celles des femmes et des jeunes",
-    "Aspiration 7 : Une Afrique forte, résiliente et influente, acteur et partenaire mondial"
-]
-
-# ============================================================================
-# DURABILIS & CO BRANDING - FIXED SIDEBAR CONTRAST
-# ============================================================================
-
-DURABILIS_COLORS = {
-    "primary_blue": "#00A9E0",
-    "secondary_blue": "#2E3192",
-    "dark_grey": "#58595B",
-    "light_grey": "#BCBEC0",
-    "white": "#FFFFFF",
-    "accent": "#00A9E0"
-}
-
-st.markdown(f"""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700&display=swap');
-    
-    * {{
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-    }}
-    
-    .main {{
-        padding: 1.5rem 2rem;
-        background-color: #f8f9fa;
-    }}
-    
-    h1, h2, h3 {{
-        color: {DURABILIS_COLORS['secondary_blue']};
-        font-weight: 700;
-    }}
-    
-    /* CRITICAL FIX: Sidebar contrast */
-    [data-testid="stSidebar"] {{
-        background-color: {DURABILIS_COLORS['secondary_blue']};
-    }}
-    
-    [data-testid="stSidebar"] * {{
-        color: white !important;
-    }}
-    
-    [data-testid="stSidebar"] .stRadio > label {{
-        color: white !important;
-        font-weight: 600;
-    }}
-    
-    [data-testid="stSidebar"] .stRadio > div {{
-        background-color: rgba(255, 255, 255, 0.1);
-        padding: 0.5rem;
-        border-radius: 6px;
-    }}
-    
-    [data-testid="stSidebar"] .stRadio label[data-baseweb="radio"] {{
-        background-color: rgba(255, 255, 255, 0.15);
-        padding: 0.75rem;
-        border-radius: 6px;
-        margin: 0.25rem 0;
-        transition: all 0.3s ease;
-    }}
-    
-    [data-testid="stSidebar"] .stRadio label[data-baseweb="radio"]:hover {{
-        background-color: {DURABILIS_COLORS['primary_blue']};
-        transform: translateX(4px);
-    }}
-    
-    [data-testid="stSidebar"] .stRadio input:checked + div {{
-        background-color: {DURABILIS_COLORS['primary_blue']} !important;
-    }}
-    
-    [data-testid="stSidebar"] h1, 
-    [data-testid="stSidebar"] h2, 
-    [data-testid="stSidebar"] h3 {{
-        color: white !important;
-    }}
-    
-    [data-testid="stSidebar"] hr {{
-        border-color: rgba(255, 255, 255, 0.3);
-    }}
-    
-    /* Title banner */
-    .platform-title {{
-        background: linear-gradient(135deg, {DURABILIS_COLORS['secondary_blue']} 0%, {DURABILIS_COLORS['primary_blue']} 100%);
-        padding: 2rem;
-        border-radius: 12px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-    }}
-    
-    .platform-title h1 {{
-        color: white !important;
-        margin: 0;
-        font-size: 2.5rem;
-        font-weight: 700;
-    }}
-    
-    .platform-subtitle {{
-        color: rgba(255, 255, 255, 0.9);
-        font-size: 1.1rem;
-        margin-top: 0.5rem;
-    }}
-    
-    /* Buttons */
-    .stButton > button {{
-        background-color: {DURABILIS_COLORS['primary_blue']};
-        color: white;
-        border: none;
-        border-radius: 6px;
-        padding: 0.5rem 1.5rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }}
-    
-    .stButton > button:hover {{
-        background-color: {DURABILIS_COLORS['secondary_blue']};
-        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.15);
-    }}
-    
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {{
-        gap: 8px;
-    }}
-    
-    .stTabs [data-baseweb="tab"] {{
-        background-color: white;
-        border-radius: 6px 6px 0 0;
-        color: {DURABILIS_COLORS['dark_grey']};
-        font-weight: 600;
-    }}
-    
-    .stTabs [aria-selected="true"] {{
-        background-color: {DURABILIS_COLORS['primary_blue']};
-        color: white;
-    }}
-    
-    /* Metrics */
-    .metric-card {{
-        background: white;
-        padding: 1.5rem;
-        border-radius: 8px;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.06);
-        border-left: 4px solid {DURABILIS_COLORS['primary_blue']};
-    }}
-    
-    @media (max-width: 768px) {{
-        .main {{
-            padding: 1rem;
-        }}
-        .platform-title h1 {{
-            font-size: 1.8rem;
-        }}
-    }}
-    </style>
-    """, unsafe_allow_html=True)
-
 # ============================================================================
 # SESSION STATE INITIALIZATION
 # ============================================================================
 
-if 'projects' not in st.session_state:
-    st.session_state.projects = []
+# Sessions only hold UI state: projects live in the tenant stores (see ui.py)
+registry = tenant_registry()
+
+if 'tenant_id' not in st.session_state:
+    st.session_state.tenant_id = DEFAULT_TENANT
 
 if 'demo_mode' not in st.session_state:
     st.session_state.demo_mode = False
@@ -313,13 +92,8 @@ if 'demo_mode' not in st.session_state:
 # MAIN APPLICATION
 # ============================================================================
 
-# Platform Title Banner
-st.markdown(f"""
-    <div class="platform-title">
-        <h1>📊 Data Monitoring – Projet RSE & Sport</h1>
-        <p class="platform-subtitle">Plateforme de suivi et d'analyse des projets RSE dans le secteur sportif | Durabilis & Co</p>
-    </div>
-    """, unsafe_allow_html=True)
+# Durabilis & Co styles and platform title banner
+branding()
 
 # ============================================================================
 # SIDEBAR - FIXED CONTRAST
@@ -337,6 +111,49 @@ except:
 st.sidebar.title("⚙️ Configuration")
 st.sidebar.markdown("---")
 
+# Client portfolio (tenant) selection
+tenant_options = sorted({DEFAULT_TENANT, st.session_state.tenant_id, *registry.list_tenants()})
+tenant_id = st.sidebar.selectbox(
+    "🏢 Portefeuille client",
+    tenant_options,
+    index=tenant_options.index(st.session_state.tenant_id)
+)
+
+new_tenant = st.sidebar.text_input("Nouveau portefeuille", placeholder="ex: client-abc")
+if st.sidebar.button("➕ Créer le portefeuille") and new_tenant:
+    if TENANT_ID_PATTERN.match(new_tenant):
+        registry.create(new_tenant)
+        st.session_state.tenant_id = new_tenant
+        st.rerun()
+    else:
+        st.sidebar.error("Identifiant invalide : minuscules, chiffres, '-' et '_' uniquement.")
+
+st.session_state.tenant_id = tenant_id
+store = registry.get(tenant_id)
+tenant_workspace = workspace(store)
+
+# The session only keeps a handle (tenant, version) on the workspace shared
+# by every session of this process; idle workspaces are released
+if 'portfolio' not in st.session_state:
+    st.session_state.portfolio = PortfolioHandle(tenant_id)
+st.session_state.portfolio.tenant_id = tenant_id
+projects = tenant_workspace.open(store, st.session_state.portfolio)
+release_idle()
+
+
+def shared_result(key, compute, shared=True):
+    """
+    Result derived from ``projects``, computed once per store version by any
+    worker (only by this worker for non-``shared`` results)
+    """
+    value = store.cache_get(key) if tenant_workspace.version == store.version else None
+    if value is None:
+        value = compute()
+        store.cache_put(key, value, tenant_workspace.version, shared)
+    return value
+
+st.sidebar.markdown("---")
+
 # Demo Mode Toggle
 demo_mode = st.sidebar.checkbox(
     "🎬 Mode Démonstration",
@@ -346,17 +163,36 @@ demo_mode = st.sidebar.checkbox(
 
 if demo_mode != st.session_state.demo_mode:
     st.session_state.demo_mode = demo_mode
-    if demo_mode and not st.session_state.projects:
-        st.session_state.projects = generate_mock_projects(8)  # Generate 8 demo projects
+    if demo_mode and not projects:
+        demo_projects = generate_mock_projects(8)  # Generate 8 demo projects
+        store.create_many(logged(p) for p in demo_projects)
         st.rerun()
 
+# Memory held by this worker process: shared per portfolio, not per session
+with st.sidebar.expander("🧠 Mémoire du serveur"):
+    if st.button("Mesurer", key="measure_memory"):
+        mb = 1024 * 1024
+        st.dataframe(pd.DataFrame([
+            {
+                "Portefeuille": entry["tenant"],
+                "Sessions": entry["viewers"],
+                "Projets": entry["projects"],
+                "Stockage (Mo)": round(entry["store"] / mb, 2),
+                "Cache (Mo)": round(entry["cache"] / mb, 2),
+                "Index (Mo)": round(entry["indexes"] / mb, 2),
+                "Instantanés (Mo)": round(entry["snapshots"] / mb, 2),
+            }
+            for entry in memory_report()
+        ]), hide_index=True)
+        st.caption(f"Cette session : {footprint(st.session_state.to_dict()) / 1024:,.1f} Ko")
+
 st.sidebar.markdown("---")
 
 # Navigation
 page = st.sidebar.radio(
     "Navigation",
-    ["📋 Créer un Projet", "📊 Tableau de Bord", "💡 Recommandations", "📄 Rapport Professionnel", "🗂️ Gérer les Projets"],
-    index=0 if not st.session_state.projects else 1
+    ["📋 Créer un Projet", "📊 Tableau de Bord", "🔎 Analyse Ad Hoc", "💡 Recommandations", "📄 Rapport Professionnel", "🗂️ Gérer les Projets"],
+    index=0 if not projects else 1
 )
 
 # ============================================================================
@@ -365,156 +201,11 @@ page = st.sidebar.radio(
 
 if page == "📋 Créer un Projet":
     
-    tabs = st.tabs([
-        "1️⃣ Informations Générales",
-        "2️⃣ Sport & Discipline",
-        "3️⃣ Alignement ODD / Agenda 2063",
-        "4️⃣ Indicateurs & Suivi"
-    ])
-    
-    with tabs[0]:
-        st.subheader("📝 Informations Générales du Projet")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            project_name = st.text_input("Nom du Projet *", placeholder="Ex: Programme Jeunesse Sportive 2024")
-            project_country = st.selectbox(
-                "Pays *",
-                ["Sénégal", "Côte d'Ivoire", "Bénin", "Burkina Faso", "Mali", "Niger", "Togo", 
-                 "Ghana", "Nigeria", "Kenya", "Afrique du Sud", "Cameroun", "RD Congo", "France", "Autre"]
-            )
-            project_start_date = st.date_input("Date de début *")
-        
-        with col2:
-            project_organization = st.text_input("Organisation/Porteur du projet *")
-            project_location = st.text_input("Localisation *")
-            project_end_date = st.date_input("Date de fin prévue")
-        
-        project_description = st.text_area("Description du projet *", height=120)
-        project_budget = st.number_input("Budget (en €)", min_value=0, step=1000, value=0)
-        project_beneficiaries = st.number_input("Nombre de bénéficiaires estimés", min_value=0, step=10, value=0)
-    
-    with tabs[1]:
-        st.subheader("⚽ Sport & Discipline")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            sport_category = st.selectbox("Catégorie de sport *", [""] + list(SPORTS_LIST.keys()))
-            
-            if sport_category:
-                selected_sports = st.multiselect("Sélectionner le(s) sport(s) *", SPORTS_LIST[sport_category])
-            else:
-                selected_sports = st.multiselect("Ou rechercher dans tous les sports", ALL_SPORTS)
-        
-        with col2:
-            sport_level = st.multiselect(
-                "Niveau de pratique *",
-                ["Initiation", "Loisir", "Amateur", "Semi-professionnel", "Professionnel", "Élite/Haut niveau"]
-            )
-            
-            target_audience = st.multiselect(
-                "Public cible *",
-                ["Enfants (0-12 ans)", "Adolescents (13-17 ans)", "Jeunes adultes (18-25 ans)", 
-                 "Adultes (26-50 ans)", "Seniors (50+ ans)", "Personnes en situation de handicap",
-                 "Femmes", "Hommes", "Mixte"]
-            )
-        
-        sport_infrastructure = st.text_area("Infrastructures utilisées", height=80)
-    
-    with tabs[2]:
-        st.subheader("🌍 Alignement ODD (Agenda 2030) & Agenda 2063")
-        
-        st.markdown("##### 🎯 Objectifs de Développement Durable (ODD)")
-        
-        sdg_cols = st.columns(3)
-        selected_sdgs = []
-        
-        for idx, sdg in enumerate(SDGS):
-            with sdg_cols[idx % 3]:
-                sdg_label = f"ODD {sdg['num']}: {sdg['title'][:30]}..."
-                if st.checkbox(sdg_label, key=f"sdg_{sdg['num']}"):
-                    selected_sdgs.append(f"ODD {sdg['num']}: {sdg['title']}")
-        
-        st.markdown("---")
-        
-        st.markdown("##### 🌍 Agenda 2063 de l'Union Africaine")
-        selected_agenda_2063 = st.multiselect("Aspirations de l'Agenda 2063", AGENDA_2063)
-        
-        alignment_description = st.text_area("Description de l'alignement stratégique", height=100)
-    
-    with tabs[3]:
-        st.subheader("📈 Indicateurs & Suivi")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**Indicateurs quantitatifs**")
-            indicator_participants = st.number_input("Nombre de participants", min_value=0, step=1)
-            indicator_sessions = st.number_input("Nombre de sessions/événements", min_value=0, step=1)
-            indicator_hours = st.number_input("Heures d'activité totales", min_value=0, step=1)
-            
-        with col2:
-            st.markdown("**Indicateurs qualitatifs**")
-            impact_social = st.select_slider("Impact social", options=["Très faible", "Faible", "Moyen", "Fort", "Très fort"], value="Moyen")
-            impact_environmental = st.select_slider("Impact environnemental", options=["Très faible", "Faible", "Moyen", "Fort", "Très fort"], value="Moyen")
-            impact_economic = st.select_slider("Impact économique", options=["Très faible", "Faible", "Moyen", "Fort", "Très fort"], value="Moyen")
-        
-        monitoring_tools = st.multiselect(
-            "Outils de suivi utilisés",
-            ["Questionnaires", "Entretiens", "Observations terrain", "Données analytiques",
-             "Reporting mensuel", "Évaluation externe", "Auto-évaluation", "Tableaux de bord"]
-        )
-        
-        monitoring_frequency = st.selectbox("Fréquence de suivi", ["Hebdomadaire", "Bimensuel", "Mensuel", "Trimestriel", "Semestriel", "Annuel"])
-        
-        additional_notes = st.text_area("Notes et commentaires additionnels", height=100)
-    
-    st.markdown("---")
-    
-    col1, col2, col3 = st.columns([1, 1, 1])
-    
-    with col2:
-        submit_button = st.button("💾 Enregistrer le Projet", use_container_width=True, type="primary")
-    
-    if submit_button:
-        if not project_name or not project_organization:
-            st.error("❌ Veuillez remplir au minimum le nom du projet et l'organisation.")
-        elif not selected_sports:
-            st.error("❌ Veuillez sélectionner au moins un sport.")
-        else:
-            project_data = {
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "name": project_name,
-                "organization": project_organization,
-                "country": project_country,
-                "location": project_location,
-                "start_date": str(project_start_date),
-                "end_date": str(project_end_date),
-                "description": project_description,
-                "budget": project_budget,
-                "beneficiaries": project_beneficiaries,
-                "sports": selected_sports,
-                "sport_level": sport_level,
-                "target_audience": target_audience,
-                "infrastructure": sport_infrastructure,
-                "sdgs": selected_sdgs,
-                "agenda_2063": selected_agenda_2063,
-                "alignment_description": alignment_description,
-                "indicator_participants": indicator_participants,
-                "indicator_sessions": indicator_sessions,
-                "indicator_hours": indicator_hours,
-                "impact_social": impact_social,
-                "impact_environmental": impact_environmental,
-                "impact_economic": impact_economic,
-                "monitoring_tools": monitoring_tools,
-                "monitoring_frequency": monitoring_frequency,
-                "additional_notes": additional_notes
-            }
-            
-            st.session_state.projects.append(project_data)
-            st.success(f"✅ Projet '{project_name}' enregistré avec succès!")
-            st.balloons()
+    project = project_form()
+    if project:
+        store.create(project)
+        st.success(f"✅ Projet '{project['name']}' enregistré avec succès!")
+        st.balloons()
 
 # ============================================================================
 # PAGE 2: DASHBOARD
@@ -522,30 +213,71 @@ if page == "📋 Créer un Projet":
 
 elif page == "📊 Tableau de Bord":
     
-    if not st.session_state.projects:
+    if not projects:
         st.warning("Aucun projet enregistré. Activez le Mode Démonstration ou créez un projet.")
     else:
         st.header("📊 Tableau de Bord RSE & Sport")
         
+        # Reporting periods: KPIs are compared with a frozen snapshot
+        baseline = None
+        with st.expander("📅 Périodes de reporting", expanded=False):
+            col_period, col_baseline = st.columns(2)
+            with col_period:
+                now = datetime.now()
+                period_label = st.text_input("Période à figer", value=f"T{(now.month - 1) // 3 + 1} {now.year}")
+                if st.button("📸 Figer la période") and period_label.strip():
+                    store.mark_period(period_label.strip())
+                    st.success(f"Période « {period_label} » enregistrée.")
+            with col_baseline:
+                periods = store.periods()
+                if periods:
+                    period_names = [f"{label} ({period['taken_at']})" for label, period in periods.items()]
+                    compared = st.selectbox("Comparer à", period_names, index=len(period_names) - 1)
+                    baseline_label = list(periods)[period_names.index(compared)]
+                    baseline = tenant_workspace.snapshot(store, periods[baseline_label]["version"])
+                else:
+                    st.caption("Figez une période pour suivre l'évolution des indicateurs.")
+            
+            if baseline is not None:
+                changes = diff(baseline, tenant_workspace.snapshot(store, tenant_workspace.version))
+                st.markdown(
+                    f"**Depuis {baseline_label} :** {len(changes['added'])} projet(s) ajouté(s), "
+                    f"{len(changes['removed'])} supprimé(s), {len(changes['changed'])} modifié(s)"
+                )
+                for label, entries in (("➕ Ajoutés", changes['added']), ("➖ Supprimés", changes['removed'])):
+                    if entries:
+                        st.write(f"{label} : " + ", ".join(e['name'] for e in entries))
+                if changes['changed']:
+                    st.dataframe(pd.DataFrame([
+                        {"Projet": c['name'], "Champs modifiés": ", ".join(c['fields'])}
+                        for c in changes['changed']
+                    ]), use_container_width=True, hide_index=True)
+        
         # Key metrics
         col1, col2, col3, col4 = st.columns(4)
         
-        total_projects = len(st.session_state.projects)
-        total_budget = sum(p.get('budget', 0) for p in st.session_state.projects)
-        total_beneficiaries = sum(p.get('beneficiaries', 0) for p in st.session_state.projects)
-        unique_countries = len(set(p.get('country', '') for p in st.session_state.projects))
+        kpis = shared_result("kpis", lambda: compute_kpis(projects))
+        total_projects = kpis['total_projects']
+        total_budget = kpis['total_budget']
+        total_beneficiaries = kpis['total_beneficiaries']
+        unique_countries = kpis['unique_countries']
+        deltas = {key: d['delta'] for key, d in kpi_deltas(baseline.kpis(), kpis).items()} if baseline else {}
         
         with col1:
-            st.metric("Projets Totaux", total_projects, delta=None)
+            st.metric("Projets Totaux", total_projects,
+                      delta=deltas.get('total_projects'))
         
         with col2:
-            st.metric("Budget Total", f"{total_budget:,.0f} €", delta=None)
+            st.metric("Budget Total", f"{total_budget:,.0f} €",
+                      delta=f"{deltas['total_budget']:+,.0f} €" if deltas else None)
         
         with col3:
-            st.metric("Bénéficiaires", f"{total_beneficiaries:,}", delta=None)
+            st.metric("Bénéficiaires", f"{total_beneficiaries:,}",
+                      delta=f"{deltas['total_beneficiaries']:+,}" if deltas else None)
         
         with col4:
-            st.metric("Pays Couverts", unique_countries, delta=None)
+            st.metric("Pays Couverts", unique_countries,
+                      delta=deltas.get('unique_countries'))
         
         st.markdown("---")
         
@@ -554,10 +286,7 @@ elif page == "📊 Tableau de Bord":
         
         with col1:
             st.subheader("🌍 Distribution Géographique")
-            country_counts= {}
-            for p in st.session_state.projects:
-                country = p.get('country', 'Inconnu')
-                country_counts[country] = country_counts.get(country, 0) + 1
+            country_counts = country_distribution(projects)
             
             fig_geo = px.bar(
                 x=list(country_counts.keys()),
@@ -568,13 +297,40 @@ elif page == "📊 Tableau de Bord":
             )
             fig_geo.update_layout(showlegend=False, height=300)
             st.plotly_chart(fig_geo, use_container_width=True)
-        
+
+            # Map drawn from pre-binned country / city aggregates, never one marker per project
+            geo = shared_result("geo", lambda: geo_aggregates(projects))
+            if geo['countries'] or geo['cities']:
+                fig_map = go.Figure()
+                if geo['countries']:
+                    fig_map.add_trace(go.Choropleth(
+                        locations=[c['iso3'] for c in geo['countries']],
+                        z=[c['projects'] for c in geo['countries']],
+                        text=[c['country'] for c in geo['countries']],
+                        colorscale='Blues',
+                        showscale=False,
+                        hovertemplate="%{text}<br>%{z} projet(s)<extra></extra>"
+                    ))
+                if geo['cities']:
+                    fig_map.add_trace(go.Scattergeo(
+                        lat=[c['lat'] for c in geo['cities']],
+                        lon=[c['lon'] for c in geo['cities']],
+                        text=[f"{c['city']} ({c['country']})" for c in geo['cities']],
+                        customdata=[[c['projects'], c['beneficiaries']] for c in geo['cities']],
+                        marker=dict(
+                            size=[min(8 + 4 * c['projects'], 40) for c in geo['cities']],
+                            color='#2E86AB',
+                            line=dict(width=1, color='white')
+                        ),
+                        hovertemplate="%{text}<br>%{customdata[0]} projet(s)<br>%{customdata[1]:,} bénéficiaires<extra></extra>"
+                    ))
+                fig_map.update_geos(fitbounds='locations', showcountries=True, showcoastlines=False)
+                fig_map.update_layout(height=300, margin=dict(l=0, r=0, t=0, b=0), showlegend=False)
+                st.plotly_chart(fig_map, use_container_width=True)
+
         with col2:
             st.subheader("⚽ Sports Pratiqués")
-            sport_counts = {}
-            for p in st.session_state.projects:
-                for sport in p.get('sports', []):
-                    sport_counts[sport] = sport_counts.get(sport, 0) + 1
+            sport_counts = sport_distribution(projects)
             
             fig_sports = px.pie(
                 names=list(sport_counts.keys()),
@@ -589,47 +345,70 @@ elif page == "📊 Tableau de Bord":
         # SDG Alignment
         st.subheader("🎯 Alignement ODD")
         
-        sdg_counts = {}
-        for p in st.session_state.projects:
-            for sdg_text in p.get('sdgs', []):
-                sdg_num = int(sdg_text.split(':')[0].replace('ODD', '').strip())
-                sdg_counts[sdg_num] = sdg_counts.get(sdg_num, 0) + 1
+        coverage = shared_result("coverage", lambda: coverage_report(tenant_workspace.table(store)))
         
-        sdg_data = []
-        for sdg in SDGS:
-            count = sdg_counts.get(sdg['num'], 0)
-            sdg_data.append({
-                'ODD': f"ODD {sdg['num']}",
-                'Projets': count,
-                'Couleur': sdg['color']
-            })
+        coverage_weight = st.radio(
+            "Pondération", list(COVERAGE_WEIGHTS), format_func=COVERAGE_WEIGHTS.get,
+            horizontal=True, key="coverage_weight"
+        )
         
-        df_sdg = pd.DataFrame(sdg_data)
+        df_sdg = pd.DataFrame({
+            'ODD': coverage['labels'],
+            COVERAGE_WEIGHTS[coverage_weight]: coverage['coverage'][coverage_weight],
+        })
         
         fig_sdg = px.bar(
             df_sdg,
             x='ODD',
-            y='Projets',
-            color='Projets',
+            y=COVERAGE_WEIGHTS[coverage_weight],
+            color=COVERAGE_WEIGHTS[coverage_weight],
             color_continuous_scale='Viridis'
         )
         fig_sdg.update_layout(height=400)
         st.plotly_chart(fig_sdg, use_container_width=True)
         
+        col_cooc, col_gaps = st.columns([2, 1])
+        
+        with col_cooc:
+            cooc_weight = "budget" if coverage_weight == "budget" else "projects"
+            fig_cooc = px.imshow(
+                coverage['cooccurrence'][cooc_weight],
+                x=coverage['labels'],
+                y=coverage['labels'],
+                color_continuous_scale='Blues',
+                labels={'color': COVERAGE_WEIGHTS[cooc_weight]},
+                title="Co-occurrence des ODD"
+            )
+            fig_cooc.update_layout(height=500)
+            st.plotly_chart(fig_cooc, use_container_width=True)
+        
+        with col_gaps:
+            st.markdown("##### Lacunes de couverture")
+            if coverage['uncovered']:
+                st.write("**ODD non couverts :** " + ", ".join(coverage['uncovered']))
+            else:
+                st.write("Tous les ODD sont couverts par au moins un projet.")
+            if coverage['underfunded']:
+                st.write(f"**ODD sous-financés** (moins de {GAP_SHARE:.0%} du budget) : " + ", ".join(coverage['underfunded']))
+            
+            aspirations = shared_result("aspiration-coverage", lambda: coverage_report(tenant_workspace.table(store), "aspiration"))
+            st.markdown("##### Agenda 2063")
+            st.dataframe(pd.DataFrame({
+                'Aspiration': aspirations['labels'],
+                'Projets': aspirations['coverage']['projects'],
+                'Budget (€)': aspirations['coverage']['budget'],
+            }), hide_index=True, use_container_width=True)
+        
         st.markdown("---")
         
         # Impact Analysis
         st.subheader("📈 Analyse d'Impact")
         
-        impact_map = {"Très faible": 1, "Faible": 2, "Moyen": 3, "Fort": 4, "Très fort": 5}
+        impact_scores = impact_averages(projects)
         
         impact_data = {
-            'Dimension': ['Social', 'Environnemental', 'Économique'],
-            'Score Moyen': [
-                sum(impact_map.get(p.get('impact_social', 'Moyen'), 3) for p in st.session_state.projects) / len(st.session_state.projects),
-                sum(impact_map.get(p.get('impact_environmental', 'Moyen'), 3) for p in st.session_state.projects) / len(st.session_state.projects),
-                sum(impact_map.get(p.get('impact_economic', 'Moyen'), 3) for p in st.session_state.projects) / len(st.session_state.projects)
-            ]
+            'Dimension': list(impact_scores.keys()),
+            'Score Moyen': list(impact_scores.values())
         }
         
         fig_impact = go.Figure(data=go.Scatterpolar(
@@ -644,21 +423,143 @@ elif page == "📊 Tableau de Bord":
             height=400
         )
         st.plotly_chart(fig_impact, use_container_width=True)
+        
+        # Composite impact score, weighted per funder
+        st.markdown("##### Score d'impact composite")
+        score_profile = st.selectbox(
+            "Pondération du bailleur", list(WEIGHT_PROFILES), format_func=lambda name: WEIGHT_PROFILES[name][0],
+            index=list(WEIGHT_PROFILES).index(DEFAULT_PROFILE), key="score_profile"
+        )
+        with st.expander("Ajuster les poids"):
+            weight_cols = st.columns(4)
+            score_weights = {
+                name: weight_cols[i % 4].slider(
+                    label, 0, 5, WEIGHT_PROFILES[score_profile][1][name], key=f"score_weight_{score_profile}_{name}"
+                )
+                for i, (name, label) in enumerate(SCORE_FEATURES.items())
+            }
+        
+        if not any(score_weights.values()):
+            st.warning("Au moins un critère doit avoir un poids non nul.")
+        else:
+            with tenant_workspace.lock:
+                impact_model = tenant_workspace.index("impact")
+                scores = impact_model.scores(score_weights)
+                ranking = impact_model.ranking(score_weights, limit=10)
+            
+            col1, col2 = st.columns([1, 1])
+            with col1:
+                fig_scores = px.histogram(
+                    x=scores, nbins=20, range_x=[0, 100],
+                    labels={'x': "Score d'impact (0-100)"},
+                    color_discrete_sequence=['#00A9E0']
+                )
+                fig_scores.update_layout(height=350, yaxis_title="Projets", bargap=0.05)
+                st.plotly_chart(fig_scores, use_container_width=True)
+            with col2:
+                st.dataframe(pd.DataFrame([
+                    {'Rang': row['rank'], 'Projet': row['name'], 'Score': round(row['score'], 1)} for row in ranking
+                ]), hide_index=True, use_container_width=True)
+        
+        st.markdown("---")
+        
+        # Benchmarking against peer groups
+        st.subheader("🏅 Benchmarking des Projets")
+        
+        project_names = [p['name'] for p in projects]
+        benchmarked = st.selectbox("Projet à comparer", project_names)
+        with tenant_workspace.lock:
+            ranks = tenant_workspace.index("benchmark").ranks(projects[project_names.index(benchmarked)])
+        st.caption("Rang centile parmi les projets comparables : 100 = meilleur du groupe, 0 = dernier.")
+        st.dataframe(pd.DataFrame([
+            {
+                "Groupe de pairs": f"{DIMENSIONS[dimension]} : {entry['group']}",
+                "Projets": entry['peers'],
+                **{label: entry[metric] for metric, (label, _) in METRICS.items()},
+            }
+            for dimension, entry in ranks.items()
+        ]), use_container_width=True, hide_index=True)
+        
+        # Closest projects by sports, SDGs, audiences, country, budget and description
+        st.subheader("🔗 Projets Similaires")
+        
+        with tenant_workspace.lock:
+            neighbours = tenant_workspace.index("similarity").similar(projects[project_names.index(benchmarked)], k=5)
+        if neighbours:
+            st.dataframe(pd.DataFrame([
+                {
+                    "Projet": other['name'],
+                    "Pays": other['country'],
+                    "Sports": ", ".join(other['sports']),
+                    "Similarité": round(score, 2),
+                }
+                for other, score in neighbours
+            ]), use_container_width=True, hide_index=True)
+        else:
+            st.info("Aucun autre projet à comparer.")
+
+# ============================================================================
+# PAGE 3: AD-HOC ANALYSIS
+# ============================================================================
+
+elif page == "🔎 Analyse Ad Hoc":
+    
+    st.header("🔎 Analyse Ad Hoc du Portefeuille")
+    
+    if not projects:
+        st.warning("Aucun projet enregistré. Activez le Mode Démonstration ou créez un projet.")
+    else:
+        try:
+            analysis = shared_result("analysis", lambda: PortfolioAnalysis(tenant_workspace.table(store)), shared=False)
+        except AnalysisError as e:
+            st.info(f"Analyse indisponible : {e}")
+        else:
+            st.info("Croisez librement les projets : choisissez les axes de regroupement et les mesures à calculer.")
+            
+            col_dims, col_measures = st.columns(2)
+            with col_dims:
+                dimensions = st.multiselect(
+                    "Regrouper par", list(ANALYSIS_DIMENSIONS), default=["sport_level"],
+                    format_func=lambda key: ANALYSIS_DIMENSIONS[key][0]
+                )
+            with col_measures:
+                measures = st.multiselect(
+                    "Mesures", list(ANALYSIS_MEASURES), default=["projects", "budget_per_beneficiary"],
+                    format_func=lambda key: ANALYSIS_MEASURES[key][0]
+                )
+            countries = st.multiselect("Filtrer par pays", analysis.values("country"))
+            
+            try:
+                result = analysis.aggregate(dimensions, measures, {"country": countries})
+            except AnalysisError as e:
+                st.warning(str(e))
+            else:
+                st.dataframe(result, use_container_width=True, hide_index=True)
+            
+            with st.expander("🧮 Requête SQL"):
+                st.caption("Tables disponibles : " + " · ".join(f"`{name}` ({description})" for name, description in SQL_TABLES.items()))
+                preset = st.selectbox("Exemple de requête", list(SQL_PRESETS))
+                query = st.text_area("Requête SQL (lecture seule)", value=SQL_PRESETS[preset].strip(), height=220)
+                if st.button("▶️ Exécuter la requête"):
+                    try:
+                        st.dataframe(analysis.sql(query), use_container_width=True, hide_index=True)
+                    except AnalysisError as e:
+                        st.error(f"❌ {e}")
 
 # ============================================================================
-# PAGE 3: RECOMMENDATIONS
+# PAGE 4: RECOMMENDATIONS
 # ============================================================================
 
 elif page == "💡 Recommandations":
     
     st.header("💡 Recommandations Stratégiques")
     
-    if not st.session_state.projects:
+    if not projects:
         st.warning("Aucun projet enregistré. Activez le Mode Démonstration ou créez un projet.")
     else:
         st.info("Recommandations générées automatiquement basées sur l'analyse de vos projets RSE.")
         
-        recommendations = generate_recommendations(st.session_state.projects)
+        recommendations = shared_result("recommendations", lambda: generate_recommendations(projects))
         
         if recommendations:
             for idx, rec in enumerate(recommendations):
@@ -675,16 +576,113 @@ elif page == "💡 Recommandations":
                         st.markdown(f"- {action}")
         else:
             st.info("Aucune recommandation générée pour le moment.")
+        
+        st.markdown("---")
+        
+        # Budget reallocation under constraints
+        st.subheader("⚖️ Optimisation Budgétaire")
+        st.caption(
+            "Répartition du budget maximisant l'impact modélisé : bénéficiaires pondérés par le niveau d'impact, "
+            "avec des rendements décroissants (doubler le budget d'un projet multiplie sa portée par 1,4)."
+        )
+        
+        current_total = float(sum(p['budget'] for p in projects))
+        with st.form("budget_optimizer"):
+            col1, col2 = st.columns(2)
+            with col1:
+                opt_total = st.number_input("Budget total à répartir (€)", min_value=0.0, value=current_total, step=1000.0)
+                opt_min_budget = st.number_input("Minimum par projet (€)", min_value=0.0, value=0.0, step=1000.0)
+            with col2:
+                opt_min_share = st.slider("Part minimale du budget actuel conservée", 0.0, 1.0, MIN_SHARE, 0.05)
+                opt_max_growth = st.slider("Budget maximal (× budget actuel)", 1.0, 5.0, MAX_GROWTH, 0.5)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**Plafonds par pays** (laisser vide : pas de plafond)")
+                caps_df = st.data_editor(
+                    pd.DataFrame({
+                        'Pays': sorted({p['country'] for p in projects}),
+                        'Plafond (€)': None,
+                    }).astype({'Plafond (€)': float}),
+                    disabled=['Pays'], hide_index=True, use_container_width=True, key="optimizer_caps"
+                )
+            with col2:
+                st.markdown("**Cibles ODD** (part minimale du budget total, en %)")
+                targets_df = st.data_editor(
+                    pd.DataFrame({
+                        'ODD': [f"ODD {sdg['num']}" for sdg in SDGS],
+                        'Cible (%)': 0.0,
+                    }),
+                    disabled=['ODD'], hide_index=True, use_container_width=True, key="optimizer_targets"
+                )
+            
+            optimize = st.form_submit_button("⚖️ Optimiser l'allocation", type="primary")
+        
+        if optimize:
+            country_caps = {
+                row['Pays']: row['Plafond (€)'] for _, row in caps_df.iterrows() if pd.notna(row['Plafond (€)'])
+            }
+            sdg_targets = {
+                i + 1: row['Cible (%)'] / 100 for i, row in targets_df.iterrows() if row['Cible (%)'] > 0
+            }
+            try:
+                plan = optimize_budget(
+                    tenant_workspace.table(store), opt_total, opt_min_budget, opt_min_share, opt_max_growth, country_caps, sdg_targets
+                )
+            except ValidationError as e:
+                for error in e.errors:
+                    st.error(error)
+            else:
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Budget réparti", f"{plan['allocated']:,.0f} €")
+                col2.metric("Impact modélisé actuel", f"{plan['impact_before']:,.0f}")
+                col3.metric(
+                    "Impact modélisé optimisé", f"{plan['impact_after']:,.0f}",
+                    f"{plan['impact_after'] / plan['impact_before'] - 1:+.1%}" if plan['impact_before'] else None
+                )
+                for warning in plan['warnings']:
+                    st.warning(warning)
+                
+                missed = [f"ODD {num}" for num, target in plan['sdg_targets'].items() if not target['met']]
+                if missed:
+                    st.warning("Cibles non atteintes : " + ", ".join(missed))
+                
+                st.markdown("##### Réallocations proposées")
+                st.dataframe(pd.DataFrame([
+                    {
+                        'Projet': p['name'],
+                        'Pays': p['country'],
+                        'Budget actuel (€)': p['budget'],
+                        'Budget proposé (€)': round(p['proposed']),
+                        'Écart (€)': round(p['delta']),
+                    }
+                    for p in plan['projects'] if abs(p['delta']) >= 1
+                ]), hide_index=True, use_container_width=True)
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.markdown("##### Par pays")
+                    st.dataframe(pd.DataFrame([
+                        {'Pays': country, 'Budget actuel (€)': row['budget'], 'Budget proposé (€)': round(row['proposed'])}
+                        for country, row in plan['countries'].items()
+                    ]), hide_index=True, use_container_width=True)
+                if plan['sdg_targets']:
+                    with col2:
+                        st.markdown("##### Cibles ODD")
+                        st.dataframe(pd.DataFrame([
+                            {'ODD': f"ODD {num}", 'Cible': f"{row['target']:.0%}", 'Atteint': f"{row['achieved']:.1%}"}
+                            for num, row in plan['sdg_targets'].items()
+                        ]), hide_index=True, use_container_width=True)
 
 # ============================================================================
-# PAGE 4: PROFESSIONAL REPORT
+# PAGE 5: PROFESSIONAL REPORT
 # ============================================================================
 
 elif page == "📄 Rapport Professionnel":
     
     st.header("📄 Rapport Professionnel RSE & Sport")
     
-    if not st.session_state.projects:
+    if not projects:
         st.warning("Aucun projet enregistré. Activez le Mode Démonstration ou créez un projet.")
     else:
         st.info("Générez un rapport professionnel PDF (style AFD) prêt à être partagé avec vos parties prenantes.")
@@ -695,22 +693,33 @@ elif page == "📄 Rapport Professionnel":
             st.subheader("Configuration du Rapport")
             selected_project_name = st.selectbox(
                 "Sélectionner le projet",
-                [p.get('name', 'Sans nom') for p in st.session_state.projects]
+                [p.get('name', 'Sans nom') for p in projects]
             )
             
             # Find selected project data
-            selected_project = next((p for p in st.session_state.projects if p.get('name') == selected_project_name), st.session_state.projects[0])
+            selected_project = next((p for p in projects if p.get('name') == selected_project_name), projects[0])
             
-            generate_pdf = st.button("📥 Générer le Rapport PDF (AFD Style)", type="primary")
+            templates = template_choices()
+            selected_template = st.selectbox(
+                "Modèle de rapport",
+                list(templates),
+                format_func=lambda name: templates[name]
+            )
+            
+            generate_pdf = st.button("📥 Générer le Rapport PDF", type="primary")
+            generate_html = st.button("🌐 Générer le Rapport HTML")
 
         if generate_pdf:
             with st.spinner("Génération du rapport PDF en cours..."):
                 try:
-                    # Generate recommendations for this specific project
-                    project_recs = generate_recommendations([selected_project])
+                    # Rendered once per project version and template by any worker
+                    def render_pdf():
+                        buffer = generate_pdf_report(
+                            selected_project, projects, generate_recommendations([selected_project]), selected_template
+                        )
+                        return buffer.getvalue() if buffer else None
                     
-                    # Generate PDF
-                    pdf_buffer = generate_pdf_report(selected_project, st.session_state.projects, project_recs)
+                    pdf_buffer = shared_result(("pdf", selected_project['id'], selected_template), render_pdf)
                     
                     if pdf_buffer:
                         st.success("✅ Rapport PDF généré avec succès!")
@@ -727,20 +736,142 @@ elif page == "📄 Rapport Professionnel":
                     st.error(f"Une erreur est survenue: {str(e)}")
                     st.info("Assurez-vous que les dépendances 'reportlab' sont installées.")
 
+        if generate_html:
+            html_report = generate_html_report(
+                selected_project, projects, generate_recommendations([selected_project])
+            )
+            if html_report:
+                st.success("✅ Rapport HTML généré avec succès!")
+                st.download_button(
+                    label="⬇️ Télécharger le rapport HTML",
+                    data=html_report,
+                    file_name=f"Rapport_RSE_{selected_project.get('name', 'projet').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.html",
+                    mime="text/html"
+                )
+            else:
+                st.error("Erreur lors de la génération du rapport HTML.")
+
+        st.markdown("---")
+        st.subheader("Rapport de Portefeuille")
+        st.write(f"Rapport consolidé des **{len(projects)} projet(s)** du portefeuille : "
+                 "synthèse, couverture ODD, sections par pays et annexe projet par projet.")
+
+        if st.button("📥 Générer le Rapport de Portefeuille"):
+            with st.spinner("Génération du rapport de portefeuille en cours..."):
+                try:
+                    def render_portfolio_pdf():
+                        buffer = generate_portfolio_report(
+                            projects, shared_result("recommendations", lambda: generate_recommendations(projects))
+                        )
+                        return buffer.getvalue() if buffer else None
+                    
+                    pdf_buffer = shared_result("portfolio-pdf", render_portfolio_pdf)
+
+                    if pdf_buffer:
+                        st.success("✅ Rapport de portefeuille généré avec succès!")
+                        st.download_button(
+                            label="⬇️ Télécharger le PDF du portefeuille",
+                            data=pdf_buffer,
+                            file_name=f"Rapport_Portefeuille_RSE_{datetime.now().strftime('%Y%m%d')}.pdf",
+                            mime="application/pdf"
+                        )
+                    else:
+                        st.error("Erreur lors de la génération du PDF. Vérifiez les logs.")
+
+                except Exception as e:
+                    st.error(f"Une erreur est survenue: {str(e)}")
+
+        if st.button("🌐 Exporter le site statique du portefeuille"):
+            with st.spinner("Génération du site statique en cours..."):
+                site = static_site_zip(
+                    projects,
+                    shared_result("recommendations", lambda: generate_recommendations(projects)),
+                    lambda p: generate_recommendations([p])
+                )
+            if site:
+                st.success("✅ Site statique généré : une page par projet et un index du portefeuille.")
+                st.download_button(
+                    label="⬇️ Télécharger le site (ZIP)",
+                    data=site,
+                    file_name=f"Site_Portefeuille_RSE_{datetime.now().strftime('%Y%m%d')}.zip",
+                    mime="application/zip"
+                )
+            else:
+                st.error("Erreur lors de la génération du site statique.")
+
 # ============================================================================
-# PAGE 5: MANAGE PROJECTS
+# PAGE 6: MANAGE PROJECTS
 # ============================================================================
 
 elif page == "🗂️ Gérer les Projets":
     
     st.header("🗂️ Gestion des Projets")
     
-    if not st.session_state.projects:
+    # Undo / redo of the portfolio's latest edits (also after "Effacer tous les projets")
+    next_undo, next_redo = store.next_undo(), store.next_redo()
+    col_undo, col_redo = st.columns(2)
+    with col_undo:
+        undo_clicked = st.button("↩️ Annuler", disabled=next_undo is None, help=describe(next_undo) if next_undo else None)
+    with col_redo:
+        redo_clicked = st.button("↪️ Rétablir", disabled=next_redo is None, help=describe(next_redo) if next_redo else None)
+    if undo_clicked or redo_clicked:
+        try:
+            store.undo() if undo_clicked else store.redo()
+        except EditConflict as e:
+            st.error(f"❌ Impossible : le projet a été modifié entre-temps ({e})")
+        else:
+            st.rerun()
+    
+    with st.expander("📜 Historique des modifications"):
+        events = store.history()
+        if events:
+            st.dataframe(pd.DataFrame([
+                {"Version": e['version'], "Date": e['timestamp'], "Action": describe(e)}
+                for e in reversed(events)
+            ]), use_container_width=True, hide_index=True)
+            
+            version = st.select_slider(
+                "Voir le portefeuille à la version",
+                options=list(range(store.version + 1)),
+                value=store.version
+            )
+            past_projects = store.projects_at(version)
+            st.dataframe(pd.DataFrame([
+                {"Projet": p['name'], "Pays": p['country'], "Budget (€)": p['budget']}
+                for p in past_projects
+            ], columns=["Projet", "Pays", "Budget (€)"]), use_container_width=True, hide_index=True)
+        else:
+            st.caption("Aucune modification enregistrée pour ce portefeuille.")
+    
+    with st.expander("📂 Importer des projets (CSV)"):
+        if csv_import(store):
+            projects = tenant_workspace.open(store, st.session_state.portfolio)
+    
+    if not projects:
         st.warning("Aucun projet enregistré.")
     else:
-        st.success(f"**{len(st.session_state.projects)} projet(s) enregistré(s)**")
+        st.success(f"**{len(projects)} projet(s) enregistré(s)**")
+        
+        search_query = st.text_input(
+            "🔍 Rechercher dans les projets",
+            placeholder="Ex: entraînement des filles, terrain multisport, handicap"
+        )
+        listed = projects
+        if search_query.strip():
+            with tenant_workspace.lock:
+                results = tenant_workspace.index("search").search(search_query)
+            listed = [p for p, _ in results]
+            if results:
+                st.caption(f"{len(results)} projet(s) correspondant(s), du plus pertinent au moins pertinent")
+                for p, _ in results:
+                    field, extract = snippet(p, search_query, escape=escape_markdown)
+                    if field:
+                        st.markdown(f"**{escape_markdown(p['name'])}** · _{SEARCH_FIELD_LABELS.get(field, field)}_ : {extract}")
+            else:
+                st.info("Aucun projet ne correspond à cette recherche.")
         
-        for idx, project in enumerate(st.session_state.projects):
+        for project in listed:
+            project_id = project['id']
             with st.expander(f"📁 {project.get('name', 'Projet sans nom')} - {project.get('organization', 'N/A')}"):
                 # View Mode
                 col1, col2 = st.columns(2)
@@ -758,30 +889,50 @@ elif page == "🗂️ Gérer les Projets":
                 # Action Buttons
                 col_act1, col_act2 = st.columns([1, 1])
                 with col_act1:
-                    if st.button("✏️ Éditer", key=f"edit_btn_{idx}"):
-                        st.session_state[f"edit_mode_{idx}"] = not st.session_state.get(f"edit_mode_{idx}", False)
+                    if st.button("✏️ Éditer", key=f"edit_btn_{project_id}"):
+                        st.session_state[f"edit_mode_{project_id}"] = not st.session_state.get(f"edit_mode_{project_id}", False)
+                        # Project as the form shows it, to merge with edits made meanwhile
+                        st.session_state[f"edit_base_{project_id}"] = store.get(project_id)
+                        for field in ("name", "org", "budget", "benef"):
+                            st.session_state.pop(f"edit_{field}_{project_id}", None)
                 with col_act2:
-                    if st.button("🗑️ Supprimer", key=f"del_{idx}"):
-                        st.session_state.projects.pop(idx)
+                    if st.button("🗑️ Supprimer", key=f"del_{project_id}"):
+                        try:
+                            store.delete(project_id)
+                        except ProjectNotFound:
+                            pass
                         st.rerun()
 
                 # Edit Mode Form
-                if st.session_state.get(f"edit_mode_{idx}", False):
+                if st.session_state.get(f"edit_mode_{project_id}", False):
                     st.markdown("#### Mode Édition")
-                    with st.form(key=f"edit_form_{idx}"):
-                        new_name = st.text_input("Nom du projet", value=project['name'])
-                        new_org = st.text_input("Organisation", value=project['organization'])
-                        new_budget = st.number_input("Budget (€)", value=project.get('budget', 0))
-                        new_benef = st.number_input("Bénéficiaires", value=project.get('beneficiaries', 0))
+                    with st.form(key=f"edit_form_{project_id}"):
+                        # Keyed so the inputs survive writes made to the project by others meanwhile
+                        new_name = st.text_input("Nom du projet", value=project['name'], key=f"edit_name_{project_id}")
+                        new_org = st.text_input("Organisation", value=project['organization'], key=f"edit_org_{project_id}")
+                        new_budget = st.number_input("Budget (€)", value=project.get('budget', 0), key=f"edit_budget_{project_id}")
+                        new_benef = st.number_input("Bénéficiaires", value=project.get('beneficiaries', 0), key=f"edit_benef_{project_id}")
                         
                         if st.form_submit_button("✅ Sauvegarder les modifications"):
-                            st.session_state.projects[idx]['name'] = new_name
-                            st.session_state.projects[idx]['organization'] = new_org
-                            st.session_state.projects[idx]['budget'] = new_budget
-                            st.session_state.projects[idx]['beneficiaries'] = new_benef
-                            st.session_state[f"edit_mode_{idx}"] = False
-                            st.success("Modifications enregistrées !")
-                            st.rerun()
+                            try:
+                                changes = normalize_changes({
+                                    "name": new_name,
+                                    "organization": new_org,
+                                    "budget": new_budget,
+                                    "beneficiaries": new_benef
+                                })
+                                base = st.session_state.get(f"edit_base_{project_id}") or store.get(project_id)
+                                store.update(project_id, changes, base.get("revision", 0), base)
+                            except ValidationError as e:
+                                st.error(f"❌ Données invalides : {e}")
+                            except EditConflict as e:
+                                st.error(f"❌ Le projet a été modifié entre-temps ({', '.join(e.fields)}) : rechargez-le avant de sauvegarder.")
+                            except ProjectNotFound:
+                                st.error("❌ Le projet a été supprimé entre-temps.")
+                            else:
+                                st.session_state[f"edit_mode_{project_id}"] = False
+                                st.success("Modifications enregistrées !")
+                                st.rerun()
         
         st.markdown("---")
         
@@ -789,7 +940,7 @@ elif page == "🗂️ Gérer les Projets":
         
         with col1:
             if st.button("📥 Exporter tous les projets (CSV)"):
-                df_export = pd.DataFrame(st.session_state.projects)
+                df_export = ProjectTable.from_dicts(projects).to_dataframe()
                 csv = df_export.to_csv(index=False).encode('utf-8')
                 st.download_button(
                     label="Télécharger CSV",
@@ -800,17 +951,11 @@ elif page == "🗂️ Gérer les Projets":
         
         with col2:
             if st.button("🗑️ Effacer tous les projets"):
-                st.session_state.projects = []
+                store.clear()
                 st.rerun()
 
 # ============================================================================
 # FOOTER
 # ============================================================================
 
-st.markdown("---")
-st.markdown("""
-<div style='text-align: center; color: #58595B; padding: 1rem;'>
-    <p><strong>Durabilis & Co</strong> - Data & Impact</p>
-    <p style='font-size: 0.9rem;'>💻 Plateforme optimisée pour Desktop, Tablette et Mobile</p>
-</div>
-""", unsafe_allow_html=True)
+footer()
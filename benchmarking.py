@@ -0,0 +1,277 @@
+"""
+Portfolio Benchmarking for RSE Sport Monitoring Platform
+Percentile ranks of every project within its peer groups (same country, same
+sport category, same budget band), kept in sorted arrays updated incrementally
+"""
+
+import math
+from bisect import bisect_right
+
+import numpy as np
+
+from analytics import impact_score
+from catalogs import SPORTS_LIST
+
+# Metric -> (label, higher is better)
+METRICS = {
+    "cost_per_beneficiary": ("Coût par bénéficiaire", False),
+    "cost_per_session": ("Coût par session", False),
+    "hours_per_participant": ("Heures par participant", True),
+    "impact_score": ("Score d'impact", True),
+}
+DIMENSIONS = {
+    "country": "Pays",
+    "category": "Catégorie sportive",
+    "budget_band": "Tranche de budget",
+}
+
+# Upper bound (exclusive) -> label
+BUDGET_BANDS = (
+    (10_000, "< 10 k€"),
+    (50_000, "10 - 50 k€"),
+    (200_000, "50 - 200 k€"),
+    (math.inf, "> 200 k€"),
+)
+_BAND_LIMITS = [limit for limit, _ in BUDGET_BANDS]
+
+SPORT_CATEGORIES = {sport: category for category, sports in SPORTS_LIST.items() for sport in sports}
+OTHER_CATEGORY = "Autres sports"
+
+# Peer groups smaller than this are reported but not used to flag projects
+MIN_PEERS = 3
+
+
+def _ratio(numerator, denominator):
+    return numerator / denominator if denominator > 0 else math.nan
+
+
+def metric_values(project):
+    """Benchmarked metrics of one project, NaN when the denominator is missing"""
+    return (
+        _ratio(project['budget'], project['beneficiaries']),
+        _ratio(project['budget'], project['indicator_sessions']),
+        _ratio(project['indicator_hours'], project['indicator_participants']),
+        impact_score(project),
+    )
+
+
+def peer_groups(project):
+    """Peer group of a project for each dimension (category of its first sport)"""
+    sports = project['sports']
+    return {
+        "country": project['country'] or 'Inconnu',
+        "category": SPORT_CATEGORIES.get(sports[0], OTHER_CATEGORY) if sports else OTHER_CATEGORY,
+        "budget_band": BUDGET_BANDS[bisect_right(_BAND_LIMITS, project['budget'])][1],
+    }
+
+
+class _PeerGroup:
+    """Members of one peer group: a values row per member and a sorted array per metric"""
+
+    def __init__(self, keys, values):
+        self.members = list(keys)
+        self.positions = {key: i for i, key in enumerate(self.members)}
+        self.values = np.asarray(values, dtype=np.float64).reshape(len(self.members), len(METRICS))
+        self.sorted = [np.sort(column[~np.isnan(column)]) for column in self.values.T]
+        self.rerank()
+
+    def add(self, key, values):
+        self.positions[key] = len(self.members)
+        self.members.append(key)
+        self.values = np.vstack([self.values, values])
+        for i, value in enumerate(values):
+            if not math.isnan(value):
+                column = self.sorted[i]
+                self.sorted[i] = np.insert(column, np.searchsorted(column, value), value)
+
+    def remove(self, key):
+        position = self.positions.pop(key)
+        removed = self.values[position].copy()
+        # Move the last member into the freed row
+        last = self.members.pop()
+        if position < len(self.members):
+            self.members[position] = last
+            self.positions[last] = position
+            self.values[position] = self.values[-1]
+        self.values = self.values[:-1]
+        for i, value in enumerate(removed):
+            if not math.isnan(value):
+                column = self.sorted[i]
+                self.sorted[i] = np.delete(column, np.searchsorted(column, value))
+
+    def rerank(self):
+        """
+        Percentile rank of every member for every metric, oriented so that 100
+        is the best of the group: share of the other members doing worse
+        """
+        ranks = np.full(self.values.shape, np.nan)
+        for i, (_, higher_is_better) in enumerate(METRICS.values()):
+            column = self.sorted[i]
+            n = len(column)
+            if n < 2:
+                continue
+            values = self.values[:, i]
+            known = ~np.isnan(values)
+            if higher_is_better:
+                worse = np.searchsorted(column, values[known], side="left")
+            else:
+                worse = n - np.searchsorted(column, values[known], side="right")
+            ranks[known, i] = 100 * worse / (n - 1)
+        self.ranks = ranks
+
+
+class Benchmark:
+    """
+    Percentile ranks of a portfolio's projects within their peer groups
+
+    Ranks are computed for every project up front, one array per peer group,
+    and looked up in O(1) by project. Adding, removing or updating a project
+    only touches the sorted arrays of the (at most six) groups it leaves or
+    joins, and only those groups are re-ranked.
+    """
+
+    def __init__(self, projects=()):
+        self._projects = {}
+        self._values = {}
+        self._groups = {}
+        self._peers = {}
+        self._build(projects)
+
+    def _build(self, projects):
+        members = {}
+        for project in projects:
+            key = id(project)
+            self._projects[key] = project
+            self._values[key] = metric_values(project)
+            self._groups[key] = peer_groups(project)
+            for dimension, group in self._groups[key].items():
+                members.setdefault((dimension, group), []).append(key)
+        for group_key, keys in members.items():
+            self._peers[group_key] = _PeerGroup(keys, [self._values[key] for key in keys])
+
+    def _rerank(self, group_keys):
+        for group_key in group_keys:
+            group = self._peers.get(group_key)
+            if group is not None:
+                group.rerank()
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def _leave(self, key):
+        touched = []
+        for dimension, group in self._groups[key].items():
+            group_key = (dimension, group)
+            peer_group = self._peers[group_key]
+            peer_group.remove(key)
+            if not peer_group.members:
+                del self._peers[group_key]
+            touched.append(group_key)
+        return touched
+
+    def _join(self, key):
+        touched = []
+        for dimension, group in self._groups[key].items():
+            group_key = (dimension, group)
+            peer_group = self._peers.get(group_key)
+            if peer_group is None:
+                self._peers[group_key] = _PeerGroup([key], [self._values[key]])
+            else:
+                peer_group.add(key, self._values[key])
+            touched.append(group_key)
+        return touched
+
+    def add(self, project):
+        """Add a project and re-rank its peer groups"""
+        key = id(project)
+        if key in self._projects:
+            return self.update(project)
+        self._projects[key] = project
+        self._values[key] = metric_values(project)
+        self._groups[key] = peer_groups(project)
+        self._rerank(self._join(key))
+
+    def remove(self, project):
+        """Remove a project and re-rank the groups it belonged to"""
+        key = id(project)
+        touched = self._leave(key)
+        del self._projects[key], self._values[key], self._groups[key]
+        self._rerank(touched)
+
+    def update(self, project):
+        """Re-measure a project edited in place"""
+        key = id(project)
+        values, groups = metric_values(project), peer_groups(project)
+        if values == self._values[key] and groups == self._groups[key]:
+            return
+        touched = self._leave(key)
+        self._values[key], self._groups[key] = values, groups
+        self._rerank(set(touched + self._join(key)))
+
+    def sync(self, projects):
+        """
+        Follow a project list that gained, lost or replaced projects
+
+        Projects are matched by identity (stores replace a project on update),
+        so only the differences are applied. Returns the number of changes.
+        """
+        current = {id(project): project for project in projects}
+        removed = [self._projects[key] for key in self._projects if key not in current]
+        added = [project for key, project in current.items() if key not in self._projects]
+        if len(removed) + len(added) > len(current) // 2 + 1:
+            # Mostly a new portfolio (tenant switch, reload): cheaper to rebuild
+            for mapping in (self._projects, self._values, self._groups, self._peers):
+                mapping.clear()
+            self._build(projects)
+        else:
+            for project in removed:
+                self.remove(project)
+            for project in added:
+                self.add(project)
+        return len(removed) + len(added)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self._projects)
+
+    def __contains__(self, project):
+        return id(project) in self._projects
+
+    def _entry(self, key, dimension):
+        label = self._groups[key][dimension]
+        group = self._peers[(dimension, label)]
+        entry = {"group": label, "peers": len(group.members)}
+        for metric, rank in zip(METRICS, group.ranks[group.positions[key]].tolist()):
+            entry[metric] = None if math.isnan(rank) else round(rank, 1)
+        return entry
+
+    def ranks(self, project):
+        """
+        Ranks of a project per dimension::
+
+            {"country": {"group": "Sénégal", "peers": 12, "cost_per_beneficiary": 81.8, ...}, ...}
+
+        A rank is ``None`` when the metric is unknown for the project or when
+        fewer than two peers report it.
+        """
+        key = id(project)
+        return {dimension: self._entry(key, dimension) for dimension in DIMENSIONS}
+
+    def rank(self, project, metric, dimension="country"):
+        """Percentile rank (100 = best of its peers) of one metric within one peer group"""
+        return self._entry(id(project), dimension)[metric]
+
+    def laggards(self, metric, dimension="country", threshold=25, min_peers=MIN_PEERS):
+        """Projects ranked at or below ``threshold`` among at least ``min_peers`` peers"""
+        column = list(METRICS).index(metric)
+        flagged = []
+        for (group_dimension, _), group in self._peers.items():
+            if group_dimension != dimension or len(group.members) < min_peers:
+                continue
+            for position in np.flatnonzero(group.ranks[:, column] <= threshold):
+                flagged.append(self._projects[group.members[position]])
+        return flagged
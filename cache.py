@@ -0,0 +1,67 @@
+"""
+Shared Cache for RSE Sport Monitoring Platform
+File-based cache of derived results (aggregates, recommendations, reports)
+shared by every worker process of a node
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+
+# Cache directory of each tenant, next to its projects.json
+CACHE_DIR = "cache"
+
+
+class FileCache:
+    """
+    Results computed by one process and read back by the others
+
+    Entries are keyed by store version: every process learns about a write
+    from the shared event log, so after it no process reads the older entries
+    any more, and the next process caching a result removes them. Values are
+    pickled; the directory must only be writable by the application.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _version_dir(self, version):
+        return os.path.join(self.directory, f"v{version:08d}")
+
+    def _path(self, version, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self._version_dir(version), f"{digest}.pickle")
+
+    def version_path(self, version, name):
+        """Path of a file or directory kept with the entries of ``version`` (and pruned with them)"""
+        return os.path.join(self._version_dir(version), name)
+
+    def get(self, version, key, default=None):
+        try:
+            with open(self._path(version, key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return default
+
+    def put(self, version, key, value):
+        """Store a value atomically (concurrent writers of the same key are harmless)"""
+        path = self._path(version, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.prune(version)
+
+    def prune(self, version):
+        """Remove the entries of versions older than ``version``"""
+        if not os.path.isdir(self.directory):
+            return
+        current = os.path.basename(self._version_dir(version))
+        for name in os.listdir(self.directory):
+            if name.startswith("v") and name < current:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
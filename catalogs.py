@@ -0,0 +1,225 @@
+"""
+Reference Catalogs for RSE Sport Monitoring Platform
+Sports, SDGs, Agenda 2063 aspirations and form options shared across modules,
+built once per process and frozen
+"""
+
+import unicodedata
+from types import MappingProxyType
+
+# ============================================================================
+# SPORTS, SDGs, AGENDA 2063
+# ============================================================================
+
+# Comprehensive Sports List (categorized)
+SPORTS_LIST = {
+    "Sports Collectifs": [
+        "Football", "Basketball", "Volleyball", "Handball", "Rugby", "Hockey sur gazon",
+        "Hockey sur glace", "Water-polo", "Baseball", "Softball", "Cricket", "Futsal",
+        "Beach-volley", "Rugby à 7", "Football américain", "Polo", "Lacrosse", "Kabaddi",
+        "Sepak takraw", "Ultimate frisbee", "Dodgeball", "Netball", "Hurling", "Camogie"
+    ],
+    "Sports Individuels": [
+        "Athlétisme", "Natation", "Cyclisme", "Tennis", "Badminton", "Tennis de table",
+        "Golf", "Boxe", "Judo", "Karaté", "Taekwondo", "Lutte", "Escrime", "Tir",
+        "Tir à l'arc", "Équitation", "Gymnastique", "Haltérophilie", "Triathlon",
+        "Pentathlon moderne", "Ski alpin", "Ski de fond", "Snowboard", "Patinage artistique",
+        "Patinage de vitesse", "Biathlon", "Saut à ski", "Combiné nordique", "Skeleton",
+        "Bobsleigh", "Luge", "Curling", "Surf", "Skateboard", "Escalade sportive",
+        "Voile", "Aviron", "Canoë-kayak", "Plongeon", "Nage synchronisée", "Para-natation"
+    ],
+    "Sports Paralympiques": [
+        "Athlétisme handisport", "Natation handisport", "Basketball fauteuil", "Rugby fauteuil",
+        "Tennis fauteuil", "Tennis de table handisport", "Escrime fauteuil", "Boccia",
+        "Goalball", "Cécifoot", "Volley assis", "Para-cyclisme", "Para-équitation",
+        "Para-aviron", "Para-canoë", "Para-judo", "Para-tir", "Para-tir à l'arc",
+        "Para-triathlon", "Para-haltérophilie", "Para-taekwondo", "Para-badminton"
+    ],
+    "Sports Traditionnels": [
+        "Lutte sénégalaise", "Capoeira", "Kung-fu", "Wushu", "Sumo", "Muay Thai",
+        "Kendo", "Aïkido", "Vovinam", "Silat", "Pétanque", "Boules lyonnaises",
+        "Boomerang", "Sports gaéliques", "Pelote basque"
+    ],
+    "E-Sport": [
+        "League of Legends", "Dota 2", "Counter-Strike", "Valorant", "Fortnite",
+        "FIFA", "eFootball", "NBA 2K", "Rocket League", "Overwatch", "StarCraft",
+        "Rainbow Six Siege", "Call of Duty", "PUBG", "Mobile Legends"
+    ],
+    "Sports de Combat": [
+        "MMA", "Kickboxing", "Boxe française (savate)", "Sambo", "Krav Maga",
+        "Jiu-jitsu brésilien", "Catch", "Pancrace"
+    ],
+    "Sports Nautiques": [
+        "Planche à voile", "Kitesurf", "Stand-up paddle", "Wakeboard", "Ski nautique",
+        "Jet-ski", "Plongée sous-marine", "Nage en eau libre", "Sauvetage côtier"
+    ],
+    "Sports Aériens": [
+        "Parachutisme", "Parapente", "Vol à voile", "Deltaplane", "Base jump", "Wingsuit"
+    ],
+    "Sports Mécaniques": [
+        "Formule 1", "Rallye", "MotoGP", "Karting", "Endurance moto", "Trial",
+        "Speedway", "Rallycross", "Drift", "Formule E"
+    ],
+    "Sports de Montagne": [
+        "Alpinisme", "Randonnée", "Trail running", "VTT", "Ski-alpinisme",
+        "Cascade de glace", "Via ferrata", "Slackline"
+    ],
+    "Autres Sports": [
+        "Danse sportive", "Cheerleading", "Crossfit", "Fitness", "Yoga sportif",
+        "Parkour", "Roller", "BMX", "Squash", "Padel", "Billard", "Fléchettes",
+        "Bowling", "Arts martiaux mixtes", "Powerlifting", "Strongman"
+    ]
+}
+
+# Flatten sports list
+ALL_SPORTS = []
+for category, sports in SPORTS_LIST.items():
+    ALL_SPORTS.extend(sports)
+ALL_SPORTS = sorted(set(ALL_SPORTS))
+
+# Alternative spellings, English names and common abbreviations; para-sport
+# variants ("para-X", "X handisport", "X fauteuil", "wheelchair X") are derived
+# automatically by the sport catalog index
+SPORT_ALIASES = {
+    "Football": ["Foot", "Soccer", "Football association"],
+    "Basketball": ["Basket", "Basket-ball"],
+    "Volleyball": ["Volley", "Volley-ball"],
+    "Handball": ["Hand", "Hand-ball"],
+    "Hockey sur gazon": ["Field hockey"],
+    "Hockey sur glace": ["Ice hockey"],
+    "Water-polo": ["Waterpolo"],
+    "Beach-volley": ["Beach volleyball", "Volley de plage"],
+    "Rugby à 7": ["Rugby sevens", "Rugby 7", "Rugby à sept"],
+    "Football américain": ["American football"],
+    "Ultimate frisbee": ["Ultimate", "Frisbee"],
+    "Dodgeball": ["Balle au prisonnier"],
+    "Athlétisme": ["Athletics", "Track and field", "Athlé", "Course à pied", "Running"],
+    "Natation": ["Swimming", "Nage"],
+    "Cyclisme": ["Cycling", "Vélo"],
+    "Tennis de table": ["Table tennis", "Ping-pong", "Ping pong"],
+    "Boxe": ["Boxing"],
+    "Lutte": ["Wrestling"],
+    "Escrime": ["Fencing"],
+    "Tir": ["Shooting"],
+    "Tir à l'arc": ["Archery"],
+    "Équitation": ["Equestrian", "Horse riding", "Hippisme"],
+    "Gymnastique": ["Gymnastics", "Gym"],
+    "Haltérophilie": ["Weightlifting"],
+    "Ski alpin": ["Alpine skiing"],
+    "Ski de fond": ["Cross-country skiing"],
+    "Patinage artistique": ["Figure skating"],
+    "Patinage de vitesse": ["Speed skating"],
+    "Saut à ski": ["Ski jumping"],
+    "Combiné nordique": ["Nordic combined"],
+    "Escalade sportive": ["Escalade", "Climbing", "Sport climbing"],
+    "Voile": ["Sailing"],
+    "Aviron": ["Rowing"],
+    "Canoë-kayak": ["Canoe", "Canoë", "Kayak"],
+    "Plongeon": ["Diving"],
+    "Nage synchronisée": ["Natation artistique", "Artistic swimming", "Synchronized swimming"],
+    "Basketball fauteuil": ["Wheelchair basketball", "Basket fauteuil"],
+    "Cécifoot": ["Blind football", "Football à 5 non-voyants"],
+    "Volley assis": ["Sitting volleyball"],
+    "Lutte sénégalaise": ["Laamb", "Lamb"],
+    "Pétanque": ["Boules"],
+    "Jiu-jitsu brésilien": ["JJB", "BJJ", "Brazilian jiu-jitsu"],
+    "Boxe française (savate)": ["Savate", "Boxe française"],
+    "Planche à voile": ["Windsurf"],
+    "Plongée sous-marine": ["Scuba diving", "Plongée"],
+    "Nage en eau libre": ["Open water swimming"],
+    "Randonnée": ["Hiking", "Trekking"],
+    "VTT": ["Vélo tout terrain", "Mountain bike", "MTB"],
+    "Danse sportive": ["Dancesport", "Danse"],
+    "Roller": ["Roller skating", "Patin à roulettes"],
+    "Fléchettes": ["Darts"],
+    "Billard": ["Billiards", "Snooker", "Pool"],
+    "Arts martiaux mixtes": ["Mixed martial arts"],
+    "FIFA": ["EA Sports FC", "EA FC"],
+    "League of Legends": ["LoL"],
+    "Counter-Strike": ["CS", "CSGO", "CS2"],
+}
+
+# 17 SDGs
+SDGS = [
+    {"num": 1, "title": "Pas de pauvreté", "color": "#E5243B"},
+    {"num": 2, "title": "Faim « zéro »", "color": "#DDA63A"},
+    {"num": 3, "title": "Bonne santé et bien-être", "color": "#4C9F38"},
+    {"num": 4, "title": "Éducation de qualité", "color": "#C5192D"},
+    {"num": 5, "title": "Égalité entre les sexes", "color": "#FF3A21"},
+    {"num": 6, "title": "Eau propre et assainissement", "color": "#26BDE2"},
+    {"num": 7, "title": "Énergie propre et d'un coût abordable", "color": "#FCC30B"},
+    {"num": 8, "title": "Travail décent et croissance économique", "color": "#A21942"},
+    {"num": 9, "title": "Industrie, innovation et infrastructure", "color": "#FD6925"},
+    {"num": 10, "title": "Inégalités réduites", "color": "#DD1367"},
+    {"num": 11, "title": "Villes et communautés durables", "color": "#FD9D24"},
+    {"num": 12, "title": "Consommation et production responsables", "color": "#BF8B2E"},
+    {"num": 13, "title": "Mesures relatives à la lutte contre les changements climatiques", "color": "#3F7E44"},
+    {"num": 14, "title": "Vie aquatique", "color": "#0A97D9"},
+    {"num": 15, "title": "Vie terrestre", "color": "#56C02B"},
+    {"num": 16, "title": "Paix, justice et institutions efficaces", "color": "#00689D"},
+    {"num": 17, "title": "Partenariats pour la réalisation des objectifs", "color": "#19486A"},
+]
+
+SDG_OPTIONS = [f"ODD {sdg['num']}: {sdg['title']}" for sdg in SDGS]
+
+# Agenda 2063
+AGENDA_2063 = [
+    "Aspiration 1 : Une Afrique prospère basée sur la croissance inclusive et le développement durable",
+    "Aspiration 2 : Un continent intégré, politiquement uni, ancré dans les idéaux du panafricanisme",
+    "Aspiration 3 : Une Afrique où règnent la bonne gouvernance, la démocratie, le respect des droits humains, la justice et l'État de droit",
+    "Aspiration 4 : Une Afrique vivant dans la paix et la sécurité",
+    "Aspiration 5 : Une Afrique dotée d'une identité culturelle, d'un patrimoine, de valeurs et d'une éthique forts",
+    "Aspiration 6 : Une Afrique dont le développement est axé sur les populations, qui s'appuie sur le potentiel de ses populations, notamment celles des femmes et des jeunes",
+    "Aspiration 7 : Une Afrique forte, résiliente et influente, acteur et partenaire mondial"
+]
+
+# ============================================================================
+# FORM OPTIONS
+# ============================================================================
+
+COUNTRIES = [
+    "Sénégal", "Côte d'Ivoire", "Bénin", "Burkina Faso", "Mali", "Niger", "Togo",
+    "Ghana", "Nigeria", "Kenya", "Afrique du Sud", "Cameroun", "RD Congo", "France", "Autre"
+]
+
+SPORT_LEVELS = ["Initiation", "Loisir", "Amateur", "Semi-professionnel", "Professionnel", "Élite/Haut niveau"]
+
+TARGET_AUDIENCES = [
+    "Enfants (0-12 ans)", "Adolescents (13-17 ans)", "Jeunes adultes (18-25 ans)",
+    "Adultes (26-50 ans)", "Seniors (50+ ans)", "Personnes en situation de handicap",
+    "Femmes", "Hommes", "Mixte"
+]
+
+IMPACT_LEVELS = ["Très faible", "Faible", "Moyen", "Fort", "Très fort"]
+
+MONITORING_TOOLS = [
+    "Questionnaires", "Entretiens", "Observations terrain", "Données analytiques",
+    "Reporting mensuel", "Évaluation externe", "Auto-évaluation", "Tableaux de bord"
+]
+
+MONITORING_FREQUENCIES = ["Hebdomadaire", "Bimensuel", "Mensuel", "Trimestriel", "Semestriel", "Annuel"]
+
+# ============================================================================
+# FROZEN CATALOGS
+# ============================================================================
+
+# Shared by every module, session and entry point of the process: read-only,
+# so no caller can alter them for the others
+SPORTS_LIST = MappingProxyType({category: tuple(sports) for category, sports in SPORTS_LIST.items()})
+ALL_SPORTS = tuple(ALL_SPORTS)
+SPORT_ALIASES = MappingProxyType({sport: tuple(aliases) for sport, aliases in SPORT_ALIASES.items()})
+SDGS = tuple(MappingProxyType(sdg) for sdg in SDGS)
+SDG_OPTIONS = tuple(SDG_OPTIONS)
+AGENDA_2063 = tuple(AGENDA_2063)
+COUNTRIES = tuple(COUNTRIES)
+SPORT_LEVELS = tuple(SPORT_LEVELS)
+TARGET_AUDIENCES = tuple(TARGET_AUDIENCES)
+IMPACT_LEVELS = tuple(IMPACT_LEVELS)
+MONITORING_TOOLS = tuple(MONITORING_TOOLS)
+MONITORING_FREQUENCIES = tuple(MONITORING_FREQUENCIES)
+
+
+def fold(text):
+    """Case and accent insensitive key ('Équitation' -> 'equitation')"""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold().strip()
@@ -0,0 +1,193 @@
+"""
+Report Charts for RSE Sport Monitoring Platform
+Headless ReportLab drawings (SDG bars, impact radar, country distribution)
+embedded in PDF reports, memoized on the data they plot
+"""
+
+import re
+from functools import lru_cache
+
+from reportlab.graphics import renderPDF, renderSVG
+from reportlab.graphics.charts.barcharts import HorizontalBarChart, VerticalBarChart
+from reportlab.graphics.charts.spider import SpiderChart
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.platypus import Flowable
+
+from catalogs import SDGS
+
+CHART_WIDTH = 15*cm
+CHART_HEIGHT = 6*cm
+MAX_COUNTRIES = 12
+IMPACT_SCALE = 5
+
+CHART_BLUE = colors.HexColor('#00A9E0')
+CHART_DARK_BLUE = colors.HexColor('#2E3192')
+CHART_GREY = colors.HexColor('#58595B')
+
+_SDG_COLORS = [colors.HexColor(sdg["color"]) for sdg in SDGS]
+_BETWEEN_TAGS = re.compile(r">\s+<")
+
+
+class ChartFlowable(Flowable):
+    """
+    Per-document wrapper around a cached drawing
+
+    Platypus stores layout state on the flowables it places (postponement,
+    frame bookkeeping); wrapping keeps that state off the shared drawing.
+    """
+
+    def __init__(self, drawing):
+        super().__init__()
+        self.drawing = drawing
+        self.width, self.height = drawing.width, drawing.height
+
+    def wrap(self, available_width, available_height):
+        return self.width, self.height
+
+    def draw(self):
+        renderPDF.draw(self.drawing, self.canv, 0, 0)
+
+
+def _titled(title, height=CHART_HEIGHT):
+    drawing = Drawing(CHART_WIDTH, height)
+    drawing.add(String(0, height - 10, title, fontName='Helvetica-Bold', fontSize=10, fillColor=CHART_DARK_BLUE))
+    return drawing
+
+
+@lru_cache(maxsize=16)
+def _placeholder(title):
+    """Titled drawing for a chart with nothing to plot (ReportLab charts need data)"""
+    drawing = _titled(title, CHART_HEIGHT / 2)
+    drawing.add(String(CHART_WIDTH / 2, CHART_HEIGHT / 4 - 5, "Aucune donnée", textAnchor='middle',
+                       fontName='Helvetica-Oblique', fontSize=9, fillColor=CHART_GREY))
+    return drawing
+
+
+# ============================================================================
+# CACHED BUILDERS
+# Arguments are hashable snapshots of the plotted data, so a batch of reports
+# sharing the same figures (same portfolio, same impact profile) builds each
+# drawing once. Drawings are immutable once built and safe to reuse.
+# ============================================================================
+
+@lru_cache(maxsize=256)
+def _sdg_bars(counts):
+    if not any(counts):
+        return _placeholder("Projets par ODD")
+    drawing = _titled("Projets par ODD")
+    chart = VerticalBarChart()
+    chart.x, chart.y = 1*cm, 0.8*cm
+    chart.width, chart.height = CHART_WIDTH - 1.5*cm, CHART_HEIGHT - 1.8*cm
+    chart.data = [list(counts)]
+    chart.categoryAxis.categoryNames = [str(sdg["num"]) for sdg in SDGS]
+    chart.categoryAxis.labels.fontSize = 7
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontSize = 7
+    chart.valueAxis.labelTextFormat = '%d'
+    chart.bars.strokeColor = None
+    for i, color in enumerate(_SDG_COLORS):
+        chart.bars[(0, i)].fillColor = color
+    drawing.add(chart)
+    return drawing
+
+
+@lru_cache(maxsize=256)
+def _impact_radar(series):
+    drawing = _titled("Profil d'impact (échelle 1-5)")
+    chart = SpiderChart()
+    chart.x, chart.y = 4*cm, 0.2*cm
+    chart.width, chart.height = 7*cm, CHART_HEIGHT - 1*cm
+    # An invisible outer strand pins the scale to 5 whatever the averages are
+    chart.data = [[IMPACT_SCALE] * 3] + [list(values) for _, values in series]
+    chart.labels = ["Social", "Environnemental", "Économique"]
+    chart.spokeLabels.fontName = 'Helvetica'
+    chart.spokeLabels.fontSize = 8
+    chart.strands[0].strokeColor = None
+    chart.strands[0].fillColor = None
+    palette = [CHART_BLUE, CHART_GREY]
+    for i in range(1, len(series) + 1):
+        chart.strands[i].strokeColor = palette[(i - 1) % len(palette)]
+        chart.strands[i].fillColor = None
+        chart.strands[i].strokeWidth = 1.5
+    drawing.add(chart)
+    for i, (name, _) in enumerate(series):
+        drawing.add(String(12*cm, CHART_HEIGHT - 1.2*cm - i * 0.5*cm, f"— {name}",
+                           fontName='Helvetica', fontSize=8, fillColor=palette[i % len(palette)]))
+    return drawing
+
+
+@lru_cache(maxsize=256)
+def _country_bars(items):
+    if not items:
+        return _placeholder("Projets par pays")
+    height = max(CHART_HEIGHT, 1.5*cm + 0.55*cm * len(items))
+    drawing = _titled("Projets par pays", height)
+    chart = HorizontalBarChart()
+    chart.x, chart.y = 3.5*cm, 0.5*cm
+    chart.width, chart.height = CHART_WIDTH - 4*cm, height - 1.5*cm
+    # Largest first from the top of the chart
+    chart.data = [[count for _, count in reversed(items)]]
+    chart.categoryAxis.categoryNames = [country for country, _ in reversed(items)]
+    chart.categoryAxis.labels.fontSize = 8
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontSize = 7
+    chart.valueAxis.labelTextFormat = '%d'
+    chart.bars[0].fillColor = CHART_BLUE
+    chart.bars.strokeColor = None
+    drawing.add(chart)
+    return drawing
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def sdg_chart(sdg_counts):
+    """Bar chart of projects per SDG from ``analytics.sdg_distribution`` output"""
+    return ChartFlowable(_sdg_bars(tuple(sdg_counts.get(sdg["num"], 0) for sdg in SDGS)))
+
+
+def impact_chart(*profiles):
+    """
+    Radar of one or more impact profiles
+
+    Each profile is a ``(name, averages)`` pair where averages is the
+    ``analytics.impact_averages`` dictionary (or the same keys for a project).
+    """
+    series = tuple(
+        (name, tuple(round(averages[axis], 2) for axis in ("Social", "Environnemental", "Économique")))
+        for name, averages in profiles
+    )
+    return ChartFlowable(_impact_radar(series))
+
+
+def country_chart(country_counts):
+    """Horizontal bars of the most represented countries"""
+    items = sorted(country_counts.items(), key=lambda item: (-item[1], item[0]))[:MAX_COUNTRIES]
+    return ChartFlowable(_country_bars(tuple(items)))
+
+
+def chart_svg(chart):
+    """Inline SVG markup of a chart, for HTML reports"""
+    return _svg(chart.drawing)
+
+
+@lru_cache(maxsize=256)
+def _svg(drawing):
+    # Keyed on the drawing itself: the builders return the same object for the
+    # same data, so each distinct chart is serialized once
+    svg = renderSVG.drawToString(drawing)
+    svg = svg[svg.index("<svg"):]
+    return _BETWEEN_TAGS.sub("><", svg).strip()
+
+
+def cache_info():
+    """Hit / miss counters of the drawing caches"""
+    return {
+        "sdg": _sdg_bars.cache_info(),
+        "impact": _impact_radar.cache_info(),
+        "country": _country_bars.cache_info(),
+        "svg": _svg.cache_info(),
+    }
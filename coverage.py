@@ -0,0 +1,112 @@
+"""
+SDG Coverage for RSE Sport Monitoring Platform
+Sparse project x SDG and project x Agenda 2063 aspiration incidence matrices:
+co-occurrences, budget- and beneficiary-weighted coverage and coverage gaps
+"""
+
+import numpy as np
+
+from catalogs import AGENDA_2063, SDGS
+from models import Project, ProjectTable
+
+# An objective receiving less than this share of the (weighted) coverage is
+# reported as under-funded
+GAP_SHARE = 0.02
+
+OBJECTIVES = {
+    "sdg": ("sdg_mask", [f"ODD {sdg['num']}" for sdg in SDGS]),
+    "aspiration": ("aspiration_mask", [f"Aspiration {num}" for num in range(1, len(AGENDA_2063) + 1)]),
+}
+WEIGHTS = {"projects": "Projets", "budget": "Budget (€)", "beneficiaries": "Bénéficiaires"}
+
+
+class IncidenceMatrix:
+    """
+    Sparse 0/1 matrix of projects x objectives
+
+    Rows are projects, columns objectives (SDG or aspiration numbers - 1).
+    The matrix is stored as its distinct rows (bit masks) and the distinct
+    row of each project: a portfolio has few distinct combinations of
+    objectives, so ``A.T @ diag(w) @ A`` costs one weighted count over the
+    projects plus a product of a few hundred rows.
+    """
+
+    def __init__(self, masks, size):
+        self.size = size
+        self.masks = np.asarray(masks, dtype=np.int64)
+        self.shape = (len(self.masks), size)
+        # Distinct rows and the row of each project
+        self.patterns, self.pattern_of = np.unique(self.masks, return_inverse=True)
+        self._pattern_bits = ((self.patterns[:, None] >> np.arange(size)[None, :]) & 1).astype(np.float64)
+
+    @classmethod
+    def from_projects(cls, projects, objective="sdg"):
+        """Incidence of a ProjectTable, Project records or project dictionaries"""
+        column, labels = OBJECTIVES[objective]
+        if isinstance(projects, ProjectTable):
+            masks = projects.columns[column]
+        else:
+            masks = np.fromiter((getattr(p, column) for p in _records(projects)), dtype=np.int64)
+        return cls(masks, len(labels))
+
+    def _pattern_weights(self, weights):
+        if weights is None:
+            return np.bincount(self.pattern_of, minlength=len(self.patterns)).astype(np.float64)
+        return np.bincount(self.pattern_of, weights=np.asarray(weights, dtype=np.float64), minlength=len(self.patterns))
+
+    def coverage(self, weights=None):
+        """``A.T @ w``: per objective, number of projects (or sum of their weights)"""
+        return self._pattern_bits.T @ self._pattern_weights(weights)
+
+    def cooccurrence(self, weights=None):
+        """``A.T @ diag(w) @ A``: projects (or weights) sharing each pair of objectives"""
+        return self._pattern_bits.T @ (self._pattern_bits * self._pattern_weights(weights)[:, None])
+
+
+def _records(projects):
+    return [p if isinstance(p, Project) else Project.from_dict(p) for p in projects]
+
+
+def _weights(projects):
+    if isinstance(projects, ProjectTable):
+        return {name: projects.columns[name] for name in ("budget", "beneficiaries")}
+    return {
+        name: np.fromiter((getattr(p, name) for p in projects), dtype=np.float64, count=len(projects))
+        for name in ("budget", "beneficiaries")
+    }
+
+
+def coverage_report(projects, objective="sdg", gap_share=GAP_SHARE):
+    """
+    Coverage of the SDGs (or Agenda 2063 aspirations) by a portfolio::
+
+        {"labels": [...], "coverage": {"projects": [...], "budget": [...], "beneficiaries": [...]},
+         "cooccurrence": {"projects": [[...]], "budget": [[...]]},
+         "uncovered": [labels], "underfunded": [labels]}
+
+    ``projects`` may be a ProjectTable, Project records or dictionaries.
+    """
+    if not isinstance(projects, ProjectTable):
+        projects = _records(projects)
+    matrix = IncidenceMatrix.from_projects(projects, objective)
+    labels = OBJECTIVES[objective][1]
+    weights = _weights(projects)
+    coverage = {"projects": matrix.coverage()}
+    coverage.update({name: matrix.coverage(values) for name, values in weights.items()})
+
+    budget = coverage["budget"]
+    total_budget = budget.sum()
+    uncovered = [labels[i] for i in np.flatnonzero(coverage["projects"] == 0)]
+    underfunded = [
+        labels[i] for i in np.flatnonzero((coverage["projects"] > 0) & (budget < gap_share * total_budget))
+    ] if total_budget else []
+    return {
+        "labels": labels,
+        "coverage": {name: values.tolist() for name, values in coverage.items()},
+        "cooccurrence": {
+            "projects": matrix.cooccurrence().tolist(),
+            "budget": matrix.cooccurrence(weights["budget"]).tolist(),
+        },
+        "uncovered": uncovered,
+        "underfunded": underfunded,
+    }
@@ -0,0 +1,207 @@
+"""
+Project Diagnostics for RSE Sport Monitoring Platform
+Portfolio-wide indicators computed in one vectorized pass (completeness, cost
+per beneficiary percentile, SDG breadth, impact versus country and sport peers)
+and turned into the data-driven conclusions of the reports
+"""
+
+import numpy as np
+
+from analytics import IMPACT_MAP, impact_score
+
+MONITORED_FIELDS = ("beneficiaries", "indicator_participants", "indicator_sessions", "indicator_hours")
+
+# Thresholds behind the conclusions
+LOW_COST_PERCENTILE = 25
+HIGH_COST_PERCENTILE = 75
+COMPLETE_SHARE = 0.8
+INCOMPLETE_SHARE = 0.5
+BROAD_SDG_COUNT = 3
+PEER_GAP = 0.5
+LOW_IMPACT = 2
+
+DIAGNOSTIC_FIELDS = (
+    "completeness_pct", "cost_percentile", "median_cost", "sdg_percentile",
+    "impact_score", "country_impact", "country_peers", "sport_impact", "case_study",
+)
+
+
+def _percentile(sorted_values, value):
+    """Share (0-100) of the portfolio strictly below ``value``"""
+    if not len(sorted_values) or value != value:
+        return float("nan")
+    return 100 * np.searchsorted(sorted_values, value, side="left") / len(sorted_values)
+
+
+def _group_means(keys, values):
+    """Mean of ``values`` per key and the size of each group"""
+    if not len(keys):
+        return {}
+    uniques, codes = np.unique(np.asarray(keys, dtype=object).astype(str), return_inverse=True)
+    sums = np.bincount(codes, weights=values)
+    counts = np.bincount(codes)
+    return {key: (sums[i] / counts[i], int(counts[i])) for i, key in enumerate(uniques)}
+
+
+class PortfolioDiagnostics:
+    """
+    Diagnostics of every project of a portfolio, computed once
+
+    Columns are extracted in a single pass, then percentiles and peer averages
+    are computed with NumPy for the whole portfolio. ``row(project)`` is a
+    dictionary lookup for portfolio members; other projects are positioned
+    against the same sorted arrays.
+    """
+
+    def __init__(self, projects):
+        self.projects = projects
+        n = len(projects)
+        budget = np.fromiter((p['budget'] for p in projects), dtype=np.float64, count=n)
+        monitored = np.array([[p[field] for field in MONITORED_FIELDS] for p in projects], dtype=np.float64).reshape(n, len(MONITORED_FIELDS))
+        tools = np.fromiter((bool(p['monitoring_tools']) for p in projects), dtype=bool, count=n)
+        self.sdg_count = np.fromiter((len(p['sdgs']) for p in projects), dtype=np.int64, count=n)
+        self.impact = np.fromiter((impact_score(p) for p in projects), dtype=np.float64, count=n)
+        countries = [p['country'] or 'Inconnu' for p in projects]
+
+        beneficiaries = monitored[:, 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.cost = np.where(beneficiaries > 0, budget / beneficiaries, np.nan)
+        self.completeness = (np.count_nonzero(monitored > 0, axis=1) + tools) / (len(MONITORED_FIELDS) + 1)
+
+        self._sorted_cost = np.sort(self.cost[~np.isnan(self.cost)])
+        self._sorted_sdgs = np.sort(self.sdg_count)
+        self.median_cost = float(np.median(self._sorted_cost)) if len(self._sorted_cost) else 0.0
+
+        # Ranks of every member at once (same definition as _percentile)
+        self.cost_percentile = np.full(n, np.nan)
+        known = ~np.isnan(self.cost)
+        if known.any():
+            self.cost_percentile[known] = 100 * np.searchsorted(self._sorted_cost, self.cost[known], side="left") / len(self._sorted_cost)
+        self.sdg_percentile = 100 * np.searchsorted(self._sorted_sdgs, self.sdg_count, side="left") / max(n, 1)
+
+        self.country_impact = _group_means(countries, self.impact)
+        sport_keys = [sport for p in projects for sport in p['sports']]
+        sport_values = np.repeat(self.impact, [len(p['sports']) for p in projects])
+        self.sport_impact = _group_means(sport_keys, sport_values)
+
+        self._positions = {id(p): i for i, p in enumerate(projects)}
+        self._rows = {}
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _measure(self, project):
+        position = self._positions.get(id(project))
+        if position is not None:
+            return (self.completeness[position], self.cost[position], self.cost_percentile[position],
+                    self.sdg_count[position], self.sdg_percentile[position], self.impact[position])
+        # Project outside the portfolio: same measures against the sorted columns
+        monitored = [project[field] for field in MONITORED_FIELDS]
+        completeness = (sum(1 for value in monitored if value > 0) + bool(project['monitoring_tools'])) / (len(MONITORED_FIELDS) + 1)
+        cost = project['budget'] / project['beneficiaries'] if project['beneficiaries'] > 0 else float("nan")
+        sdgs = len(project['sdgs'])
+        return (completeness, cost, _percentile(self._sorted_cost, cost),
+                sdgs, _percentile(self._sorted_sdgs, sdgs), impact_score(project))
+
+    def row(self, project):
+        """Diagnostic values and conclusions of one project"""
+        key = id(project)
+        if key in self._rows and key in self._positions:
+            return self._rows[key]
+        completeness, cost, cost_percentile, sdgs, sdg_percentile, impact = self._measure(project)
+        country_impact, country_peers = self.country_impact.get(project['country'] or 'Inconnu', (impact, 1))
+        sport_means = [self.sport_impact[s][0] for s in project['sports'] if s in self.sport_impact]
+        sport_impact = sum(sport_means) / len(sport_means) if sport_means else impact
+
+        row = {
+            "completeness": completeness,
+            "completeness_pct": round(100 * completeness),
+            "cost": cost,
+            "cost_percentile": cost_percentile,
+            "median_cost": self.median_cost,
+            "sdg_count": int(sdgs),
+            "sdg_percentile": sdg_percentile,
+            "impact_score": impact,
+            "country_impact": country_impact,
+            "country_peers": country_peers,
+            "sport_impact": sport_impact,
+            "portfolio_size": len(self.projects),
+        }
+        row["positives"], row["concerns"] = conclusions(project, row)
+        row["case_study"] = case_study(project, row)
+        if key in self._positions:
+            self._rows[key] = row
+        return row
+
+
+# ============================================================================
+# CONCLUSIONS
+# ============================================================================
+
+def conclusions(project, row):
+    """Positive points and points of attention derived from a diagnostic row"""
+    positives = []
+    concerns = []
+
+    if row["completeness"] >= COMPLETE_SHARE:
+        positives.append(f"Suivi complet : {row['completeness_pct']} % des indicateurs renseignés")
+    elif row["completeness"] < INCOMPLETE_SHARE:
+        concerns.append(f"Suivi à renforcer : {row['completeness_pct']} % des indicateurs renseignés")
+
+    # Rankings only mean something against other projects
+    ranked = row["portfolio_size"] > 1
+    percentile = row["cost_percentile"]
+    if row["cost"] != row["cost"]:
+        concerns.append("Nombre de bénéficiaires non renseigné")
+    elif ranked:
+        if percentile <= LOW_COST_PERCENTILE:
+            positives.append(f"Coût par bénéficiaire parmi les plus bas du portefeuille ({row['cost']:,.0f} €)")
+        elif percentile >= HIGH_COST_PERCENTILE:
+            concerns.append(
+                f"Coût par bénéficiaire élevé : {row['cost']:,.0f} € (médiane {row['median_cost']:,.0f} €)"
+            )
+
+    if row["sdg_count"] >= BROAD_SDG_COUNT:
+        breadth = f"Large couverture ODD ({row['sdg_count']} objectifs"
+        if ranked and row["sdg_percentile"] > 0:
+            breadth += f", plus que {row['sdg_percentile']:.0f} % du portefeuille"
+        positives.append(breadth + ")")
+    elif row["sdg_count"] <= 1:
+        concerns.append(f"Alignement ODD limité ({row['sdg_count']} objectif)")
+
+    if row["country_peers"] > 1:
+        gap = row["impact_score"] - row["country_impact"]
+        if gap >= PEER_GAP:
+            positives.append(f"Impact supérieur aux projets du même pays ({row['impact_score']:.1f} vs {row['country_impact']:.1f})")
+        elif gap <= -PEER_GAP:
+            concerns.append(f"Impact inférieur aux projets du même pays ({row['impact_score']:.1f} vs {row['country_impact']:.1f})")
+    gap = row["impact_score"] - row["sport_impact"]
+    if gap >= PEER_GAP:
+        positives.append(f"Impact supérieur aux projets des mêmes sports ({row['impact_score']:.1f} vs {row['sport_impact']:.1f})")
+    elif gap <= -PEER_GAP:
+        concerns.append(f"Impact inférieur aux projets des mêmes sports ({row['impact_score']:.1f} vs {row['sport_impact']:.1f})")
+
+    if IMPACT_MAP.get(project['impact_environmental'], 3) <= LOW_IMPACT:
+        concerns.append("Impact environnemental faible")
+
+    return (
+        positives or ["Résultats dans la moyenne du portefeuille"],
+        concerns or ["Aucun point de vigilance majeur identifié"],
+    )
+
+
+def case_study(project, row):
+    """Case study paragraph built from the project's figures and its position in the portfolio"""
+    text = (
+        f"Les {project['beneficiaries']:,} bénéficiaires ont participé à "
+        f"{project['indicator_sessions']:,} sessions sportives"
+    )
+    if row["cost"] == row["cost"]:
+        text += f", pour un coût de {row['cost']:,.0f} € par bénéficiaire"
+        if row["portfolio_size"] > 1:
+            text += f" (médiane du portefeuille : {row['median_cost']:,.0f} €)"
+    text += f". Score d'impact moyen : {row['impact_score']:.1f}/5"
+    if row["country_peers"] > 1:
+        text += f", contre {row['country_impact']:.1f}/5 pour les {row['country_peers']} projets du même pays"
+    return text + "."
@@ -0,0 +1,168 @@
+"""
+Geographic Layer for RSE Sport Monitoring Platform
+Offline gazetteer, cached geocoding of project locations and per-country /
+per-city aggregates used to draw the project map
+"""
+
+import re
+from functools import lru_cache
+
+from catalogs import fold
+
+# Country -> (ISO-3 code, latitude, longitude of the centroid)
+COUNTRY_GAZETTEER = {
+    "Sénégal": ("SEN", 14.50, -14.45),
+    "Côte d'Ivoire": ("CIV", 7.54, -5.55),
+    "Bénin": ("BEN", 9.31, 2.32),
+    "Burkina Faso": ("BFA", 12.24, -1.56),
+    "Mali": ("MLI", 17.57, -4.00),
+    "Niger": ("NER", 17.61, 8.08),
+    "Togo": ("TGO", 8.62, 0.82),
+    "Ghana": ("GHA", 7.95, -1.02),
+    "Nigeria": ("NGA", 9.08, 8.68),
+    "Kenya": ("KEN", -0.02, 37.91),
+    "Afrique du Sud": ("ZAF", -30.56, 22.94),
+    "Cameroun": ("CMR", 7.37, 12.35),
+    "RD Congo": ("COD", -4.04, 21.76),
+    "France": ("FRA", 46.23, 2.21),
+}
+
+# Country -> {city: (latitude, longitude)}; alternative spellings share coordinates
+CITY_GAZETTEER = {
+    "Sénégal": {
+        "Dakar": (14.72, -17.47), "Pikine": (14.75, -17.39), "Guédiawaye": (14.78, -17.39),
+        "Rufisque": (14.72, -17.27), "Thiès": (14.79, -16.93), "Mbour": (14.42, -16.96),
+        "Saint-Louis": (16.03, -16.49), "Touba": (14.85, -15.88), "Kaolack": (14.15, -16.07),
+        "Ziguinchor": (12.56, -16.27), "Tambacounda": (13.77, -13.67), "Kolda": (12.89, -14.94),
+    },
+    "Côte d'Ivoire": {
+        "Abidjan": (5.36, -4.01), "Yamoussoukro": (6.83, -5.29), "Bouaké": (7.69, -5.03),
+        "San-Pédro": (4.75, -6.64), "Korhogo": (9.46, -5.63), "Daloa": (6.88, -6.45),
+        "Man": (7.41, -7.55), "Grand-Bassam": (5.21, -3.74),
+    },
+    "Bénin": {
+        "Cotonou": (6.37, 2.39), "Porto-Novo": (6.50, 2.60), "Abomey-Calavi": (6.45, 2.36),
+        "Parakou": (9.34, 2.63), "Djougou": (9.71, 1.67), "Bohicon": (7.18, 2.07), "Natitingou": (10.30, 1.38),
+    },
+    "Burkina Faso": {
+        "Ouagadougou": (12.37, -1.52), "Bobo-Dioulasso": (11.18, -4.30), "Koudougou": (12.25, -2.36),
+        "Ouahigouya": (13.58, -2.42), "Banfora": (10.63, -4.76), "Kaya": (13.09, -1.08),
+    },
+    "Mali": {
+        "Bamako": (12.64, -8.00), "Sikasso": (11.32, -5.67), "Ségou": (13.43, -6.26),
+        "Mopti": (14.49, -4.18), "Kayes": (14.45, -11.44), "Tombouctou": (16.77, -3.01), "Gao": (16.27, -0.04),
+    },
+    "Niger": {
+        "Niamey": (13.51, 2.11), "Zinder": (13.81, 8.99), "Maradi": (13.50, 7.10),
+        "Agadez": (16.97, 7.99), "Tahoua": (14.89, 5.27), "Dosso": (13.05, 3.19),
+    },
+    "Togo": {
+        "Lomé": (6.13, 1.22), "Kara": (9.55, 1.19), "Sokodé": (8.98, 1.14),
+        "Kpalimé": (6.90, 0.63), "Atakpamé": (7.53, 1.13), "Dapaong": (10.86, 0.21),
+    },
+    "Ghana": {
+        "Accra": (5.60, -0.19), "Kumasi": (6.69, -1.62), "Tamale": (9.40, -0.84),
+        "Takoradi": (4.90, -1.76), "Cape Coast": (5.11, -1.25), "Tema": (5.67, -0.02), "Ho": (6.60, 0.47),
+    },
+    "Nigeria": {
+        "Lagos": (6.52, 3.38), "Abuja": (9.06, 7.49), "Kano": (12.00, 8.52), "Ibadan": (7.38, 3.95),
+        "Port Harcourt": (4.82, 7.05), "Enugu": (6.44, 7.50), "Kaduna": (10.52, 7.44),
+        "Benin City": (6.34, 5.63), "Jos": (9.90, 8.86), "Maiduguri": (11.85, 13.16),
+    },
+    "Kenya": {
+        "Nairobi": (-1.29, 36.82), "Mombasa": (-4.04, 39.67), "Kisumu": (-0.09, 34.77),
+        "Nakuru": (-0.30, 36.07), "Eldoret": (0.51, 35.27), "Iten": (0.67, 35.51),
+    },
+    "Afrique du Sud": {
+        "Johannesburg": (-26.20, 28.05), "Soweto": (-26.27, 27.86), "Pretoria": (-25.75, 28.19),
+        "Le Cap": (-33.92, 18.42), "Cape Town": (-33.92, 18.42), "Durban": (-29.86, 31.02),
+        "Gqeberha": (-33.96, 25.60), "Port Elizabeth": (-33.96, 25.60), "Bloemfontein": (-29.09, 26.16),
+    },
+    "Cameroun": {
+        "Yaoundé": (3.87, 11.52), "Douala": (4.05, 9.77), "Garoua": (9.30, 13.40),
+        "Bafoussam": (5.48, 10.42), "Bamenda": (5.96, 10.15), "Maroua": (10.59, 14.32), "Kribi": (2.94, 9.91),
+    },
+    "RD Congo": {
+        "Kinshasa": (-4.44, 15.27), "Lubumbashi": (-11.66, 27.48), "Goma": (-1.68, 29.23),
+        "Bukavu": (-2.51, 28.86), "Kisangani": (0.52, 25.19), "Mbuji-Mayi": (-6.15, 23.60),
+        "Kananga": (-5.90, 22.42), "Matadi": (-5.82, 13.46),
+    },
+    "France": {
+        "Paris": (48.86, 2.35), "Marseille": (43.30, 5.37), "Lyon": (45.76, 4.84),
+        "Toulouse": (43.60, 1.44), "Bordeaux": (44.84, -0.58), "Lille": (50.63, 3.06),
+        "Nantes": (47.22, -1.55), "Montpellier": (43.61, 3.88), "Strasbourg": (48.57, 7.75),
+    },
+}
+
+_PARTS = re.compile(r"[,;/()]+|\s[-–]\s")
+
+# Folded city name -> [(country, city, lat, lon)], built once
+_CITY_INDEX = {}
+for _country, _cities in CITY_GAZETTEER.items():
+    for _city, (_lat, _lon) in _cities.items():
+        _CITY_INDEX.setdefault(fold(_city), []).append((_country, _city, _lat, _lon))
+        _CITY_INDEX.setdefault(fold(_city).replace("-", " "), []).append((_country, _city, _lat, _lon))
+
+
+def _candidates(location):
+    """Whole location, its separated parts, then the leading words of each part"""
+    yield fold(location)
+    parts = [fold(part).split() for part in _PARTS.split(location)]
+    for words in parts:
+        if words:
+            yield " ".join(words)
+    # 'Thiès centre' or 'Cape Coast ville' still name a city through their first words
+    for words in parts:
+        for size in range(min(len(words) - 1, 3), 0, -1):
+            yield " ".join(words[:size])
+
+
+@lru_cache(maxsize=65536)
+def geocode(location, country):
+    """
+    Locate a project from its free-text location and country
+
+    Returns ``(lat, lon, city, precision)`` where precision is ``"city"`` or
+    ``"country"``, or ``None`` when the country is not in the gazetteer
+    ("Autre"): cities are only looked up within the project's country, so a
+    same-named city elsewhere is never picked. Results are memoized per
+    (location, country).
+    """
+    if country not in COUNTRY_GAZETTEER:
+        return None
+    for candidate in _candidates(location or ""):
+        for match_country, city, lat, lon in _CITY_INDEX.get(candidate, ()):
+            if match_country == country:
+                return lat, lon, city, "city"
+    _, lat, lon = COUNTRY_GAZETTEER[country]
+    return lat, lon, None, "country"
+
+
+def _bin(bins, key, project, **attributes):
+    entry = bins.get(key)
+    if entry is None:
+        entry = bins[key] = dict(attributes, projects=0, budget=0, beneficiaries=0)
+    entry["projects"] += 1
+    entry["budget"] += project['budget']
+    entry["beneficiaries"] += project['beneficiaries']
+
+
+def geo_aggregates(projects):
+    """
+    Pre-binned map layers: one row per country and one per located city
+
+    A portfolio of any size collapses to at most a few hundred points, so the
+    map renders from these aggregates instead of one marker per project.
+    """
+    countries = {}
+    cities = {}
+    for p in projects:
+        country = p['country']
+        if country in COUNTRY_GAZETTEER:
+            iso3, lat, lon = COUNTRY_GAZETTEER[country]
+            _bin(countries, country, p, country=country, iso3=iso3, lat=lat, lon=lon)
+        located = geocode(p['location'], country)
+        if located and located[3] == "city":
+            lat, lon, city, _ = located
+            _bin(cities, (country, city), p, country=country, city=city, lat=lat, lon=lon)
+    return {"countries": list(countries.values()), "cities": list(cities.values())}
@@ -0,0 +1,324 @@
+"""
+Project History for RSE Sport Monitoring Platform
+Append-only log of project events (create, update, delete, clear) giving undo,
+redo, point-in-time views and audit trails; stores rebuild their state from the
+latest snapshot plus the events logged after it
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+
+# Events appended between two snapshots: bounds the replay at load time
+SNAPSHOT_INTERVAL = 100
+# Depth of the undo and redo stacks
+MAX_UNDO = 50
+
+EVENT_LABELS = {
+    "create": "Création",
+    "update": "Modification",
+    "delete": "Suppression",
+    "clear": "Effacement du portefeuille",
+    "undo": "Annulation",
+    "redo": "Rétablissement",
+}
+
+EVENTS_FILE = "events.jsonl"
+ARCHIVE_DIR = "history"
+
+
+# ============================================================================
+# CHANGES
+# ============================================================================
+#
+# An event carries a list of changes ``[position, before, after]``: a creation
+# has no ``before``, a deletion no ``after``. Positions are the ones the
+# projects occupy in the list when present, so reverting a deletion puts the
+# project back where it was.
+
+def change(position, before, after):
+    return [position, before, after]
+
+
+def logged(project):
+    """Dictionary logged for a project (Project records are expanded)"""
+    return project.to_dict() if hasattr(project, "to_dict") else dict(project)
+
+
+def assign_ids(projects):
+    """Give an id to projects created without one, so events can refer to them"""
+    for project in projects:
+        if project.get("id") is None:
+            if isinstance(project, dict):
+                project["id"] = uuid.uuid4().hex
+            else:
+                project.id = uuid.uuid4().hex
+
+
+def apply(projects, changes, build=dict):
+    """
+    Apply changes to a project list in place; ``build`` turns a logged
+    project dictionary into the list's project type
+    """
+    positions = {p["id"]: i for i, p in enumerate(projects)}
+    deleted = {before["id"] for _, before, after in changes if after is None}
+    if deleted:
+        projects[:] = [p for p in projects if p["id"] not in deleted]
+        positions = {p["id"]: i for i, p in enumerate(projects)}
+    for position, before, after in changes:
+        if after is None:
+            continue
+        if before is None:
+            projects.insert(min(position, len(projects)), build(after))
+            positions = {p["id"]: i for i, p in enumerate(projects)}
+        else:
+            projects[positions[after["id"]]] = build(after)
+    return projects
+
+
+def inverse(changes):
+    """Changes undoing ``changes`` (same order, so positions are restored ascending)"""
+    return [change(position, after, before) for position, before, after in changes]
+
+
+def touched_ids(event):
+    return {(before or after)["id"] for _, before, after in event["changes"]}
+
+
+def describe(event):
+    """One-line French description of an event for audit trails"""
+    names = [(after or before).get("name", "") for _, before, after in event["changes"]]
+    label = EVENT_LABELS.get(event["type"], event["type"])
+    if event["type"] in ("undo", "redo"):
+        label += f" de la version {event['target']}"
+    if len(names) == 1:
+        return f"{label} : {names[0]}"
+    return f"{label} ({len(names)} projets)"
+
+
+# ============================================================================
+# EVENT LOG
+# ============================================================================
+
+class EventLog:
+    """
+    Versioned, append-only event log
+
+    Every event gets the next version number. Undo and redo never remove an
+    event: they append the compensating changes, so the log stays a complete
+    audit trail. With a ``directory``, events are appended to a JSON-lines
+    file; when a snapshot is taken the file is rotated into ``history/`` and
+    only events logged after the latest snapshot are replayed at load time.
+    Without one, events are kept in memory.
+
+    The undo and redo stacks hold event versions only: snapshots store
+    these numbers, and the events themselves are read back from the live
+    file or the archive when an undo needs their changes.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.version = 0
+        self.snapshot_version = 0
+        self._recent = []
+        self._undo = []
+        self._redo = []
+        self._stacked = {}
+        self._offset = 0
+        self._inode = None
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, EVENTS_FILE) if self.directory else None
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def _append(self, kind, changes, **details):
+        event = {
+            "version": self.version + 1,
+            "type": kind,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "changes": changes,
+            **details,
+        }
+        if self.path:
+            os.makedirs(self.directory, exist_ok=True)
+            # Read back (and skipped) by the next read_new, so lines appended
+            # meanwhile by other processes are not jumped over
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self.track(event)
+        return event
+
+    def record(self, kind, changes, **details):
+        """Log a create, update, delete or clear event and return it"""
+        return self._append(kind, changes, **details)
+
+    def undo(self, prepare=None):
+        """
+        Log the event reverting the latest undoable one; None if there is none
+
+        ``prepare`` may adjust the changes to the current state (or raise to
+        refuse the undo) before anything is logged.
+        """
+        target = self.next_undo()
+        if target is None:
+            return None
+        changes = inverse(target["changes"])
+        return self._append("undo", prepare(changes) if prepare else changes, target=target["version"])
+
+    def redo(self, prepare=None):
+        """Log the event replaying the latest undone one; None if there is none"""
+        target = self.next_redo()
+        if target is None:
+            return None
+        changes = target["changes"]
+        return self._append("redo", prepare(changes) if prepare else changes, target=target["version"])
+
+    def track(self, event):
+        """Account for an event logged here or read back from disk"""
+        self.version = event["version"]
+        self._recent.append(event)
+        # Stacks cut at MAX_UNDO or restored from an older snapshot may no
+        # longer hold the target: only pop it when it is on top
+        if event["type"] == "undo":
+            if self._undo and self._undo[-1] == event["target"]:
+                self._undo.pop()
+            self._redo = self._redo[-(MAX_UNDO - 1):] + [event["target"]]
+        elif event["type"] == "redo":
+            if self._redo and self._redo[-1] == event["target"]:
+                self._redo.pop()
+            self._undo = self._undo[-(MAX_UNDO - 1):] + [event["target"]]
+        else:
+            self._undo = self._undo[-(MAX_UNDO - 1):] + [event["version"]]
+            self._redo = []
+            self._stacked[event["version"]] = event
+        if len(self._stacked) > 2 * MAX_UNDO:
+            kept = set(self._undo) | set(self._redo)
+            self._stacked = {version: e for version, e in self._stacked.items() if version in kept}
+
+    def _stacked_event(self, version):
+        """Event of a version on the undo or redo stack, read back from the log when needed"""
+        event = self._stacked.get(version)
+        if event is None:
+            event = next((e for e in self._iter(version - 1) if e["version"] == version), None)
+            if event is not None:
+                self._stacked[version] = event
+        return event
+
+    def next_undo(self):
+        return self._stacked_event(self._undo[-1]) if self._undo else None
+
+    def next_redo(self):
+        return self._stacked_event(self._redo[-1]) if self._redo else None
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def snapshot_due(self):
+        return self.version - self.snapshot_version >= SNAPSHOT_INTERVAL
+
+    def state(self):
+        """Undo/redo stacks (event versions) to store with a snapshot"""
+        return {"undo": list(self._undo), "redo": list(self._redo)}
+
+    def rotate(self):
+        """Archive the events covered by the snapshot just written at the current version"""
+        if self.path and os.path.exists(self.path):
+            first = self._recent[0]["version"] if self._recent else self.version
+            archive = os.path.join(self.directory, ARCHIVE_DIR)
+            os.makedirs(archive, exist_ok=True)
+            os.replace(self.path, os.path.join(archive, f"events-{first:08d}-{self.version:08d}.jsonl"))
+        self.snapshot_version = self.version
+        self._offset, self._inode = 0, None
+        if self.path:
+            self._recent = []
+
+    def restore(self, version, state=None):
+        """Start from a snapshot taken at ``version``"""
+        self.version = self.snapshot_version = version
+        self._recent = []
+        # Snapshots written before the stacks held versions embed the events
+        self._stacked = {}
+        stacks = {}
+        for name in ("undo", "redo"):
+            stacks[name] = []
+            for entry in (state or {}).get(name, []):
+                if isinstance(entry, dict):
+                    self._stacked[entry["version"]] = entry
+                    entry = entry["version"]
+                stacks[name].append(entry)
+        self._undo, self._redo = stacks["undo"], stacks["redo"]
+        self._offset, self._inode = 0, None
+
+    def read_new(self):
+        """Events appended to the live file since the last read (by any process)"""
+        if not self.path or not os.path.exists(self.path):
+            return []
+        stat = os.stat(self.path)
+        if stat.st_ino == self._inode and stat.st_size == self._offset:
+            return []
+        events = []
+        try:
+            f = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return []
+        with f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                # Rotated by another process since the last read: the offset
+                # was into the file that is now archived
+                self._inode, self._offset = stat.st_ino, 0
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    # Partially written by another process: read it next time
+                    break
+                self._offset += len(line.encode("utf-8"))
+                event = json.loads(line)
+                # Events already covered by the snapshot (rotation interrupted)
+                if event["version"] > self.version:
+                    events.append(event)
+        return events
+
+    # ------------------------------------------------------------------
+    # History
+    # ------------------------------------------------------------------
+
+    def _archived(self, since):
+        archive = os.path.join(self.directory, ARCHIVE_DIR) if self.directory else None
+        if not archive or not os.path.isdir(archive):
+            return
+        for name in sorted(os.listdir(archive)):
+            last = int(name.rsplit("-", 1)[1].split(".")[0])
+            if last <= since:
+                continue
+            with open(os.path.join(archive, name), encoding="utf-8") as f:
+                for line in f:
+                    event = json.loads(line)
+                    if since < event["version"] <= self.snapshot_version:
+                        yield event
+
+    def events(self, since=0, project_id=None):
+        """Events logged after version ``since``, oldest first, optionally for one project"""
+        for event in self._iter(since):
+            if project_id is None or project_id in touched_ids(event):
+                yield event
+
+    def _iter(self, since):
+        if self.path:
+            yield from self._archived(since)
+        for event in self._recent:
+            if event["version"] > since:
+                yield event
+
+    def rewind(self, projects, version, build=dict):
+        """State at ``version`` from the current ``projects``, reverting the later events"""
+        projects = list(projects)
+        for event in reversed(list(self._iter(version))):
+            apply(projects, inverse(event["changes"]), build)
+        return projects
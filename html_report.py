@@ -0,0 +1,416 @@
+"""
+HTML Report Generator for RSE Sport Monitoring
+AFD-style reports as self-contained HTML pages (inlined CSS and SVG charts),
+for a single project, a whole portfolio or a static site of both
+"""
+
+import os
+import re
+import zipfile
+from datetime import datetime
+from io import BytesIO
+
+from jinja2 import DictLoader, Environment
+
+from analytics import compute_kpis, country_distribution, impact_averages, sdg_distribution, sport_distribution
+from catalogs import SDG_OPTIONS, fold
+from charts import chart_svg, country_chart, impact_chart, sdg_chart
+from diagnostics import PortfolioDiagnostics
+from pdf_generator import key_data_rows, results_rows, impact_profile
+from report_templates import SECTION_TITLES, DEFAULT_RECOMMENDATIONS
+
+CSS = """
+:root {
+    --blue: #00A9E0;
+    --dark-blue: #2E3192;
+    --grey: #58595B;
+    --red: #E74C3C;
+    --green: #27AE60;
+    --warning: #F39C12;
+}
+* { box-sizing: border-box; }
+body {
+    margin: 0;
+    font-family: 'Inter', -apple-system, BlinkMacSystemFont, Helvetica, Arial, sans-serif;
+    color: #222;
+    background: #f8f9fa;
+    line-height: 1.5;
+}
+header, footer {
+    padding: 0.75rem 2rem;
+    color: var(--dark-blue);
+    font-size: 0.8rem;
+}
+header strong { display: block; font-size: 1rem; }
+footer { color: var(--grey); }
+main {
+    max-width: 860px;
+    margin: 0 auto;
+    padding: 2rem;
+    background: white;
+}
+h1 { color: var(--dark-blue); text-align: center; font-size: 2rem; }
+h2 { color: var(--dark-blue); font-size: 1.25rem; margin-top: 2rem; }
+h3 { margin: 0 0 0.75rem 0; font-style: italic; }
+table { width: 100%; border-collapse: collapse; margin: 1rem 0; font-size: 0.9rem; }
+th, td { padding: 0.5rem 0.75rem; text-align: left; vertical-align: top; border: 1px solid var(--grey); }
+th { background: var(--dark-blue); color: white; }
+td.num { text-align: right; }
+.key-data td { background: var(--blue); color: white; border-color: white; }
+.key-data td:first-child { font-weight: 700; width: 33%; }
+.results td { background: #F5F5DC; }
+.box { padding: 1rem 1.25rem; margin: 1.5rem 0; }
+.focus { background: #FFF5F5; border: 2px solid var(--red); }
+.case-study { background: #F5F5F5; border: 1px solid var(--grey); }
+.recommendations { background: #E8F4F8; border: 2px solid var(--blue); }
+.comparison th.positives { background: var(--green); }
+.comparison th.concerns { background: var(--warning); }
+.comparison ul { margin: 0; padding-left: 1.1rem; }
+.chart svg { max-width: 100%; height: auto; }
+.muted { color: var(--grey); }
+a { color: var(--dark-blue); }
+@media print { body { background: white; } main { padding: 0; } }
+"""
+
+_CSS_COMMENTS = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_SPACES = re.compile(r"\s*([{}:;,>])\s*")
+_BETWEEN_TAGS = re.compile(r">\s+<")
+
+
+def minify_css(css):
+    """Strip comments and the whitespace CSS does not need"""
+    css = _CSS_COMMENTS.sub("", css)
+    css = _CSS_SPACES.sub(r"\1", " ".join(css.split()))
+    return css.replace(";}", "}")
+
+
+STYLE = minify_css(CSS)
+
+# ============================================================================
+# TEMPLATES
+# Mirror the sections of AFDReportGenerator (pdf_generator.py)
+# ============================================================================
+
+TEMPLATES = {
+    "base.html": """
+<!DOCTYPE html>
+<html lang="fr">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <title>{{ title }}</title>
+    <style>{{ style|safe }}</style>
+</head>
+<body>
+    <header><strong>Durabilis &amp; Co</strong>Data Monitoring - Projet RSE &amp; Sport</header>
+    <main>{% block content %}{% endblock %}</main>
+    <footer>© {{ year }} Durabilis &amp; Co - Tous droits réservés</footer>
+</body>
+</html>
+""",
+    "recommendations.html": """
+<div class="box recommendations">
+    <h3>{{ titles.recommendations }}</h3>
+    {% if recommendations %}
+    <ol>
+        {% for rec in recommendations[:5] %}
+        <li><b>{{ rec.get('title', '') }}</b>: {{ rec.get('description', '') }}</li>
+        {% endfor %}
+    </ol>
+    {% else %}
+    <ul>
+        {% for rec in default_recommendations %}
+        <li>{{ rec }}</li>
+        {% endfor %}
+    </ul>
+    {% endif %}
+</div>
+""",
+    "project.html": """
+{% extends "base.html" %}
+{% block content %}
+{% if index_url %}<p><a href="{{ index_url }}">← Retour au portefeuille</a></p>{% endif %}
+<h1>{{ project.get('name', 'Projet RSE & Sport') }}</h1>
+<table class="key-data">
+    {% for label, value in key_data %}
+    <tr><td>{{ label }}</td><td>{{ value }}</td></tr>
+    {% endfor %}
+</table>
+
+<h2>{{ titles.context }}</h2>
+<p>{{ project.get('description', '') or "Description du contexte du projet RSE & Sport." }}</p>
+
+<h2>{{ titles.objectives }}</h2>
+<p>
+    Le projet vise à contribuer aux objectifs de développement durable à travers le sport.
+    Bénéficiaires estimés : <b>{{ project.get('beneficiaries', 0)|number }}</b> personnes.
+    Budget alloué : <b>{{ project.get('budget', 0)|money }}</b>
+</p>
+
+<h2>{{ titles.results }}</h2>
+<table class="results">
+    <tr><th>📊 INDICATEUR</th><th>VALEUR</th></tr>
+    {% for label, value in results %}
+    <tr><td>{{ label }}</td><td>{{ value }}</td></tr>
+    {% endfor %}
+</table>
+
+<div class="box focus">
+    <h3>{{ titles.focus }}</h3>
+    ✓ <b>{{ project.get('beneficiaries', 0)|number }}</b> bénéficiaires directs<br>
+    ✓ <b>{{ project.get('sports', [])|length }}</b> disciplines sportives<br>
+    ✓ <b>{{ project.get('sdgs', [])|length }}</b> ODD adressés<br>
+    ✓ Budget : <b>{{ project.get('budget', 0)|money }}</b>
+</div>
+
+<h2>{{ titles.conclusions }}</h2>
+<div class="chart">{{ impact_svg|safe }}</div>
+<table class="comparison">
+    <tr><th class="positives">{{ titles.positives }}</th><th class="concerns">{{ titles.concerns }}</th></tr>
+    <tr>
+        <td><ul>{% for point in diagnostic.positives %}<li>{{ point }}</li>{% endfor %}</ul></td>
+        <td><ul>{% for point in diagnostic.concerns %}<li>{{ point }}</li>{% endfor %}</ul></td>
+    </tr>
+</table>
+
+<div class="box case-study">
+    <h3>{{ titles.case_study }}</h3>
+    <p><b>Projet pilote : {{ project.get('name', 'N/A') }}</b></p>
+    <p>{{ diagnostic.case_study }}</p>
+</div>
+
+{% include "recommendations.html" %}
+{% endblock %}
+""",
+    "portfolio.html": """
+{% extends "base.html" %}
+{% block content %}
+<h1>{{ title }}</h1>
+<p class="muted">Édition du {{ edition }}</p>
+
+<h2>1. SYNTHÈSE DU PORTEFEUILLE</h2>
+<table class="key-data">
+    <tr><td>PROJETS</td><td>{{ kpis.total_projects|number }}</td></tr>
+    <tr><td>BUDGET TOTAL</td><td>{{ kpis.total_budget|money }}</td></tr>
+    <tr><td>BÉNÉFICIAIRES</td><td>{{ kpis.total_beneficiaries|number }}</td></tr>
+    <tr><td>PAYS COUVERTS</td><td>{{ kpis.unique_countries }}</td></tr>
+    {% for axis, value in impact.items() %}
+    <tr><td>IMPACT {{ axis|upper }} MOYEN</td><td>{{ "%.1f"|format(value) }} / 5</td></tr>
+    {% endfor %}
+</table>
+<div class="chart">{{ impact_svg|safe }}</div>
+{% if recommendations %}{% include "recommendations.html" %}{% endif %}
+
+<h2>2. COUVERTURE DES ODD</h2>
+<p>Le portefeuille adresse <b>{{ sdg_covered }}</b> ODD sur {{ sdg_rows|length }}.</p>
+<div class="chart">{{ sdg_svg|safe }}</div>
+<table>
+    <tr><th>ODD</th><th>PROJETS</th><th>PART</th></tr>
+    {% for label, count, share in sdg_rows %}
+    <tr><td>{{ label }}</td><td class="num">{{ count|number }}</td><td class="num">{{ share }} %</td></tr>
+    {% endfor %}
+</table>
+
+<h2>3. SECTIONS PAR PAYS</h2>
+{% if countries %}
+<div class="chart">{{ country_svg|safe }}</div>
+{% for section in countries %}
+<h3>{{ section.country }}</h3>
+<table>
+    <tr><td>Projets</td><td>{{ section.kpis.total_projects|number }}</td></tr>
+    <tr><td>Budget</td><td>{{ section.kpis.total_budget|money }}</td></tr>
+    <tr><td>Bénéficiaires</td><td>{{ section.kpis.total_beneficiaries|number }}</td></tr>
+    <tr><td>Sports principaux</td><td>{{ section.sports|join(', ') or 'N/A' }}</td></tr>
+</table>
+{% endfor %}
+
+<h2>4. ANNEXE - FICHES PROJETS</h2>
+<table>
+    <tr><th>Projet</th><th>Organisation</th><th>Pays</th><th>Budget</th><th>Bénéficiaires</th></tr>
+    {% for project, url in annex %}
+    <tr>
+        <td>{% if url %}<a href="{{ url }}">{{ project['name'] }}</a>{% else %}{{ project['name'] }}{% endif %}</td>
+        <td>{{ project['organization'] }}</td>
+        <td>{{ project['country'] or 'N/A' }}</td>
+        <td class="num">{{ project['budget']|money }}</td>
+        <td class="num">{{ project['beneficiaries']|number }}</td>
+    </tr>
+    {% endfor %}
+</table>
+{% else %}
+<p>Aucun projet enregistré dans le portefeuille.</p>
+{% endif %}
+{% endblock %}
+""",
+}
+
+
+def _number(value):
+    return f"{value:,}"
+
+
+def _money(value):
+    return f"{value:,.0f} €"
+
+
+def _compile_templates():
+    """Whitespace between tags is stripped from the sources, then every template is compiled once"""
+    sources = {name: _BETWEEN_TAGS.sub("><", source.strip()) for name, source in TEMPLATES.items()}
+    env = Environment(loader=DictLoader(sources), autoescape=True, trim_blocks=True, lstrip_blocks=True)
+    env.filters["number"] = _number
+    env.filters["money"] = _money
+    env.globals.update(
+        style=STYLE,
+        titles=SECTION_TITLES,
+        default_recommendations=DEFAULT_RECOMMENDATIONS,
+    )
+    return env
+
+
+_ENV = _compile_templates()
+PROJECT_TEMPLATE = _ENV.get_template("project.html")
+PORTFOLIO_TEMPLATE = _ENV.get_template("portfolio.html")
+
+
+# ============================================================================
+# RENDERING
+# ============================================================================
+
+def generate_html_report(project, all_projects=None, recommendations=None, index_url=None, diagnostics=None):
+    """
+    Generate the AFD-style HTML report of a project
+
+    Args:
+        project: Project data dictionary
+        all_projects: List of all projects (optional, adds the portfolio average to the impact chart)
+        recommendations: List of recommendations (optional)
+        index_url: Link back to the portfolio page (static site)
+        diagnostics: PortfolioDiagnostics of all_projects (optional, computed when omitted)
+
+    Returns:
+        HTML document as a string
+    """
+    all_projects = all_projects or []
+    portfolio_impact = impact_averages(all_projects) if len(all_projects) > 1 else None
+    diagnostics = diagnostics or PortfolioDiagnostics(all_projects or [project])
+    return _render_project(project, portfolio_impact, recommendations, index_url, diagnostics)
+
+
+def _render_project(project, portfolio_impact, recommendations, index_url, diagnostics):
+    profiles = [("Projet", impact_profile(project))]
+    if portfolio_impact is not None:
+        profiles.append(("Moyenne du portefeuille", portfolio_impact))
+    return PROJECT_TEMPLATE.render(
+        title=f"Rapport RSE - {project.get('name', 'Projet')}",
+        year=datetime.now().year,
+        project=project,
+        key_data=key_data_rows(project),
+        results=results_rows(project),
+        impact_svg=chart_svg(impact_chart(*profiles)),
+        diagnostic=diagnostics.row(project),
+        recommendations=recommendations or [],
+        index_url=index_url,
+    )
+
+
+def generate_portfolio_html(projects, recommendations=None, project_urls=None, title="Rapport de Portefeuille RSE & Sport"):
+    """
+    Generate the consolidated HTML report of a portfolio
+
+    ``project_urls`` optionally maps each project (by position) to the page
+    linked from the annex.
+    """
+    by_country = {}
+    for p in projects:
+        by_country.setdefault(p['country'] or 'Inconnu', []).append(p)
+    countries = []
+    for country in sorted(by_country, key=lambda c: (-len(by_country[c]), c)):
+        sports = sorted(sport_distribution(by_country[country]).items(), key=lambda item: -item[1])[:5]
+        countries.append({
+            "country": country,
+            "kpis": compute_kpis(by_country[country]),
+            "sports": [sport for sport, _ in sports],
+        })
+
+    counts = sdg_distribution(projects)
+    total = len(projects) or 1
+    sdg_rows = [
+        (label, counts.get(num, 0), round(100 * counts.get(num, 0) / total))
+        for num, label in enumerate(SDG_OPTIONS, 1)
+    ]
+    impact = impact_averages(projects)
+    return PORTFOLIO_TEMPLATE.render(
+        title=title,
+        year=datetime.now().year,
+        edition=datetime.now().strftime('%d/%m/%Y'),
+        kpis=compute_kpis(projects),
+        impact=impact,
+        impact_svg=chart_svg(impact_chart(("Moyenne du portefeuille", impact))),
+        recommendations=recommendations or [],
+        sdg_rows=sdg_rows,
+        sdg_covered=len(counts),
+        sdg_svg=chart_svg(sdg_chart(counts)),
+        countries=countries,
+        country_svg=chart_svg(country_chart(country_distribution(projects))) if projects else "",
+        annex=list(zip(projects, project_urls or [None] * len(projects))),
+    )
+
+
+_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+def _page_name(position, project):
+    slug = _SLUG.sub("-", fold(project.get('name', ''))).strip("-")[:60] or "projet"
+    return f"{position + 1:05d}-{slug}.html"
+
+
+def site_pages(projects, recommendations=None, project_recommendations=None):
+    """
+    Pages of a portfolio static site as ``(relative_path, html)`` pairs
+
+    Args:
+        projects: List of the portfolio's projects
+        recommendations: Portfolio recommendations shown on the index (optional)
+        project_recommendations: Callable returning the recommendations of one
+            project, e.g. ``lambda p: generate_recommendations([p])`` (optional)
+    """
+    urls = [f"projets/{_page_name(i, p)}" for i, p in enumerate(projects)]
+    # Portfolio average and diagnostics computed once for every page instead of once per project
+    portfolio_impact = impact_averages(projects) if len(projects) > 1 else None
+    diagnostics = PortfolioDiagnostics(projects)
+    for project, url in zip(projects, urls):
+        recs = project_recommendations(project) if project_recommendations else None
+        yield url, _render_project(project, portfolio_impact, recs, "../index.html", diagnostics)
+    yield "index.html", generate_portfolio_html(projects, recommendations, urls)
+
+
+def export_static_site(projects, directory, recommendations=None, project_recommendations=None):
+    """
+    Write a portfolio as a static site: ``index.html`` plus one page per project
+
+    Returns:
+        List of the written file paths
+    """
+    os.makedirs(os.path.join(directory, "projets"), exist_ok=True)
+    written = []
+    for url, html in site_pages(projects, recommendations, project_recommendations):
+        path = os.path.join(directory, url)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        written.append(path)
+    return written
+
+
+def static_site_zip(projects, recommendations=None, project_recommendations=None):
+    """
+    Portfolio static site packed in a ZIP archive
+
+    Returns:
+        BytesIO buffer containing the archive
+    """
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for url, html in site_pages(projects, recommendations, project_recommendations):
+            archive.writestr(url, html)
+    buffer.seek(0)
+    return buffer
@@ -6,6 +6,11 @@ Generates realistic sample projects for demonstration purposes
 import random
 from datetime import datetime, timedelta
 
+from models import Project
+from validation import normalize_project
+
+ALIGNMENT_THEMES = ["l'inclusion sociale", "la santé publique", "l'égalité des genres", "l'éducation"]
+
 def generate_mock_projects(num_projects=5):
     """Generate realistic mock projects for demonstration"""
     
@@ -141,7 +146,7 @@ def generate_mock_projects(num_projects=5):
             "infrastructure": f"Infrastructures municipales, {random.choice(['Stade', 'Gymnase', 'Terrain synthétique', 'Centre sportif'])}",
             "sdgs": template["sdgs"],
             "agenda_2063": template["agenda_2063"],
-            "alignment_description": f"Ce projet s'aligne avec les objectifs de développement durable en promouvant {random.choice(['l\\'inclusion sociale', 'la santé publique', 'l\\'égalité des genres', 'l\\'éducation'])} à travers le sport.",
+            "alignment_description": f"Ce projet s'aligne avec les objectifs de développement durable en promouvant {random.choice(ALIGNMENT_THEMES)} à travers le sport.",
             "indicator_participants": random.randint(50, 500),
             "indicator_sessions": random.randint(20, 200),
             "indicator_hours": random.randint(100, 2000),
@@ -153,6 +158,6 @@ def generate_mock_projects(num_projects=5):
             "additional_notes": f"Projet pilote avec potentiel d'expansion régionale. Partenariats établis avec {random.randint(2, 8)} organisations locales."
         }
         
-        mock_projects.append(project)
+        mock_projects.append(Project.from_dict(normalize_project(project)))
     
     return mock_projects
@@ -0,0 +1,481 @@
+"""
+Project Model for RSE Sport Monitoring Platform
+Compact typed project record, columnar project table and its memory-mapped
+file format
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from catalogs import SDG_OPTIONS, AGENDA_2063, IMPACT_LEVELS
+
+# Legacy dictionary layout, in the order produced by the creation form
+PROJECT_FIELDS = (
+    "timestamp", "name", "organization", "country", "location", "start_date", "end_date",
+    "description", "budget", "beneficiaries", "sports", "sport_level", "target_audience",
+    "infrastructure", "sdgs", "agenda_2063", "alignment_description",
+    "indicator_participants", "indicator_sessions", "indicator_hours",
+    "impact_social", "impact_environmental", "impact_economic",
+    "monitoring_tools", "monitoring_frequency", "additional_notes",
+)
+
+# Free-text fields are kept encoded and only decoded when read
+TEXT_FIELDS = ("description", "infrastructure", "alignment_description", "additional_notes")
+# Repeated labels and label lists are interned and shared between projects
+CATEGORICAL_FIELDS = ("organization", "country", "location", "start_date", "end_date", "monitoring_frequency")
+LIST_FIELDS = ("sports", "sport_level", "target_audience", "monitoring_tools")
+INDICATOR_FIELDS = ("beneficiaries", "indicator_participants", "indicator_sessions", "indicator_hours")
+IMPACT_FIELDS = ("impact_social", "impact_environmental", "impact_economic")
+
+DEFAULT_IMPACT = IMPACT_LEVELS.index("Moyen") + 1
+COMPRESS_THRESHOLD = 256
+# Distinct label lists kept for sharing; the oldest are forgotten beyond it
+MAX_SHARED_TUPLES = 4096
+
+_SDG_PATTERN = re.compile(r"(?:ODD|SDG)?\s*(\d{1,2})", re.IGNORECASE)
+_ASPIRATION_PATTERN = re.compile(r"(?:Aspiration)?\s*(\d)", re.IGNORECASE)
+_IMPACT_CODES = {label: i + 1 for i, label in enumerate(IMPACT_LEVELS)}
+_shared_tuples = {}
+_shared_tuples_lock = threading.Lock()
+
+# Columnar files: version of the layout and separator of list items
+TABLE_FORMAT = 1
+_LIST_SEPARATOR = "\x1f"
+
+
+# ============================================================================
+# ENCODING HELPERS
+# ============================================================================
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_list(values):
+    """Turn a label list into a tuple shared by every project using it"""
+    if isinstance(values, str):
+        values = [v.strip() for v in values.split(",") if v.strip()]
+    key = tuple(_intern(v) for v in values or ())
+    with _shared_tuples_lock:
+        shared = _shared_tuples.setdefault(key, key)
+        if len(_shared_tuples) > MAX_SHARED_TUPLES:
+            # Tuples cannot be weakly referenced: bound the table instead
+            del _shared_tuples[next(iter(_shared_tuples))]
+    return shared
+
+
+def _pack_text(text):
+    """Encode free text as bytes, compressing long texts"""
+    if not text:
+        return None
+    raw = str(text).encode("utf-8")
+    if len(raw) >= COMPRESS_THRESHOLD:
+        compressed = zlib.compress(raw)
+        if len(compressed) < len(raw):
+            return b"\x01" + compressed
+    return b"\x00" + raw
+
+
+def _unpack_text(packed):
+    if packed is None:
+        return ""
+    if packed[0] == 1:
+        return zlib.decompress(packed[1:]).decode("utf-8")
+    return packed[1:].decode("utf-8")
+
+
+def _mask(labels, pattern, upper_bound):
+    """Encode SDG / aspiration labels (or numbers) as a bit mask of ids"""
+    if isinstance(labels, str):
+        labels = labels.split(";") if ";" in labels else [labels]
+    mask = 0
+    for label in labels or ():
+        match = pattern.match(str(label).strip())
+        if match and 1 <= int(match.group(1)) <= upper_bound:
+            mask |= 1 << (int(match.group(1)) - 1)
+    return mask
+
+
+def _mask_ids(mask):
+    ids = []
+    num = 1
+    while mask:
+        if mask & 1:
+            ids.append(num)
+        mask >>= 1
+        num += 1
+    return tuple(ids)
+
+
+def _number(value, cast=int):
+    try:
+        return cast(value or 0)
+    except (TypeError, ValueError):
+        return cast(0)
+
+
+def _amount(value):
+    """Budgets stay integers unless they carry cents"""
+    amount = _number(value, float)
+    return int(amount) if amount.is_integer() else amount
+
+
+def _impact_code(label):
+    return _IMPACT_CODES.get(label, DEFAULT_IMPACT)
+
+
+# ============================================================================
+# PROJECT RECORD
+# ============================================================================
+
+class Project:
+    """
+    Compact project record
+
+    Behaves like the legacy project dictionary for readers (``p.get('budget')``,
+    ``p['name']``) so existing code keeps working, while storing SDGs and
+    Agenda 2063 aspirations as bit masks of integer ids, impacts as 1-5 codes,
+    categorical labels as interned strings and free text as encoded bytes.
+
+    Records are the row format of ProjectTable, portfolio snapshots and
+    mock data. Stores keep the logged dictionaries (with their revision) as
+    the live portfolio; its compact resident form is the store's table.
+    """
+
+    __slots__ = (
+        "id", "timestamp", "name", "organization", "country", "location", "start_date", "end_date",
+        "budget", "beneficiaries", "sports", "sport_level", "target_audience",
+        "sdg_mask", "aspiration_mask",
+        "indicator_participants", "indicator_sessions", "indicator_hours",
+        "impact_codes", "monitoring_tools", "monitoring_frequency",
+        "_description", "_infrastructure", "_alignment_description", "_additional_notes",
+    )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a project from a legacy dictionary (form, mock data, CSV, JSON)"""
+        project = cls.__new__(cls)
+        project.id = data.get("id")
+        project.timestamp = data.get("timestamp", "")
+        project.name = data.get("name", "")
+        for field in CATEGORICAL_FIELDS:
+            setattr(project, field, _intern(str(data.get(field) or "")))
+        for field in LIST_FIELDS:
+            setattr(project, field, _intern_list(data.get(field)))
+        for field in TEXT_FIELDS:
+            setattr(project, "_" + field, _pack_text(data.get(field)))
+        project.budget = _amount(data.get("budget"))
+        for field in INDICATOR_FIELDS:
+            setattr(project, field, _number(data.get(field)))
+        project.sdg_mask = _mask(data.get("sdgs"), _SDG_PATTERN, len(SDG_OPTIONS))
+        project.aspiration_mask = _mask(data.get("agenda_2063"), _ASPIRATION_PATTERN, len(AGENDA_2063))
+        project.impact_codes = bytes(_impact_code(data.get(field)) for field in IMPACT_FIELDS)
+        return project
+
+    def to_dict(self):
+        """Expand back into the legacy dictionary layout"""
+        data = {field: self[field] for field in PROJECT_FIELDS}
+        if self.id is not None:
+            data["id"] = self.id
+        return data
+
+    # ------------------------------------------------------------------
+    # Decoded views
+    # ------------------------------------------------------------------
+
+    @property
+    def sdg_ids(self):
+        return _mask_ids(self.sdg_mask)
+
+    @property
+    def aspiration_ids(self):
+        return _mask_ids(self.aspiration_mask)
+
+    @property
+    def sdgs(self):
+        return [SDG_OPTIONS[num - 1] for num in self.sdg_ids]
+
+    @property
+    def agenda_2063(self):
+        return [AGENDA_2063[num - 1] for num in self.aspiration_ids]
+
+    @property
+    def impact_social(self):
+        return IMPACT_LEVELS[self.impact_codes[0] - 1]
+
+    @property
+    def impact_environmental(self):
+        return IMPACT_LEVELS[self.impact_codes[1] - 1]
+
+    @property
+    def impact_economic(self):
+        return IMPACT_LEVELS[self.impact_codes[2] - 1]
+
+    @property
+    def description(self):
+        return _unpack_text(self._description)
+
+    @property
+    def infrastructure(self):
+        return _unpack_text(self._infrastructure)
+
+    @property
+    def alignment_description(self):
+        return _unpack_text(self._alignment_description)
+
+    @property
+    def additional_notes(self):
+        return _unpack_text(self._additional_notes)
+
+    # ------------------------------------------------------------------
+    # Legacy dictionary protocol
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key):
+        if key == "id" or key in PROJECT_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in PROJECT_FIELDS:
+            raise KeyError(key)
+        if key in TEXT_FIELDS:
+            setattr(self, "_" + key, _pack_text(value))
+        elif key == "sdgs":
+            self.sdg_mask = _mask(value, _SDG_PATTERN, len(SDG_OPTIONS))
+        elif key == "agenda_2063":
+            self.aspiration_mask = _mask(value, _ASPIRATION_PATTERN, len(AGENDA_2063))
+        elif key in IMPACT_FIELDS:
+            codes = bytearray(self.impact_codes)
+            codes[IMPACT_FIELDS.index(key)] = _impact_code(value)
+            self.impact_codes = bytes(codes)
+        elif key in LIST_FIELDS:
+            setattr(self, key, _intern_list(value))
+        elif key in CATEGORICAL_FIELDS:
+            setattr(self, key, _intern(str(value or "")))
+        elif key == "budget":
+            self.budget = _amount(value)
+        elif key in INDICATOR_FIELDS:
+            setattr(self, key, _number(value))
+        else:
+            setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in PROJECT_FIELDS or (key == "id" and self.id is not None)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def __repr__(self):
+        return f"Project(id={self.id!r}, name={self.name!r}, country={self.country!r})"
+
+
+# ============================================================================
+# COLUMNAR TABLE
+# ============================================================================
+
+class ProjectTable:
+    """
+    Column-oriented view of a portfolio
+
+    Numeric fields are NumPy arrays, repeated labels are dictionary encoded
+    (integer codes + category list) and the remaining fields are kept as
+    Python lists holding the same shared objects as the ``Project`` records,
+    so converting back and forth never re-parses text.
+    """
+
+    NUMERIC_COLUMNS = {
+        "budget": np.float64,
+        "beneficiaries": np.int64,
+        "indicator_participants": np.int64,
+        "indicator_sessions": np.int64,
+        "indicator_hours": np.int64,
+        "sdg_mask": np.int32,
+        "aspiration_mask": np.int16,
+    }
+    DICTIONARY_COLUMNS = ("organization", "country", "monitoring_frequency")
+    OBJECT_COLUMNS = (
+        "id", "timestamp", "name", "location", "start_date", "end_date",
+        "sports", "sport_level", "target_audience", "monitoring_tools",
+        "_description", "_infrastructure", "_alignment_description", "_additional_notes",
+    )
+
+    def __init__(self, columns, categories, impacts):
+        self.columns = columns
+        self.categories = categories
+        self.impacts = impacts
+
+    def __len__(self):
+        return len(self.impacts)
+
+    @classmethod
+    def from_projects(cls, projects):
+        projects = list(projects)
+        columns = {}
+        for name, dtype in cls.NUMERIC_COLUMNS.items():
+            columns[name] = np.fromiter((getattr(p, name) for p in projects), dtype=dtype, count=len(projects))
+        categories = {}
+        for name in cls.DICTIONARY_COLUMNS:
+            lookup = {}
+            columns[name] = np.fromiter(
+                (lookup.setdefault(getattr(p, name), len(lookup)) for p in projects),
+                dtype=np.int32, count=len(projects),
+            )
+            categories[name] = list(lookup)
+        for name in cls.OBJECT_COLUMNS:
+            columns[name] = [getattr(p, name) for p in projects]
+        impacts = np.frombuffer(b"".join(p.impact_codes for p in projects), dtype=np.int8)
+        impacts = impacts.reshape(len(projects), len(IMPACT_FIELDS))
+        return cls(columns, categories, impacts)
+
+    @classmethod
+    def from_dicts(cls, dicts):
+        return cls.from_projects(Project.from_dict(d) for d in dicts)
+
+    def to_projects(self):
+        """Rebuild ``Project`` records without decoding any field"""
+        projects = []
+        numeric = {name: self.columns[name].tolist() for name in self.NUMERIC_COLUMNS}
+        numeric["budget"] = [_amount(b) for b in numeric["budget"]]
+        labels = {
+            name: [self.categories[name][code] for code in self.columns[name].tolist()]
+            for name in self.DICTIONARY_COLUMNS
+        }
+        impact_rows = self.impacts.astype(np.uint8)
+        for i in range(len(self)):
+            project = Project.__new__(Project)
+            for name in self.NUMERIC_COLUMNS:
+                setattr(project, name, numeric[name][i])
+            for name in self.DICTIONARY_COLUMNS:
+                setattr(project, name, labels[name][i])
+            for name in self.OBJECT_COLUMNS:
+                setattr(project, name, self.columns[name][i])
+            project.impact_codes = impact_rows[i].tobytes()
+            projects.append(project)
+        return projects
+
+    def column(self, name):
+        """Decoded values of a column (labels for dictionary columns)"""
+        if name in self.DICTIONARY_COLUMNS:
+            categories = np.array(self.categories[name], dtype=object)
+            return categories[self.columns[name]] if len(self) else categories[:0]
+        if name in IMPACT_FIELDS:
+            return self.impacts[:, IMPACT_FIELDS.index(name)]
+        return self.columns[name]
+
+    def to_dataframe(self):
+        """Legacy layout as a DataFrame (e.g. for CSV export)"""
+        return pd.DataFrame([p.to_dict() for p in self.to_projects()], columns=list(PROJECT_FIELDS))
+
+    # ------------------------------------------------------------------
+    # Columnar files
+    # ------------------------------------------------------------------
+    #
+    # A directory of .npy files plus a manifest: numeric columns, impact
+    # codes and dictionary codes as they are in memory; object columns
+    # dictionary encoded as int32 codes (-1 for None) and their distinct
+    # values concatenated into a byte array with offsets.
+
+    def save(self, directory):
+        """Write the table as a columnar file directory (see open)"""
+        os.makedirs(directory, exist_ok=True)
+        arrays = {name: self.columns[name] for name in (*self.NUMERIC_COLUMNS, *self.DICTIONARY_COLUMNS)}
+        arrays["impacts"] = self.impacts
+        kinds = {}
+        for name in self.OBJECT_COLUMNS:
+            kinds[name], arrays[f"{name}.codes"], arrays[f"{name}.values"], arrays[f"{name}.offsets"] = (
+                _encode_objects(self.columns[name])
+            )
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "format": TABLE_FORMAT, "rows": len(self),
+                "categories": self.categories, "objects": kinds,
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def open(cls, directory):
+        """
+        Open a columnar file directory without reading it: numeric columns,
+        impacts and dictionary codes are read-only views of memory-mapped
+        files (shared with every process mapping them), object columns are
+        decoded on first access
+        """
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["format"] != TABLE_FORMAT:
+            raise ValueError(f"Format de table colonnaire non pris en charge : {manifest['format']}")
+
+        def mapped(name):
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r").view(np.ndarray)
+
+        columns = _MappedColumns({
+            name: (manifest["objects"][name], mapped(f"{name}.codes"), mapped(f"{name}.values"), mapped(f"{name}.offsets"))
+            for name in cls.OBJECT_COLUMNS
+        })
+        for name in (*cls.NUMERIC_COLUMNS, *cls.DICTIONARY_COLUMNS):
+            columns[name] = mapped(name)
+        return cls(columns, manifest["categories"], mapped("impacts"))
+
+
+def _encode_objects(values):
+    """Kind, codes, concatenated distinct values and their offsets of an object column"""
+    lookup = {}
+    codes = np.fromiter(
+        (-1 if value is None else lookup.setdefault(value, len(lookup)) for value in values),
+        dtype=np.int32, count=len(values),
+    )
+    kinds = {type(value) for value in lookup}
+    kind = "bytes" if kinds <= {bytes} and lookup else "list" if kinds <= {tuple} and lookup else "str"
+    if kind == "list":
+        encoded = [_LIST_SEPARATOR.join(value).encode("utf-8") for value in lookup]
+    elif kind == "bytes":
+        encoded = list(lookup)
+    else:
+        encoded = [str(value).encode("utf-8") for value in lookup]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    return kind, codes, np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_objects(kind, codes, blob, offsets):
+    blob = blob.tobytes()
+    bounds = offsets.tolist()
+    raw = [blob[start:end] for start, end in zip(bounds, bounds[1:])]
+    if kind == "list":
+        values = [_intern_list(value.decode("utf-8").split(_LIST_SEPARATOR) if value else ()) for value in raw]
+    elif kind == "bytes":
+        values = raw
+    else:
+        values = [_intern(value.decode("utf-8")) for value in raw]
+    # Code -1 (None) picks the last value
+    values.append(None)
+    return [values[code] for code in codes.tolist()]
+
+
+class _MappedColumns(dict):
+    """Columns of a mapped table; object columns hold their encoding until first read"""
+
+    def __init__(self, encoded):
+        super().__init__()
+        self._encoded = encoded
+
+    def __missing__(self, name):
+        if name not in self._encoded:
+            raise KeyError(name)
+        column = self[name] = _decode_objects(*self._encoded[name])
+        return column
@@ -0,0 +1,260 @@
+"""
+Budget Optimization for RSE Sport Monitoring Platform
+Reallocation of a total budget across the portfolio maximizing modeled impact,
+under per-project bounds, per-country caps and SDG funding targets
+"""
+
+import numpy as np
+
+from models import Project, ProjectTable
+from validation import ValidationError
+
+# Modeled impact of a project funded with ``x``: its beneficiaries, weighted by
+# its mean impact level (1 for "Moyen"), scaled by (x / current budget) ** ELASTICITY.
+# Below 1, each additional euro reaches fewer people than the previous one.
+ELASTICITY = 0.5
+# Default bounds: a project keeps at least MIN_SHARE of its budget and cannot
+# absorb more than MAX_GROWTH times it
+MIN_SHARE = 0.5
+MAX_GROWTH = 2.0
+
+# Bisection steps on the water level and on the factor favouring the projects
+# aligned with an SDG target (up to e ** _MAX_LOG_BOOST), sweeps over the targets
+_BISECTION_STEPS = 60
+_BOOST_STEPS = 30
+_MAX_LOG_BOOST = 12.0
+_TARGET_SWEEPS = 10
+_TARGET_TOLERANCE = 0.005
+
+
+# ============================================================================
+# IMPACT MODEL
+# ============================================================================
+
+def _table(projects):
+    if isinstance(projects, ProjectTable):
+        return projects
+    return ProjectTable.from_projects(p if isinstance(p, Project) else Project.from_dict(p) for p in projects)
+
+
+def modeled_impact(table, budgets=None):
+    """Modeled impact of every project at ``budgets`` (current budgets by default)"""
+    current = table.columns["budget"]
+    reach = table.columns["beneficiaries"] * table.impacts.mean(axis=1) / 3
+    if budgets is None:
+        return reach.astype(np.float64)
+    ratio = np.divide(budgets, current, out=np.zeros(len(current)), where=current > 0)
+    return reach * ratio ** ELASTICITY
+
+
+# ============================================================================
+# WATER FILLING
+# ============================================================================
+#
+# Maximizing sum(c_i * x_i ** a) under sum(x_i) = B and lo_i <= x_i <= hi_i
+# (a < 1) equalizes the marginal impacts: x_i = clip(k_i * t, lo_i, hi_i)
+# with k_i = c_i ** (1 / (1 - a)) for a common level t, found by bisection.
+# A country whose cap is exceeded gets its own, lower level: it is solved
+# alone with its cap as budget, then the others share what remains.
+
+def _fill(k, lo, hi, budget):
+    if budget <= lo.sum():
+        return lo.copy()
+    if budget >= hi.sum():
+        return hi.copy()
+    # At the low level no project gets more than lo + k t, so the total stays
+    # below the budget; at the high level every project reaches its maximum
+    positive = k > 0
+    low = np.log((budget - lo.sum()) / k[positive].sum())
+    high = np.log((hi[positive] / k[positive]).max())
+    for _ in range(_BISECTION_STEPS):
+        middle = (low + high) / 2
+        if np.clip(k * np.exp(middle), lo, hi).sum() > budget:
+            high = middle
+        else:
+            low = middle
+    return np.clip(k * np.exp(low), lo, hi)
+
+
+def _fill_capped(k, lo, hi, budget, groups, caps):
+    """Water filling where the total of each group ``g`` stays below ``caps[g]``"""
+    allocation = np.zeros(len(k))
+    free = np.ones(len(k), dtype=bool)
+    remaining = budget
+    while free.any():
+        allocation[free] = _fill(k[free], lo[free], hi[free], remaining)
+        totals = np.bincount(groups[free], weights=allocation[free], minlength=len(caps))
+        over = np.flatnonzero(totals > caps * (1 + 1e-9))
+        if not len(over):
+            break
+        # The most exceeded group is certainly capped: settle it and redo the rest
+        group = over[np.argmax(totals[over] / caps[over])]
+        members = free & (groups == group)
+        allocation[members] = _fill(k[members], lo[members], hi[members], caps[group])
+        remaining -= allocation[members].sum()
+        free &= ~members
+    return allocation
+
+
+# ============================================================================
+# OPTIMIZER
+# ============================================================================
+
+def _check(table, total_budget, lo, countries, country_caps, sdg_targets):
+    errors = []
+    if total_budget < 0:
+        errors.append("Le budget total doit être positif.")
+    if lo.sum() > total_budget:
+        errors.append(
+            f"Les minimums par projet ({lo.sum():,.0f} €) dépassent le budget total ({total_budget:,.0f} €)."
+        )
+    for country, cap in country_caps.items():
+        members = countries == country
+        if cap < 0:
+            errors.append(f"Plafond négatif pour {country}.")
+        elif lo[members].sum() > cap:
+            errors.append(f"Les minimums des projets de {country} ({lo[members].sum():,.0f} €) dépassent son plafond.")
+    for num, share in sdg_targets.items():
+        if not 1 <= num <= 17:
+            errors.append(f"ODD inconnu : {num}.")
+        elif not 0 <= share <= 1:
+            errors.append(f"La cible de l'ODD {num} doit être une part du budget entre 0 et 1.")
+        elif not (table.columns["sdg_mask"] & (1 << (num - 1))).any():
+            errors.append(f"Aucun projet ne cible l'ODD {num}.")
+    if errors:
+        raise ValidationError(errors)
+
+
+def optimize_budget(
+    projects, total_budget=None, min_budget=0, min_share=MIN_SHARE, max_growth=MAX_GROWTH,
+    country_caps=None, sdg_targets=None,
+):
+    """
+    Allocation of ``total_budget`` (the current total by default) maximizing
+    the modeled impact of the portfolio::
+
+        {"total": ..., "allocated": ..., "unallocated": ..., "warnings": [...],
+         "impact_before": ..., "impact_after": ...,
+         "projects": [{"id", "name", "country", "budget", "proposed", "delta",
+                       "impact_before", "impact_after"}, ...],   # largest changes first
+         "countries": {country: {"budget", "proposed", "cap"}},
+         "sdg_targets": {num: {"target", "achieved", "met"}}}
+
+    Every project gets between ``max(min_budget, min_share * budget)`` and
+    ``max_growth * budget``; ``country_caps`` maps countries to the most they
+    may receive, ``sdg_targets`` SDG numbers to the least share of the total
+    going to projects aligned with them. Projects without budget or
+    beneficiaries cannot be modeled and keep their budget. When the project
+    maximums or the country caps bind first, the rest of the total is left
+    ``unallocated`` and reported in ``warnings``. SDG targets are
+    met by favouring the aligned projects until their share is reached (a
+    heuristic: the result is feasible but not always optimal).
+
+    Raises ValidationError when the constraints cannot be satisfied.
+    """
+    table = _table(projects)
+    country_caps = {country: float(cap) for country, cap in (country_caps or {}).items()}
+    sdg_targets = {int(num): float(share) for num, share in (sdg_targets or {}).items()}
+    current = table.columns["budget"]
+    total_budget = float(current.sum() if total_budget is None else total_budget)
+    countries = table.column("country")
+    modeled = (current > 0) & (table.columns["beneficiaries"] > 0)
+
+    lo = np.where(modeled, np.maximum(min_budget, min_share * current), current)
+    hi = np.where(modeled, np.maximum(lo, max_growth * current), current)
+    _check(table, total_budget, lo, countries, country_caps, sdg_targets)
+
+    # Countries without cap form one unbounded group
+    capped = list(country_caps)
+    groups = np.full(len(table), len(capped), dtype=np.int64)
+    for i, country in enumerate(capped):
+        groups[countries == country] = i
+    caps = np.array([country_caps[c] for c in capped] + [np.inf])
+
+    weight = modeled_impact(table) / np.where(modeled, current, 1) ** ELASTICITY
+    k = np.where(modeled, weight, 0) ** (1 / (1 - ELASTICITY))
+    aligned = {
+        num: (table.columns["sdg_mask"] & (1 << (num - 1))) != 0 for num in sdg_targets
+    }
+    boosts = dict.fromkeys(sdg_targets, 1.0)
+
+    def allocate():
+        boost = np.ones(len(table))
+        for num, members in aligned.items():
+            boost[members] *= boosts[num]
+        return _fill_capped(k * boost, lo, hi, total_budget, groups, caps)
+
+    def short(allocation, num, tolerance=0.0):
+        return allocation[aligned[num]].sum() < sdg_targets[num] * total_budget * (1 - tolerance)
+
+    # Favour the projects aligned with each SDG short of its target by the
+    # smallest factor reaching it (bisection on the factor); favouring one SDG
+    # can take budget from another, hence a few sweeps
+    allocation = allocate()
+    for _ in range(_TARGET_SWEEPS):
+        missed = [num for num in sdg_targets if short(allocation, num, _TARGET_TOLERANCE)]
+        if not missed:
+            break
+        for num in missed:
+            low, high = np.log(boosts[num]), np.log(boosts[num]) + _MAX_LOG_BOOST
+            for _ in range(_BOOST_STEPS):
+                boosts[num] = np.exp((low + high) / 2)
+                if short(allocate(), num):
+                    low = np.log(boosts[num])
+                else:
+                    high = np.log(boosts[num])
+            boosts[num] = np.exp(high)
+            allocation = allocate()
+
+    before = modeled_impact(table)
+    after = modeled_impact(table, allocation)
+    order = np.argsort(-np.abs(allocation - current), kind="stable")
+    ids, names = table.columns["id"], table.columns["name"]
+    codes, labels = table.columns["country"], table.categories["country"]
+    budget_by_country = np.bincount(codes, weights=current, minlength=len(labels))
+    proposed_by_country = np.bincount(codes, weights=allocation, minlength=len(labels))
+    reached = {num: float(allocation[members].sum()) for num, members in aligned.items()}
+    unallocated = round(max(total_budget - float(allocation.sum()), 0.0), 2)
+    warnings = []
+    if unallocated >= 1:
+        warnings.append(
+            f"{unallocated:,.0f} € ne peuvent pas être répartis sans dépasser le budget maximal "
+            f"des projets ({max_growth:g} fois leur budget actuel) ou les plafonds par pays."
+        )
+    return {
+        "total": total_budget,
+        "allocated": float(allocation.sum()),
+        "unallocated": unallocated,
+        "warnings": warnings,
+        "impact_before": float(before.sum()),
+        "impact_after": float(after.sum()),
+        "projects": [
+            {
+                "id": ids[i],
+                "name": names[i],
+                "country": countries[i],
+                "budget": float(current[i]),
+                "proposed": float(allocation[i]),
+                "delta": float(allocation[i] - current[i]),
+                "impact_before": float(before[i]),
+                "impact_after": float(after[i]),
+            }
+            for i in order.tolist()
+        ],
+        "countries": {
+            country: {
+                "budget": float(budget_by_country[i]),
+                "proposed": float(proposed_by_country[i]),
+                "cap": country_caps.get(country),
+            }
+            for i, country in enumerate(labels)
+        },
+        "sdg_targets": {
+            num: {
+                "target": share,
+                "achieved": reached[num] / total_budget if total_budget else 0.0,
+                "met": reached[num] >= share * total_budget * (1 - _TARGET_TOLERANCE),
+            }
+            for num, share in sdg_targets.items()
+        },
+    }
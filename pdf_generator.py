@@ -1,6 +1,6 @@
 """
 Professional PDF Report Generator for RSE Sport Monitoring
-AFD-style report generation with ReportLab
+Funder-style report generation with ReportLab (AFD, World Bank, EU templates)
 """
 
 from reportlab.lib import colors
@@ -13,22 +13,404 @@ from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
 from reportlab.pdfgen import canvas
 from io import BytesIO
 from datetime import datetime
+from string import Formatter
+from xml.sax.saxutils import escape
+
+from analytics import IMPACT_MAP, compute_kpis, country_distribution, impact_averages, sdg_distribution, sport_distribution
+from charts import country_chart, impact_chart, sdg_chart
+from diagnostics import DIAGNOSTIC_FIELDS, PortfolioDiagnostics
+from catalogs import SDG_OPTIONS
+from models import PROJECT_FIELDS, LIST_FIELDS, INDICATOR_FIELDS, IMPACT_FIELDS
+from report_templates import (
+    REPORT_TEMPLATES, DEFAULT_TEMPLATE, SECTION_TITLES, DEFAULT_RECOMMENDATIONS
+)
 
 # Durabilis & Co Colors
 DURABILIS_BLUE = colors.HexColor('#00A9E0')
 DURABILIS_DARK_BLUE = colors.HexColor('#2E3192')
 DURABILIS_GREY = colors.HexColor('#58595B')
+DURABILIS_LIGHT_GREY = colors.HexColor('#BCBEC0')
 AFD_RED = colors.HexColor('#E74C3C')
 AFD_GREEN = colors.HexColor('#27AE60')
 AFD_WARNING = colors.HexColor('#F39C12')
 
+# Flowables kept ahead of the layout engine when a story is streamed
+STORY_WINDOW = 64
+
+# ============================================================================
+# LAYOUT ENGINE
+# Templates declared in report_templates.py are compiled once into a
+# LayoutPlan: bindings parsed, field names checked, styles built. Rendering a
+# report then only evaluates bindings and instantiates flowables, at the same
+# cost whatever the template.
+# ============================================================================
+
+DEFAULT_HEADER = "Data Monitoring - Projet RSE & Sport"
+
+NUMBER_FIELDS = ("budget",) + INDICATOR_FIELDS
+SEQUENCE_FIELDS = LIST_FIELDS + ("sdgs", "agenda_2063")
+DERIVED_FIELDS = (
+    "sports_text", "sdgs_text", "agenda_2063_text", "target_audience_text", "monitoring_tools_text",
+    "sport_count", "sdg_count", "cost_per_beneficiary",
+)
+CONTEXT_FIELDS = frozenset(PROJECT_FIELDS + DERIVED_FIELDS + DIAGNOSTIC_FIELDS)
+
+# Vertical space added after each block type
+SPACE_AFTER = {
+    "title": 0.5*cm,
+    "key_values": 0.8*cm,
+    "paragraph": 0.5*cm,
+    "table": 0.5*cm,
+    "impact_chart": 0.5*cm,
+    "sdg_chart": 0.5*cm,
+    "comparison": 0.8*cm,
+    "diagnostics": 0.8*cm,
+    "box": 0.8*cm,
+}
+
+_FORMATTER = Formatter()
+_STYLES = getSampleStyleSheet()
+CELL_STYLE = ParagraphStyle('TableCell', parent=_STYLES['BodyText'], fontSize=9, leading=11)
+
+# Positive points / points of attention side by side
+COMPARISON_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, 0), AFD_GREEN),
+    ('BACKGROUND', (1, 0), (1, 0), AFD_WARNING),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('TOPPADDING', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 1, DURABILIS_GREY)
+])
+
+
+def report_context(project, diagnostic=None):
+    """
+    Values available to template bindings: project fields plus derived texts
+    and counts, and the project's diagnostic row when one is given
+    """
+    values = {}
+    for field in PROJECT_FIELDS:
+        if field in NUMBER_FIELDS:
+            default = 0
+        elif field in SEQUENCE_FIELDS:
+            default = []
+        elif field in IMPACT_FIELDS:
+            default = 'Moyen'
+        else:
+            default = 'N/A'
+        values[field] = project.get(field, default)
+    sports = values['sports']
+    values.update(
+        sports_text=', '.join(sports) if sports else 'N/A',
+        sdgs_text=', '.join(values['sdgs']) if values['sdgs'] else 'N/A',
+        agenda_2063_text=', '.join(values['agenda_2063']),
+        target_audience_text=', '.join(values['target_audience']) or 'tous publics',
+        monitoring_tools_text=', '.join(values['monitoring_tools']) or 'non renseignés',
+        sport_count=len(sports),
+        sdg_count=len(values['sdgs']),
+        cost_per_beneficiary=values['budget'] / values['beneficiaries'] if values['beneficiaries'] else 0,
+    )
+    if diagnostic is not None:
+        values.update((field, diagnostic[field]) for field in DIAGNOSTIC_FIELDS)
+    return values
+
+
+def compile_binding(text, markup=False):
+    """
+    Turn a ``str.format`` binding into a function of the report context
+
+    With ``markup`` the bound values are XML-escaped for Paragraph markup while
+    the template's own tags (``<b>``) are kept.
+    """
+    parts = []
+    for literal, field, spec, _ in _FORMATTER.parse(text):
+        if field is not None and field not in CONTEXT_FIELDS:
+            raise ValueError(f"Champ inconnu dans le modèle de rapport : {field!r}")
+        parts.append((literal, field, spec))
+    if all(field is None for _, field, _ in parts):
+        constant = "".join(literal for literal, _, _ in parts)
+        return lambda values: constant
+
+    def bind(values):
+        out = []
+        for literal, field, spec in parts:
+            out.append(literal)
+            if field is not None:
+                value = format(values[field], spec)
+                out.append(escape(value) if markup else value)
+        return "".join(out)
+
+    return bind
+
+
+class LayoutPlan:
+    """A report template compiled into steps evaluated against each project"""
+
+    def __init__(self, template):
+        self.name = template["name"]
+        self.label = template.get("label", self.name)
+        self.header = template.get("header", DEFAULT_HEADER)
+        palette = template.get("colors", {})
+        self.primary = colors.HexColor(palette.get("primary", '#00A9E0'))
+        self.heading = colors.HexColor(palette.get("heading", '#2E3192'))
+        self.accent = colors.HexColor(palette.get("accent", palette.get("primary", '#00A9E0')))
+
+        self.title_style = ParagraphStyle(
+            f'{self.name}Title', parent=_STYLES['Heading1'], fontSize=24,
+            textColor=self.heading, spaceAfter=20, alignment=1
+        )
+        self.heading_style = ParagraphStyle(
+            f'{self.name}Heading', parent=_STYLES['Heading2'], fontSize=16,
+            textColor=self.heading, spaceAfter=12, spaceBefore=12, keepWithNext=1
+        )
+        self.rows_bindings = {}
+        self.pages = [
+            [self._compile(block, last=position == len(page) - 1) for position, block in enumerate(page)]
+            for page in template["pages"]
+        ]
+
+    def _compile(self, block, last=False):
+        compiler = getattr(self, f"_compile_{block['block']}", None)
+        if compiler is None:
+            raise ValueError(f"Type de bloc inconnu dans le modèle {self.name!r} : {block['block']!r}")
+        step = compiler(block)
+        # No trailing space on a page: it could push the page break onto a blank sheet
+        space = 0 if last else block.get("space_after", SPACE_AFTER.get(block['block'], 0))
+        if not space:
+            return step
+        return lambda values, report: step(values, report) + [Spacer(1, space)]
+
+    # ------------------------------------------------------------------
+    # Block compilers: each returns step(values, report) -> [flowables]
+    # ------------------------------------------------------------------
+
+    def _compile_title(self, block):
+        bind = compile_binding(block["text"], markup=True)
+        return lambda values, report: [Paragraph(f"<b>{bind(values)}</b>", self.title_style)]
+
+    def _compile_heading(self, block):
+        bind = compile_binding(block["text"], markup=True)
+        return lambda values, report: [Paragraph(f"<b>{bind(values)}</b>", self.heading_style)]
+
+    def _compile_paragraph(self, block):
+        bind = compile_binding(block["text"], markup=True)
+        default = block.get("default", "")
+
+        def step(values, report):
+            text = bind(values)
+            return [Paragraph(text if text.strip() else default, _STYLES['BodyText'])]
+
+        return step
+
+    def _compile_rows(self, block, markup):
+        rows = [[compile_binding(cell, markup) for cell in row] for row in block["rows"]]
+        if "id" in block:
+            self.rows_bindings[block["id"]] = [[compile_binding(cell) for cell in row] for row in block["rows"]]
+        return rows
+
+    def _compile_key_values(self, block):
+        rows = self._compile_rows(block, markup=False)
+        if block.get("style") == "plain":
+            style = TableStyle([
+                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F2F2F2')),
+                ('TEXTCOLOR', (0, 0), (0, -1), self.heading),
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('TOPPADDING', (0, 0), (-1, -1), 6),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                ('LINEBELOW', (0, 0), (-1, -1), 0.5, DURABILIS_LIGHT_GREY)
+            ])
+        else:
+            style = TableStyle([
+                ('BACKGROUND', (0, 0), (-1, -1), self.primary),
+                ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.white)
+            ])
+
+        def step(values, report):
+            table = Table([[cell(values) for cell in row] for row in rows], colWidths=[5*cm, 10*cm])
+            table.setStyle(style)
+            return [table]
+
+        return step
+
+    def _compile_table(self, block):
+        wrap = block.get("wrap", False)
+        rows = self._compile_rows(block, markup=wrap)
+        header = list(block["header"])
+        widths = [w*cm for w in block.get("widths", (8, 7) if len(header) == 2 else [15 / len(header)] * len(header))]
+        style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), self.heading),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12 if len(header) == 2 else 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12 if len(header) == 2 else 8),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, DURABILIS_GREY)
+        ])
+
+        def step(values, report):
+            data = [header]
+            for row in rows:
+                cells = [cell(values) for cell in row]
+                data.append([Paragraph(text, CELL_STYLE) for text in cells] if wrap else cells)
+            table = Table(data, colWidths=widths, repeatRows=1)
+            table.setStyle(style)
+            return [table]
+
+        return step
+
+    def _box_style(self, name):
+        background, border, width = {
+            "alert": ('#FFF5F5', AFD_RED, 2),
+            "neutral": ('#F5F5F5', DURABILIS_GREY, 1),
+            "info": ('#E8F4F8', self.primary, 2),
+            "accent": ('#FFFBEA', self.accent, 2),
+        }[name]
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor(background)),
+            ('BOX', (0, 0), (-1, -1), width, border),
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('LEFTPADDING', (0, 0), (-1, -1), 12),
+        ])
+
+    def _compile_box(self, block):
+        title = compile_binding(block["title"], markup=True)
+        body = compile_binding("<br/>".join(block["lines"]), markup=True)
+        style = self._box_style(block.get("style", "info"))
+
+        def step(values, report):
+            table = Table([
+                [Paragraph(f"<b>{title(values)}</b>", _STYLES['Heading3'])],
+                [Paragraph(body(values), _STYLES['BodyText'])],
+            ], colWidths=[15*cm])
+            table.setStyle(style)
+            return [table]
+
+        return step
+
+    def _comparison_table(self, left_title, left_points, right_title, right_points):
+        table = Table([
+            [left_title, right_title],
+            [Paragraph('<br/>'.join(f'• {escape(point)}' for point in left_points), CELL_STYLE),
+             Paragraph('<br/>'.join(f'• {escape(point)}' for point in right_points), CELL_STYLE)],
+        ], colWidths=[7.5*cm, 7.5*cm])
+        table.setStyle(COMPARISON_STYLE)
+        return table
+
+    def _compile_comparison(self, block):
+        (left_title, left_points), (right_title, right_points) = block["left"], block["right"]
+        return lambda values, report: [self._comparison_table(left_title, left_points, right_title, right_points)]
+
+    def _compile_diagnostics(self, block):
+        left_title = block.get("left", SECTION_TITLES["positives"])
+        right_title = block.get("right", SECTION_TITLES["concerns"])
+
+        def step(values, report):
+            row = report.diagnostic()
+            return [self._comparison_table(left_title, row["positives"], right_title, row["concerns"])]
+
+        return step
+
+    def _compile_impact_chart(self, block):
+        return lambda values, report: [report._build_impact_chart()]
+
+    def _compile_sdg_chart(self, block):
+        return lambda values, report: [report._build_sdg_chart()]
+
+    def _compile_recommendations(self, block):
+        title = block.get("title", SECTION_TITLES["recommendations"])
+        default = block.get("default", DEFAULT_RECOMMENDATIONS)
+        return lambda values, report: [report._build_recommendations_box(title, default, self.primary)]
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def story(self, report):
+        """Flowables of one report, one template page after the other"""
+        values = report_context(report.project, report.diagnostic())
+        story = []
+        for number, page in enumerate(self.pages):
+            if number:
+                story.append(PageBreak())
+            for step in page:
+                story.extend(step(values, report))
+        return story
+
+    def rows(self, block_id, project, diagnostic=None):
+        """Plain-text rows of an identified table block (shared with the HTML report)"""
+        values = report_context(project, diagnostic)
+        return [[cell(values) for cell in row] for row in self.rows_bindings[block_id]]
+
+
+_LAYOUTS = {}
+
+
+def get_layout(name=DEFAULT_TEMPLATE):
+    """Compiled plan of a template, compiled on first use and reused afterwards"""
+    plan = _LAYOUTS.get(name)
+    if plan is None:
+        if name not in REPORT_TEMPLATES:
+            raise ValueError(f"Modèle de rapport inconnu : {name!r}")
+        plan = _LAYOUTS[name] = LayoutPlan(REPORT_TEMPLATES[name])
+    return plan
+
+
+def register_template(template):
+    """Add or replace a report template; its plan is compiled on first use"""
+    REPORT_TEMPLATES[template["name"]] = template
+    _LAYOUTS.pop(template["name"], None)
+
+
+def template_choices():
+    """Template name -> label, for selection widgets"""
+    return {name: template.get("label", name) for name, template in REPORT_TEMPLATES.items()}
+
+
+def key_data_rows(project):
+    """Label / value rows of the AFD key data block"""
+    return get_layout("afd").rows("key_data", project)
+
+
+def results_rows(project):
+    """Indicator / value rows of the AFD results table"""
+    return get_layout("afd").rows("results", project)
+
+
+def impact_profile(project):
+    """Impact levels of one project on the 1-5 scale used by charts"""
+    return {
+        "Social": IMPACT_MAP.get(project.get('impact_social'), 3),
+        "Environnemental": IMPACT_MAP.get(project.get('impact_environmental'), 3),
+        "Économique": IMPACT_MAP.get(project.get('impact_economic'), 3),
+    }
+
+
 class AFDReportGenerator:
-    """Generate professional AFD-style PDF reports"""
+    """Generate professional PDF reports from a compiled layout (AFD by default)"""
     
-    def __init__(self, project_data, all_projects=None, recommendations=None):
+    def __init__(self, project_data, all_projects=None, recommendations=None, template=DEFAULT_TEMPLATE,
+                 diagnostics=None):
         self.project = project_data
         self.all_projects = all_projects or []
         self.recommendations = recommendations or []
+        self.layout = get_layout(template)
+        self.diagnostics = diagnostics
         self.buffer = BytesIO()
         self.width, self.height = A4
         
@@ -43,255 +425,31 @@ class AFDReportGenerator:
             bottomMargin=2*cm
         )
         
-        # Build document elements
-        story = []
-        
-        # PAGE 1 - RECTO
-        story.extend(self._build_page_1())
-        
-        # PAGE 2 - VERSO
-        story.append(PageBreak())
-        story.extend(self._build_page_2())
-        
         # Build PDF
-        doc.build(story, onFirstPage=self._header_footer, onLaterPages=self._header_footer)
+        doc.build(self.layout.story(self), onFirstPage=self._header_footer, onLaterPages=self._header_footer)
         
         self.buffer.seek(0)
         return self.buffer
     
-    def _build_page_1(self):
-        """Build Page 1 - Context and Results"""
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=DURABILIS_DARK_BLUE,
-            spaceAfter=20,
-            alignment=1  # Center
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=DURABILIS_DARK_BLUE,
-            spaceAfter=12,
-            spaceBefore=12
-        )
-        
-        # Title
-        title = Paragraph(f"<b>{self.project.get('name', 'Projet RSE & Sport')}</b>", title_style)
-        story.append(title)
-        story.append(Spacer(1, 0.5*cm))
-        
-        # Key Data Block (colored box)
-        key_data = self._build_key_data_block()
-        story.append(key_data)
-        story.append(Spacer(1, 0.8*cm))
-        
-        # Context Section
-        story.append(Paragraph("<b>1. CONTEXTE DU PROJET</b>", heading_style))
-        context_text = self.project.get('description', '') or "Description du contexte du projet RSE & Sport."
-        story.append(Paragraph(context_text, styles['BodyText']))
-        story.append(Spacer(1, 0.5*cm))
-        
-        # Objectives
-        story.append(Paragraph("<b>2. OBJECTIFS</b>", heading_style))
-        objectives_text = f"""
-        Le projet vise à contribuer aux objectifs de développement durable à travers le sport.
-        Bénéficiaires estimés : <b>{self.project.get('beneficiaries', 0):,}</b> personnes.
-        Budget alloué : <b>{self.project.get('budget', 0):,.0f} €</b>
-        """
-        story.append(Paragraph(objectives_text, styles['BodyText']))
-        story.append(Spacer(1, 0.5*cm))
-        
-        # Results section
-        story.append(Paragraph("<b>3. PRINCIPAUX RÉSULTATS</b>", heading_style))
-        results_table = self._build_results_table()
-        story.append(results_table)
-        story.append(Spacer(1, 0.5*cm))
-        
-        # Focus section (red box)
-        focus_box = self._build_focus_box()
-        story.append(focus_box)
-        
-        return story
-    
-    def _build_page_2(self):
-        """Build Page 2 - Conclusions and Recommendations"""
-        story = []
-        styles = getSampleStyleSheet()
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=DURABILIS_DARK_BLUE,
-            spaceAfter=12,
-            spaceBefore=12
-        )
-        
-        # Conclusions
-        story.append(Paragraph("<b>4. CONCLUSIONS DE L'ÉVALUATION</b>", heading_style))
-        
-        # Comparative table: Positives vs Concerns
-        comparison_table = self._build_comparison_table()
-        story.append(comparison_table)
-        story.append(Spacer(1, 0.8*cm))
-        
-        # Case study (grey box)
-        case_study_box = self._build_case_study_box()
-        story.append(case_study_box)
-        story.append(Spacer(1, 0.8*cm))
-        
-        # Recommendations (blue box)
-        recommendations_box = self._build_recommendations_box()
-        story.append(recommendations_box)
-        
-        return story
-    
-    def _build_key_data_block(self):
-        """Build colored key data block"""
-        data = [
-            ['PÉRIMÈTRE', self.project.get('location', 'N/A')],
-            ['ZONE D\'INTERVENTION', self.project.get('country', 'N/A')],
-            ['ORGANISATION', self.project.get('organization', 'N/A')],
-            ['BUDGET', f"{self.project.get('budget', 0):,.0f} €"],
-            ['PÉRIODE', f"{self.project.get('start_date', 'N/A')} - {self.project.get('end_date', 'N/A')}"],
-            ['ÉVALUATION PAR', 'Durabilis & Co']
-        ]
-        
-        table = Table(data, colWidths=[5*cm, 10*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), DURABILIS_BLUE),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.white)
-        ]))
-        
-        return table
-    
-    def _build_results_table(self):
-        """Build results infographic table"""
-        sports = ', '.join(self.project.get('sports', [])) if self.project.get('sports') else 'N/A'
-        sdgs_count = len(self.project.get('sdgs', []))
-        participants = self.project.get('indicator_participants', 0)
-        sessions = self.project.get('indicator_sessions', 0)
-        
-        data = [
-            ['📊 INDICATEUR', 'VALEUR'],
-            ['Sports pratiqués', sports],
-            ['Nombre d\'ODD alignés', str(sdgs_count)],
-            ['Participants', f'{participants:,}'],
-            ['Sessions organisées', f'{sessions:,}'],
-            ['Impact social', self.project.get('impact_social', 'Moyen')],
-            ['Impact environnemental', self.project.get('impact_environmental', 'Moyen')]
-        ]
-        
-        table = Table(data, colWidths=[8*cm, 7*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), DURABILIS_DARK_BLUE),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, DURABILIS_GREY)
-        ]))
-        
-        return table
-    
-    def _build_focus_box(self):
-        """Build focus section with red accent"""
-        styles = getSampleStyleSheet()
-        
-        focus_data = [[
-            Paragraph("<b>FOCUS - CHIFFRES CLÉS</b>", styles['Heading3']),
-        ], [
-            Paragraph(f"""
-            ✓ <b>{self.project.get('beneficiaries', 0):,}</b> bénéficiaires directs<br/>
-            ✓ <b>{len(self.project.get('sports', []))}</b> disciplines sportives<br/>
-            ✓ <b>{len(self.project.get('sdgs', []))}</b> ODD adressés<br/>
-            ✓ Budget : <b>{self.project.get('budget', 0):,.0f} €</b>
-            """, styles['BodyText'])
-        ]]
-        
-        table = Table(focus_data, colWidths=[15*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#FFF5F5')),
-            ('BOX', (0, 0), (-1, -1), 2, AFD_RED),
-            ('TOPPADDING', (0, 0), (-1, -1), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-        ]))
-        
-        return table
-    
-    def _build_comparison_table(self):
-        """Build comparison table: positives vs concerns"""
-        data = [
-            ['✅ POINTS POSITIFS', '⚠️ POINTS DE VIGILANCE'],
-            [
-                '• Alignement fort avec les ODD\n• Engagement communautaire\n• Diversité des activités',
-                '• Suivi des indicateurs à renforcer\n• Pérennité financière\n• Coordination parties prenantes'
-            ],
-        ]
-        
-        table = Table(data, colWidths=[7.5*cm, 7.5*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, 0), AFD_GREEN),
-            ('BACKGROUND', (1, 0), (1, 0), AFD_WARNING),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, DURABILIS_GREY)
-        ]))
-        
-        return table
-    
-    def _build_case_study_box(self):
-        """Build case study section (grey box)"""
-        styles = getSampleStyleSheet()
-        
-        case_data = [[
-            Paragraph("<b>ÉTUDE DE CAS</b>", styles['Heading3']),
-        ], [
-            Paragraph(f"""
-            <b>Projet pilote : {self.project.get('name', 'N/A')}</b><br/><br/>
-            Ce projet illustre l'impact concret du sport comme vecteur de développement.
-            Les {self.project.get('beneficiaries', 0):,} bénéficiaires ont participé à 
-            {self.project.get('indicator_sessions', 0)} sessions sportives, contribuant ainsi
-            à l'amélioration de leur bien-être et à la cohésion sociale.
-            """, styles['BodyText'])
-        ]]
-        
-        table = Table(case_data, colWidths=[15*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F5F5F5')),
-            ('BOX', (0, 0), (-1, -1), 1, DURABILIS_GREY),
-            ('TOPPADDING', (0, 0), (-1, -1), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-        ]))
-        
-        return table
-    
-    def _build_recommendations_box(self):
+    def diagnostic(self):
+        """Diagnostic row of the project, from the shared portfolio diagnostics when given"""
+        if self.diagnostics is None:
+            self.diagnostics = PortfolioDiagnostics(self.all_projects or [self.project])
+        return self.diagnostics.row(self.project)
+
+    def _build_impact_chart(self):
+        """Radar of the project's impact levels, against the portfolio average when known"""
+        profile = impact_profile(self.project)
+        if len(self.all_projects) > 1:
+            return impact_chart(("Projet", profile), ("Moyenne du portefeuille", impact_averages(self.all_projects)))
+        return impact_chart(("Projet", profile))
+
+    def _build_sdg_chart(self):
+        """Projects per SDG of the project's portfolio (the project alone without one)"""
+        return sdg_chart(sdg_distribution(self.all_projects or [self.project]))
+
+    def _build_recommendations_box(self, title=SECTION_TITLES["recommendations"], default=DEFAULT_RECOMMENDATIONS,
+                                   border=DURABILIS_BLUE):
         """Build recommendations section (blue box)"""
         styles = getSampleStyleSheet()
         
@@ -301,10 +459,10 @@ class AFDReportGenerator:
             for i, rec in enumerate(self.recommendations[:5], 1):
                 recs_text += f"{i}. <b>{rec.get('title', '')}</b>: {rec.get('description', '')}<br/>"
         else:
-            recs_text = "• Renforcer le suivi et l'évaluation<br/>• Développer les partenariats<br/>• Assurer la pérennité des actions"
+            recs_text = "<br/>".join(f"• {rec}" for rec in default)
         
         rec_data = [[
-            Paragraph("<b>PRÉCONISATIONS POUR FUTURS PROGRAMMES</b>", styles['Heading3']),
+            Paragraph(f"<b>{title}</b>", styles['Heading3']),
         ], [
             Paragraph(recs_text, styles['BodyText'])
         ]]
@@ -312,7 +470,7 @@ class AFDReportGenerator:
         table = Table(rec_data, colWidths=[15*cm])
         table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#E8F4F8')),
-            ('BOX', (0, 0), (-1, -1), 2, DURABILIS_BLUE),
+            ('BOX', (0, 0), (-1, -1), 2, border),
             ('TOPPADDING', (0, 0), (-1, -1), 12),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
             ('LEFTPADDING', (0, 0), (-1, -1), 12),
@@ -329,7 +487,7 @@ class AFDReportGenerator:
         canvas.setFillColor(DURABILIS_DARK_BLUE)
         canvas.drawString(2*cm, self.height - 1.5*cm, "Durabilis & Co")
         canvas.setFont('Helvetica', 8)
-        canvas.drawString(2*cm, self.height - 1.8*cm, "Data Monitoring - Projet RSE & Sport")
+        canvas.drawString(2*cm, self.height - 1.8*cm, self.layout.header)
         
         # Footer
         canvas.setFont('Helvetica', 8)
@@ -340,7 +498,207 @@ class AFDReportGenerator:
         canvas.restoreState()
 
 
-def generate_pdf_report(project, all_projects=None, recommendations=None):
+class _StreamedStory(list):
+    """
+    Story list refilled from a generator as the layout engine consumes it
+
+    ``BaseDocTemplate.build`` pops flowables from the front of a list and
+    checks ``len()`` before each one; topping the list up at that point keeps
+    only a small window of flowables alive instead of the whole document.
+    """
+
+    def __init__(self, flowables, window=STORY_WINDOW):
+        super().__init__()
+        self._source = iter(flowables)
+        self._window = window
+
+    def __len__(self):
+        while self._source is not None and list.__len__(self) < self._window:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+        return list.__len__(self)
+
+
+class PortfolioReportGenerator(AFDReportGenerator):
+    """Consolidated report covering every project of a portfolio"""
+
+    def __init__(self, projects, recommendations=None, title="Rapport de Portefeuille RSE & Sport"):
+        super().__init__({}, projects, recommendations)
+        self.title = title
+        styles = getSampleStyleSheet()
+        self.styles = {
+            "title": ParagraphStyle('PortfolioTitle', parent=styles['Heading1'], fontSize=24,
+                                    textColor=DURABILIS_DARK_BLUE, spaceAfter=20, alignment=1),
+            "heading": ParagraphStyle('PortfolioHeading', parent=styles['Heading2'], fontSize=16,
+                                      textColor=DURABILIS_DARK_BLUE, spaceAfter=12, spaceBefore=12),
+            "subheading": ParagraphStyle('PortfolioSubheading', parent=styles['Heading3'],
+                                         textColor=DURABILIS_DARK_BLUE, keepWithNext=True),
+            "body": styles['BodyText'],
+        }
+        # Shared by every annex sheet rather than rebuilt per project
+        self._sheet_style = TableStyle([
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('TEXTCOLOR', (0, 0), (0, -1), DURABILIS_GREY),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('TOPPADDING', (0, 0), (-1, -1), 2),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+            ('LINEBELOW', (0, -1), (-1, -1), 0.5, DURABILIS_LIGHT_GREY)
+        ])
+
+    def generate(self):
+        """Lay the report out while its flowables are being produced"""
+        doc = SimpleDocTemplate(
+            self.buffer,
+            pagesize=A4,
+            rightMargin=2*cm,
+            leftMargin=2*cm,
+            topMargin=2*cm,
+            bottomMargin=2*cm,
+            pageCompression=1,
+            title=self.title
+        )
+        doc.build(_StreamedStory(self._story()), onFirstPage=self._header_footer, onLaterPages=self._header_footer)
+
+        self.buffer.seek(0)
+        return self.buffer
+
+    def _story(self):
+        by_country = {}
+        for p in self.all_projects:
+            by_country.setdefault(p['country'] or 'Inconnu', []).append(p)
+        countries = sorted(by_country, key=lambda country: (-len(by_country[country]), country))
+
+        yield from self._build_summary()
+        yield PageBreak()
+        yield from self._build_sdg_coverage()
+        yield PageBreak()
+        yield Paragraph("<b>3. SECTIONS PAR PAYS</b>", self.styles["heading"])
+        if not countries:
+            yield Paragraph("Aucun projet enregistré dans le portefeuille.", self.styles["body"])
+            return
+        yield country_chart(country_distribution(self.all_projects))
+        yield Spacer(1, 0.5*cm)
+        for country in countries:
+            yield from self._build_country_section(country, by_country[country])
+        yield PageBreak()
+        yield Paragraph("<b>4. ANNEXE - FICHES PROJETS</b>", self.styles["heading"])
+        for country in countries:
+            for project in by_country[country]:
+                yield from self._build_project_sheet(project)
+
+    def _build_summary(self):
+        """Title and portfolio KPIs"""
+        kpis = compute_kpis(self.all_projects)
+        impact = impact_averages(self.all_projects)
+        yield Paragraph(f"<b>{escape(self.title)}</b>", self.styles["title"])
+        yield Paragraph(f"Édition du {datetime.now().strftime('%d/%m/%Y')}", self.styles["body"])
+        yield Spacer(1, 0.8*cm)
+        yield Paragraph("<b>1. SYNTHÈSE DU PORTEFEUILLE</b>", self.styles["heading"])
+
+        data = [
+            ['PROJETS', f"{kpis['total_projects']:,}"],
+            ['BUDGET TOTAL', f"{kpis['total_budget']:,.0f} €"],
+            ['BÉNÉFICIAIRES', f"{kpis['total_beneficiaries']:,}"],
+            ['PAYS COUVERTS', str(kpis['unique_countries'])],
+            ['IMPACT SOCIAL MOYEN', f"{impact['Social']:.1f} / 5"],
+            ['IMPACT ENVIRONNEMENTAL MOYEN', f"{impact['Environnemental']:.1f} / 5"],
+            ['IMPACT ÉCONOMIQUE MOYEN', f"{impact['Économique']:.1f} / 5"],
+        ]
+        table = Table(data, colWidths=[8*cm, 7*cm])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), DURABILIS_BLUE),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.white)
+        ]))
+        yield table
+        yield Spacer(1, 0.5*cm)
+        yield impact_chart(("Moyenne du portefeuille", impact))
+
+        if self.recommendations:
+            yield Spacer(1, 0.8*cm)
+            yield self._build_recommendations_box()
+
+    def _build_sdg_coverage(self):
+        """Projects and share of the portfolio per SDG"""
+        counts = sdg_distribution(self.all_projects)
+        total = len(self.all_projects) or 1
+        yield Paragraph("<b>2. COUVERTURE DES ODD</b>", self.styles["heading"])
+        covered = len(counts)
+        yield Paragraph(
+            f"Le portefeuille adresse <b>{covered}</b> ODD sur {len(SDG_OPTIONS)}.",
+            self.styles["body"]
+        )
+        yield sdg_chart(counts)
+        yield Spacer(1, 0.4*cm)
+
+        data = [['ODD', 'PROJETS', 'PART']]
+        for num, label in enumerate(SDG_OPTIONS, 1):
+            count = counts.get(num, 0)
+            data.append([label, f"{count:,}", f"{100 * count / total:.0f} %"])
+        table = Table(data, colWidths=[10*cm, 2.5*cm, 2.5*cm], repeatRows=1)
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), DURABILIS_DARK_BLUE),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
+            ('GRID', (0, 0), (-1, -1), 0.5, DURABILIS_GREY)
+        ]))
+        yield table
+
+    def _build_country_section(self, country, projects):
+        """Aggregates for the projects of one country"""
+        kpis = compute_kpis(projects)
+        sports = sorted(sport_distribution(projects).items(), key=lambda item: -item[1])[:5]
+        yield Paragraph(f"<b>{escape(country)}</b>", self.styles["subheading"])
+
+        data = [
+            ['Projets', f"{kpis['total_projects']:,}"],
+            ['Budget', f"{kpis['total_budget']:,.0f} €"],
+            ['Bénéficiaires', f"{kpis['total_beneficiaries']:,}"],
+            ['Sports principaux', Paragraph(escape(', '.join(sport for sport, _ in sports)) or 'N/A', self.styles["body"])],
+        ]
+        table = Table(data, colWidths=[5*cm, 10*cm])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E8F4F8')),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('GRID', (0, 0), (-1, -1), 0.5, DURABILIS_GREY)
+        ]))
+        yield table
+        yield Spacer(1, 0.4*cm)
+
+    def _build_project_sheet(self, project):
+        """Compact annex entry for one project"""
+        yield Paragraph(
+            f"<b>{escape(project['name'])}</b> - {escape(project['organization'])}",
+            self.styles["subheading"]
+        )
+        data = [
+            ['Localisation', f"{project['location'] or 'N/A'} ({project['country'] or 'N/A'})"],
+            ['Période', f"{project['start_date'] or 'N/A'} - {project['end_date'] or 'N/A'}"],
+            ['Budget', f"{project['budget']:,.0f} €"],
+            ['Bénéficiaires', f"{project['beneficiaries']:,}"],
+            ['Sports', Paragraph(escape(', '.join(project['sports'])) or 'N/A', self.styles["body"])],
+            ['ODD alignés', str(len(project['sdgs']))],
+        ]
+        table = Table(data, colWidths=[4*cm, 11*cm])
+        table.setStyle(self._sheet_style)
+        yield table
+        yield Spacer(1, 0.3*cm)
+
+
+def generate_pdf_report(project, all_projects=None, recommendations=None, template=DEFAULT_TEMPLATE,
+                        diagnostics=None):
     """
     Generate a professional PDF report for a project
     
@@ -348,9 +706,27 @@ def generate_pdf_report(project, all_projects=None, recommendations=None):
         project: Project data dictionary
         all_projects: List of all projects (optional)
         recommendations: List of recommendations (optional)
+        template: Report template name (see report_templates.REPORT_TEMPLATES)
+        diagnostics: PortfolioDiagnostics of all_projects, to share across a
+            batch of reports (optional, computed when omitted)
     
     Returns:
         BytesIO buffer containing the PDF
     """
-    generator = AFDReportGenerator(project, all_projects, recommendations)
+    generator = AFDReportGenerator(project, all_projects, recommendations, template, diagnostics)
+    return generator.generate()
+
+
+def generate_portfolio_report(projects, recommendations=None):
+    """
+    Generate the consolidated PDF report of a portfolio
+
+    Args:
+        projects: List of the portfolio's projects
+        recommendations: Portfolio recommendations (optional)
+
+    Returns:
+        BytesIO buffer containing the PDF
+    """
+    generator = PortfolioReportGenerator(projects, recommendations)
     return generator.generate()
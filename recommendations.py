@@ -3,10 +3,30 @@ Recommendations Engine for RSE Sport Monitoring Platform
 Generates actionable recommendations based on project data analysis
 """
 
-def generate_recommendations(projects):
+from benchmarking import Benchmark
+from coverage import GAP_SHARE, coverage_report
+from optimizer import optimize_budget
+from similarity import SimilarityIndex
+
+# Cosine similarity above which two projects in different countries are
+# worth connecting, and portfolio size up to which all pairs are scanned
+SYNERGY_SIMILARITY = 0.5
+SYNERGY_SCAN_LIMIT = 5000
+
+# Gain in modeled impact from reallocating the same total budget above which
+# a reallocation is recommended, and number of moves listed
+REALLOCATION_GAIN = 0.05
+REALLOCATION_MOVES = 3
+
+
+def generate_recommendations(projects, benchmark=None, similarity=None, coverage=None):
     """
     Analyze projects and generate actionable recommendations
     Returns a list of recommendation dictionaries
+
+    ``benchmark`` and ``similarity`` are the portfolio's Benchmark and
+    SimilarityIndex when the caller keeps them up to date, ``coverage`` its
+    SDG coverage_report; they are built on the fly otherwise.
     """
     
     if not projects:
@@ -15,50 +35,57 @@ def generate_recommendations(projects):
     recommendations = []
     
     # Analyze budget distribution
-    total_budget = sum(p.get('budget', 0) for p in projects)
+    total_budget = sum(p['budget'] for p in projects)
     avg_budget = total_budget / len(projects) if projects else 0
     
     # Analyze beneficiaries
-    total_beneficiaries = sum(p.get('beneficiaries', 0) for p in projects)
+    total_beneficiaries = sum(p['beneficiaries'] for p in projects)
     avg_beneficiaries = total_beneficiaries / len(projects) if projects else 0
     
     # Analyze SDG coverage
-    all_sdgs = set()
-    for p in projects:
-        all_sdgs.update(p.get('sdgs', []))
+    if coverage is None:
+        coverage = coverage_report(projects)
+    covered_sdgs = len(coverage["labels"]) - len(coverage["uncovered"])
     
     # Analyze sports diversity
     all_sports = set()
     for p in projects:
-        all_sports.update(p.get('sports', []))
+        all_sports.update(p['sports'])
     
     # Analyze countries
-    countries = set(p.get('country', '') for p in projects)
+    countries = set(p['country'] for p in projects)
     
     # RECOMMENDATION 1: Budget optimization
-    if avg_budget > 0:
-        low_budget_projects = [p for p in projects if p.get('budget', 0) < avg_budget * 0.5]
-        if len(low_budget_projects) > len(projects) * 0.3:
+    if avg_budget > 0 and len(projects) > 1:
+        plan = optimize_budget(projects)
+        gain = plan["impact_after"] / plan["impact_before"] - 1 if plan["impact_before"] else 0
+        if gain >= REALLOCATION_GAIN:
+            moves = [p for p in plan["projects"] if abs(p["delta"]) >= 1]
+            increases = [p for p in moves if p["delta"] > 0][:REALLOCATION_MOVES]
+            decreases = [p for p in moves if p["delta"] < 0][:REALLOCATION_MOVES]
+            moved = sum(p["delta"] for p in moves if p["delta"] > 0)
             recommendations.append({
                 "category": "Budget & Ressources",
                 "priority": "Haute",
                 "title": "Optimiser l'allocation budgétaire",
-                "description": f"{len(low_budget_projects)} projets disposent d'un budget inférieur à 50% de la moyenne. Considérer une redistribution des ressources ou recherche de financements complémentaires.",
+                "description": f"Réallouer {moved:,.0f} € entre {len(moves)} projets, à budget total constant, augmenterait l'impact modélisé (bénéficiaires pondérés par le niveau d'impact) de {gain:.0%}.",
                 "impact": "Amélioration de l'efficacité et de la portée des projets sous-financés",
                 "actions": [
-                    "Identifier les sources de financement additionnelles (subventions, partenariats)",
-                    "Mutualiser les ressources entre projets similaires",
-                    "Prioriser les projets à fort impact social"
+                    f"Porter « {p['name']} » de {p['budget']:,.0f} € à {p['proposed']:,.0f} €"
+                    for p in increases
+                ] + [
+                    f"Ramener « {p['name']} » de {p['budget']:,.0f} € à {p['proposed']:,.0f} €"
+                    for p in decreases
                 ]
             })
     
     # RECOMMENDATION 2: SDG coverage
-    if len(all_sdgs) < 5:
+    if covered_sdgs < 5:
         recommendations.append({
             "category": "Alignement ODD",
             "priority": "Moyenne",
             "title": "Diversifier les objectifs de développement durable",
-            "description": f"Le portefeuille actuel ne couvre que {len(all_sdgs)} ODD sur 17. Élargir le spectre d'impact pour maximiser la contribution RSE.",
+            "description": f"Le portefeuille actuel ne couvre que {covered_sdgs} ODD sur 17. ODD non couverts : {', '.join(coverage['uncovered'])}. Élargir le spectre d'impact pour maximiser la contribution RSE.",
             "impact": "Renforcement de la stratégie RSE globale et meilleure réponse aux enjeux de développement",
             "actions": [
                 "Identifier les ODD non couverts mais pertinents pour le secteur sportif",
@@ -66,11 +93,26 @@ def generate_recommendations(projects):
                 "Intégrer de nouveaux partenaires spécialisés"
             ]
         })
+
+    # RECOMMENDATION 2b: SDGs covered but receiving a marginal share of the budget
+    if coverage["underfunded"]:
+        recommendations.append({
+            "category": "Alignement ODD",
+            "priority": "Basse",
+            "title": "Renforcer le financement des ODD marginaux",
+            "description": f"{len(coverage['underfunded'])} ODD sont ciblés mais reçoivent chacun moins de {GAP_SHARE:.0%} du budget du portefeuille : {', '.join(coverage['underfunded'])}.",
+            "impact": "Contribution plus crédible aux objectifs affichés dans le reporting RSE",
+            "actions": [
+                "Vérifier que l'alignement déclaré de ces projets est effectif",
+                "Orienter une partie des prochains financements vers ces ODD",
+                "Associer ces ODD aux projets à fort budget lorsque c'est pertinent"
+            ]
+        })
     
     # RECOMMENDATION 3: Impact measurement
     projects_with_low_indicators = [
         p for p in projects 
-        if p.get('indicator_participants', 0) == 0 or p.get('indicator_sessions', 0) == 0
+        if p['indicator_participants'] == 0 or p['indicator_sessions'] == 0
     ]
     
     if projects_with_low_indicators:
@@ -103,7 +145,7 @@ def generate_recommendations(projects):
         })
     
     # RECOMMENDATION 5: Gender equality focus
-    women_focused = sum(1 for p in projects if "Femmes" in p.get('target_audience', []))
+    women_focused = sum(1 for p in projects if "Femmes" in p['target_audience'])
     if women_focused < len(projects) * 0.3:
         recommendations.append({
             "category": "Égalité des Genres",
@@ -119,7 +161,7 @@ def generate_recommendations(projects):
         })
     
     # RECOMMENDATION 6: Disability inclusion
-    disability_projects = sum(1 for p in projects if "Personnes en situation de handicap" in p.get('target_audience', []))
+    disability_projects = sum(1 for p in projects if "Personnes en situation de handicap" in p['target_audience'])
     if disability_projects < len(projects) * 0.2:
         recommendations.append({
             "category": "Inclusion & Accessibilité",
@@ -135,7 +177,7 @@ def generate_recommendations(projects):
         })
     
     # RECOMMENDATION 7: Environmental sustainability
-    high_env_impact = sum(1 for p in projects if p.get('impact_environmental') in ['Fort', 'Très fort'])
+    high_env_impact = sum(1 for p in projects if p['impact_environmental'] in ['Fort', 'Très fort'])
     if high_env_impact < len(projects) * 0.3:
         recommendations.append({
             "category": "Environnement & Climat",
@@ -169,9 +211,9 @@ def generate_recommendations(projects):
     if len(projects) >= 2:
         countries = {}
         for p in projects:
-            c = p.get('country', 'Inconnu')
+            c = p['country'] or 'Inconnu'
             if c not in countries: countries[c] = []
-            countries[c].append(p.get('name'))
+            countries[c].append(p['name'])
         
         shared_countries = {k: v for k, v in countries.items() if len(v) >= 2}
         
@@ -190,4 +232,42 @@ def generate_recommendations(projects):
                 ]
             })
 
+        # Same sports, SDGs, audiences and scale in different countries
+        if len(projects) <= SYNERGY_SCAN_LIMIT:
+            similarity = similarity or SimilarityIndex(projects)
+            pairs = similarity.similar_pairs(SYNERGY_SIMILARITY, limit=3, other_country=True)
+            if pairs:
+                pair_names = "; ".join(f"{a['name']} ({a['country']}) / {b['name']} ({b['country']})" for a, b, _ in pairs)
+                recommendations.append({
+                    "category": "Synergies & Mutualisation",
+                    "priority": "Moyenne",
+                    "title": "Mettre en réseau les projets similaires entre pays",
+                    "description": f"Des projets proches par leurs sports, ODD, publics et budget interviennent dans des pays différents : {pair_names}.",
+                    "impact": "Transfert de méthodes éprouvées, outils et supports partagés, plaidoyer commun",
+                    "actions": [
+                        "Organiser des échanges entre les équipes des projets jumelés",
+                        "Partager les outils de suivi et les supports pédagogiques",
+                        "Étudier la réplication des approches les plus efficientes"
+                    ]
+                })
+
+    # RECOMMENDATION 10: Cost efficiency against comparable projects
+    if len(projects) >= 2:
+        benchmark = benchmark or Benchmark(projects)
+        costly = benchmark.laggards("cost_per_beneficiary", "country")
+        if costly:
+            names = ", ".join(p['name'] for p in costly[:3])
+            recommendations.append({
+                "category": "Efficience",
+                "priority": "Moyenne",
+                "title": "Réduire l'écart de coût avec les projets comparables",
+                "description": f"{len(costly)} projet(s) figurent parmi les 25% les plus coûteux par bénéficiaire de leur pays ({names}). Comparer leurs modèles opérationnels avec ceux de leurs pairs.",
+                "impact": "Plus de bénéficiaires touchés à budget constant",
+                "actions": [
+                    "Analyser les postes de coûts des projets concernés",
+                    "S'inspirer des pratiques des projets les plus efficients du même pays",
+                    "Mutualiser encadrement et équipements avec les projets voisins"
+                ]
+            })
+
     return recommendations
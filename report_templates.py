@@ -0,0 +1,186 @@
+"""
+Report Templates for RSE Sport Monitoring Platform
+Funder layouts declared as data (pages, sections, tables, boxes and bindings
+to project fields), compiled once into layout plans by pdf_generator.py
+
+Bindings use ``str.format`` syntax over the report context: every project
+field (``{budget:,.0f}``, ``{country}``) plus the derived values listed in
+``pdf_generator.report_context`` (``{sports_text}``, ``{sdg_count}``...) and
+the project's diagnostics against its portfolio (``{case_study}``,
+``{cost_percentile:.0f}``..., see diagnostics.DIAGNOSTIC_FIELDS).
+"""
+
+# ============================================================================
+# SHARED SECTION TEXTS
+# Also used by html_report.py so the PDF and HTML reports stay aligned
+# ============================================================================
+
+SECTION_TITLES = {
+    "context": "1. CONTEXTE DU PROJET",
+    "objectives": "2. OBJECTIFS",
+    "results": "3. PRINCIPAUX RÉSULTATS",
+    "focus": "FOCUS - CHIFFRES CLÉS",
+    "conclusions": "4. CONCLUSIONS DE L'ÉVALUATION",
+    "positives": "✅ POINTS POSITIFS",
+    "concerns": "⚠️ POINTS DE VIGILANCE",
+    "case_study": "ÉTUDE DE CAS",
+    "recommendations": "PRÉCONISATIONS POUR FUTURS PROGRAMMES",
+}
+
+DEFAULT_RECOMMENDATIONS = ["Renforcer le suivi et l'évaluation", "Développer les partenariats", "Assurer la pérennité des actions"]
+
+DEFAULT_CONTEXT = "Description du contexte du projet RSE & Sport."
+
+# ============================================================================
+# TEMPLATES
+# Block types: title, heading, paragraph, key_values, table, box, comparison
+# (fixed points), diagnostics (data-driven points), impact_chart, sdg_chart
+# (projects per SDG of the portfolio), recommendations. Each page starts on a
+# new sheet.
+# ============================================================================
+
+AFD_TEMPLATE = {
+    "name": "afd",
+    "label": "AFD - Agence Française de Développement",
+    "colors": {"primary": "#00A9E0", "heading": "#2E3192"},
+    "pages": [
+        [
+            {"block": "title", "text": "{name}"},
+            {"block": "key_values", "id": "key_data", "rows": [
+                ("PÉRIMÈTRE", "{location}"),
+                ("ZONE D'INTERVENTION", "{country}"),
+                ("ORGANISATION", "{organization}"),
+                ("BUDGET", "{budget:,.0f} €"),
+                ("PÉRIODE", "{start_date} - {end_date}"),
+                ("ÉVALUATION PAR", "Durabilis & Co"),
+            ]},
+            {"block": "heading", "text": SECTION_TITLES["context"]},
+            {"block": "paragraph", "text": "{description}", "default": DEFAULT_CONTEXT},
+            {"block": "heading", "text": SECTION_TITLES["objectives"]},
+            {"block": "paragraph", "text": (
+                "Le projet vise à contribuer aux objectifs de développement durable à travers le sport. "
+                "Bénéficiaires estimés : <b>{beneficiaries:,}</b> personnes. "
+                "Budget alloué : <b>{budget:,.0f} €</b>"
+            )},
+            {"block": "heading", "text": SECTION_TITLES["results"]},
+            {"block": "table", "id": "results", "header": ("📊 INDICATEUR", "VALEUR"), "rows": [
+                ("Sports pratiqués", "{sports_text}"),
+                ("Nombre d'ODD alignés", "{sdg_count}"),
+                ("Participants", "{indicator_participants:,}"),
+                ("Sessions organisées", "{indicator_sessions:,}"),
+                ("Impact social", "{impact_social}"),
+                ("Impact environnemental", "{impact_environmental}"),
+            ]},
+            {"block": "box", "style": "alert", "title": SECTION_TITLES["focus"], "lines": [
+                "✓ <b>{beneficiaries:,}</b> bénéficiaires directs",
+                "✓ <b>{sport_count}</b> disciplines sportives",
+                "✓ <b>{sdg_count}</b> ODD adressés",
+                "✓ Budget : <b>{budget:,.0f} €</b>",
+            ]},
+        ],
+        [
+            {"block": "heading", "text": SECTION_TITLES["conclusions"]},
+            {"block": "impact_chart"},
+            {"block": "sdg_chart"},
+            {"block": "diagnostics", "left": SECTION_TITLES["positives"], "right": SECTION_TITLES["concerns"]},
+            {"block": "box", "style": "neutral", "title": SECTION_TITLES["case_study"], "lines": [
+                "<b>Projet pilote : {name}</b><br/>",
+                "{case_study}",
+            ]},
+            {"block": "recommendations", "title": SECTION_TITLES["recommendations"],
+             "default": DEFAULT_RECOMMENDATIONS},
+        ],
+    ],
+}
+
+WORLD_BANK_TEMPLATE = {
+    "name": "world_bank",
+    "label": "Banque mondiale - Rapport de fin d'exécution",
+    "colors": {"primary": "#009FDA", "heading": "#002244"},
+    "header": "Rapport de fin d'exécution (ICR) - Projet RSE & Sport",
+    "pages": [
+        [
+            {"block": "title", "text": "{name}"},
+            {"block": "key_values", "style": "plain", "rows": [
+                ("Pays", "{country}"),
+                ("Localisation", "{location}"),
+                ("Agence d'exécution", "{organization}"),
+                ("Coût total du projet", "{budget:,.0f} €"),
+                ("Date d'entrée en vigueur", "{start_date}"),
+                ("Date de clôture", "{end_date}"),
+            ]},
+            {"block": "heading", "text": "1. OBJECTIF DE DÉVELOPPEMENT DU PROJET (ODP)"},
+            {"block": "paragraph", "text": "{description}", "default": DEFAULT_CONTEXT},
+            {"block": "paragraph", "text": (
+                "Contribution aux ODD : <b>{sdg_count}</b> objectif(s) ciblé(s) ({sdgs_text})."
+            )},
+            {"block": "sdg_chart"},
+            {"block": "heading", "text": "2. INDICATEURS DE RÉSULTATS"},
+            {"block": "table", "header": ("Indicateur", "Valeur atteinte", "Unité"), "rows": [
+                ("Bénéficiaires directs", "{beneficiaries:,}", "personnes"),
+                ("Participants aux activités", "{indicator_participants:,}", "personnes"),
+                ("Sessions réalisées", "{indicator_sessions:,}", "sessions"),
+                ("Volume horaire", "{indicator_hours:,}", "heures"),
+                ("Coût par bénéficiaire", "{cost_per_beneficiary:,.0f}", "€"),
+            ]},
+            {"block": "heading", "text": "3. NOTATION DES RÉSULTATS"},
+            {"block": "table", "header": ("Dimension", "Notation"), "rows": [
+                ("Impact social", "{impact_social}"),
+                ("Impact environnemental", "{impact_environmental}"),
+                ("Impact économique", "{impact_economic}"),
+            ]},
+            {"block": "impact_chart"},
+            {"block": "heading", "text": "4. SUIVI-ÉVALUATION"},
+            {"block": "paragraph", "text": (
+                "Outils de suivi : {monitoring_tools_text}. Fréquence : {monitoring_frequency}. "
+                "Indicateurs renseignés : <b>{completeness_pct} %</b>."
+            )},
+            {"block": "diagnostics", "left": "Points forts", "right": "Points faibles"},
+            {"block": "recommendations", "title": "5. LEÇONS TIRÉES ET RECOMMANDATIONS",
+             "default": DEFAULT_RECOMMENDATIONS},
+        ],
+    ],
+}
+
+EU_TEMPLATE = {
+    "name": "eu",
+    "label": "Union européenne - Cadre logique",
+    "colors": {"primary": "#003399", "heading": "#003399", "accent": "#FFCC00"},
+    "header": "Rapport narratif - Action financée par l'Union européenne",
+    "pages": [
+        [
+            {"block": "title", "text": "{name}"},
+            {"block": "key_values", "rows": [
+                ("Bénéficiaire", "{organization}"),
+                ("Pays / zone", "{country} - {location}"),
+                ("Mise en œuvre", "{start_date} - {end_date}"),
+                ("Montant de l'action", "{budget:,.0f} €"),
+            ]},
+            {"block": "heading", "text": "1. CADRE LOGIQUE"},
+            {"block": "table", "wrap": True, "header": ("Niveau", "Logique d'intervention", "Indicateurs"), "rows": [
+                ("Objectif global", "{sdgs_text}", "{sdg_count} ODD ciblé(s)"),
+                ("Objectif spécifique", "{description}", "{beneficiaries:,} bénéficiaires"),
+                ("Résultats", "Activités sportives pour {target_audience_text}",
+                 "{indicator_participants:,} participants, {indicator_sessions:,} sessions"),
+                ("Activités", "{sports_text}", "{indicator_hours:,} heures"),
+            ]},
+            {"block": "heading", "text": "2. CONTRIBUTION À L'AGENDA 2063"},
+            {"block": "paragraph", "text": "{agenda_2063_text}", "default": "Aucune aspiration renseignée."},
+            {"block": "heading", "text": "3. IMPACT"},
+            {"block": "impact_chart"},
+            {"block": "sdg_chart"},
+            {"block": "box", "style": "accent", "title": "VISIBILITÉ DE L'UNION EUROPÉENNE", "lines": [
+                "Cette action est financée par l'Union européenne. Son contenu relève de la seule "
+                "responsabilité de {organization}.",
+            ]},
+            {"block": "recommendations", "title": "4. ENSEIGNEMENTS ET PERSPECTIVES",
+             "default": DEFAULT_RECOMMENDATIONS},
+        ],
+    ],
+}
+
+REPORT_TEMPLATES = {
+    template["name"]: template
+    for template in (AFD_TEMPLATE, WORLD_BANK_TEMPLATE, EU_TEMPLATE)
+}
+DEFAULT_TEMPLATE = "afd"
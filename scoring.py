@@ -0,0 +1,166 @@
+"""
+Impact Scoring for RSE Sport Monitoring Platform
+Composite impact score of every project: qualitative impact levels and
+quantitative indicators normalized into a feature matrix, weighted per funder
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from models import IMPACT_FIELDS, Project, ProjectTable
+from validation import ValidationError
+
+# Feature -> label. Impact levels are mapped linearly to 0-1, indicators to
+# their percentile rank in the portfolio (0 when missing)
+FEATURES = {
+    "social": "Impact social",
+    "environmental": "Impact environnemental",
+    "economic": "Impact économique",
+    "reach": "Bénéficiaires",
+    "participation": "Participants",
+    "activity": "Sessions",
+    "intensity": "Heures par participant",
+    "cost_efficiency": "Bénéficiaires par euro",
+}
+
+# Funder weighting profiles (keys follow report_templates where they exist)
+WEIGHT_PROFILES = {
+    "equal": ("Pondération égale", dict.fromkeys(FEATURES, 1)),
+    "afd": ("AFD - Agence Française de Développement", {
+        "social": 3, "environmental": 2, "economic": 2, "reach": 2,
+        "participation": 1, "activity": 1, "intensity": 1, "cost_efficiency": 2,
+    }),
+    "world_bank": ("Banque mondiale", {
+        "social": 2, "environmental": 1, "economic": 3, "reach": 2,
+        "participation": 1, "activity": 1, "intensity": 1, "cost_efficiency": 3,
+    }),
+    "eu": ("Union européenne", {
+        "social": 3, "environmental": 3, "economic": 1, "reach": 1,
+        "participation": 2, "activity": 1, "intensity": 2, "cost_efficiency": 1,
+    }),
+}
+DEFAULT_PROFILE = "equal"
+
+# Score vectors kept per model (one per weighting recently asked for)
+SCORE_CACHE = 16
+
+
+def weight_vector(weights):
+    """Weights as a vector over FEATURES; a profile name or a feature -> weight mapping"""
+    if isinstance(weights, str):
+        if weights not in WEIGHT_PROFILES:
+            raise ValidationError([f"Profil de pondération inconnu : {weights}"])
+        weights = WEIGHT_PROFILES[weights][1]
+    errors = [f"Critère inconnu : {name}" for name in weights if name not in FEATURES]
+    try:
+        vector = np.array([float(weights.get(name, 0)) for name in FEATURES])
+    except (TypeError, ValueError):
+        raise ValidationError(["Les pondérations doivent être numériques."])
+    if (vector < 0).any():
+        errors.append("Les pondérations doivent être positives.")
+    elif not vector.any():
+        errors.append("Au moins un critère doit avoir un poids non nul.")
+    if errors:
+        raise ValidationError(errors)
+    return vector
+
+
+def _percentiles(values):
+    """Mid-rank percentile of each value in (0, 1), 0 for missing (zero or NaN) values"""
+    present = np.isfinite(values) & (values > 0)
+    result = np.zeros(len(values))
+    if present.any():
+        ordered = np.sort(values[present])
+        below = np.searchsorted(ordered, values[present], side="left")
+        upto = np.searchsorted(ordered, values[present], side="right")
+        result[present] = (below + upto) / (2 * len(ordered))
+    return result
+
+
+def feature_matrix(table):
+    """Projects x FEATURES matrix of normalized (0-1) features of a ProjectTable"""
+    columns = table.columns
+    impacts = (table.impacts.astype(np.float64) - 1) / 4
+    participants = columns["indicator_participants"].astype(np.float64)
+    budget = columns["budget"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        intensity = columns["indicator_hours"] / participants
+        efficiency = columns["beneficiaries"] / budget
+    return np.column_stack([
+        impacts[:, IMPACT_FIELDS.index("impact_social")],
+        impacts[:, IMPACT_FIELDS.index("impact_environmental")],
+        impacts[:, IMPACT_FIELDS.index("impact_economic")],
+        _percentiles(columns["beneficiaries"].astype(np.float64)),
+        _percentiles(participants),
+        _percentiles(columns["indicator_sessions"].astype(np.float64)),
+        _percentiles(intensity),
+        _percentiles(efficiency),
+    ])
+
+
+class ImpactModel:
+    """
+    Composite impact scores of a portfolio
+
+    The feature matrix is built once per portfolio state; scoring with new
+    weights is a single matrix-vector product, and the score vectors of the
+    last SCORE_CACHE weightings are kept until the portfolio changes.
+    Percentile features depend on the whole portfolio, so any change
+    rebuilds the matrix.
+    """
+
+    def __init__(self, projects=()):
+        self._build(projects)
+
+    def _build(self, projects):
+        projects = list(projects)
+        self._keys = {id(project) for project in projects}
+        projects = [p if isinstance(p, Project) else Project.from_dict(p) for p in projects]
+        self.ids = [project.id for project in projects]
+        self.names = [project.name for project in projects]
+        self._positions = {project_id: i for i, project_id in enumerate(self.ids)}
+        self.features = feature_matrix(ProjectTable.from_projects(projects))
+        self._scores = OrderedDict()
+
+    def sync(self, projects):
+        """Follow a project list that changed (matched by identity); returns whether it did"""
+        projects = list(projects)
+        if {id(project) for project in projects} == self._keys:
+            return 0
+        self._build(projects)
+        return 1
+
+    def __len__(self):
+        return len(self.ids)
+
+    def scores(self, weights=DEFAULT_PROFILE):
+        """Score (0-100) of every project, in portfolio order"""
+        vector = weight_vector(weights)
+        key = tuple(vector / vector.sum())
+        scores = self._scores.get(key)
+        if scores is None:
+            scores = self._scores[key] = self.features @ vector * (100 / vector.sum())
+            while len(self._scores) > SCORE_CACHE:
+                self._scores.popitem(last=False)
+        else:
+            self._scores.move_to_end(key)
+        return scores
+
+    def score(self, project_id, weights=DEFAULT_PROFILE):
+        return float(self.scores(weights)[self._positions[project_id]])
+
+    def contributions(self, project_id, weights=DEFAULT_PROFILE):
+        """Points brought by each feature to a project's score"""
+        vector = weight_vector(weights)
+        row = self.features[self._positions[project_id]] * vector * (100 / vector.sum())
+        return dict(zip(FEATURES, row.tolist()))
+
+    def ranking(self, weights=DEFAULT_PROFILE, limit=None):
+        """[{"id", "name", "score", "rank"}, ...] best first"""
+        scores = self.scores(weights)
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [
+            {"id": self.ids[i], "name": self.names[i], "score": float(scores[i]), "rank": rank}
+            for rank, i in enumerate(order.tolist(), 1)
+        ]
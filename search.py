@@ -0,0 +1,323 @@
+"""
+Full-Text Search for RSE Sport Monitoring Platform
+Inverted index over project names and free-text fields with accent folding and
+light French stemming, BM25 ranking and highlighted snippets
+"""
+
+import math
+import re
+import unicodedata
+from array import array
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import count
+
+import numpy as np
+
+from models import TEXT_FIELDS
+from similarity import MIN_WORD_LENGTH, STOPWORDS
+
+# Indexed fields and the weight of one occurrence in each (a whole number:
+# words are counted that many times)
+FIELDS = {"name": 2, "organization": 1, "location": 1, "sports": 1, **{field: 1 for field in TEXT_FIELDS}}
+FIELD_LABELS = {
+    "name": "Nom",
+    "organization": "Organisation",
+    "location": "Localisation",
+    "sports": "Sports",
+    "description": "Description",
+    "infrastructure": "Infrastructures",
+    "alignment_description": "Alignement ODD",
+    "additional_notes": "Notes",
+}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Suffixes removed by the stemmer (after plural removal), longest first, as
+# long as the remaining stem keeps at least MIN_STEM letters
+SUFFIXES = tuple(sorted(
+    ("issement", "ement", "ment", "ation", "ition", "ion", "ateur", "atrice", "euse", "eur",
+     "esse", "ite", "ive", "if", "ique", "isme", "iste", "able", "ible", "ance", "ence",
+     "ee", "er", "ez", "e"),
+    key=len, reverse=True,
+))
+MIN_STEM = 3
+
+# Removed projects are only masked; postings are compacted once they make up
+# this share of the index
+COMPACT_SHARE = 0.5
+
+# Words of context shown on each side of the first match
+SNIPPET_WORDS = 12
+
+_WORD = re.compile(r"\w+")
+# Folded bytes -> lowercase letters and digits, everything else a separator
+_SEPARATORS = bytes(c if chr(c).isalnum() else 32 for c in range(128)).lower() + b" " * 128
+
+# Fields sharing a weight are tokenized together
+_FIELD_GROUPS = {}
+for _field, _weight in FIELDS.items():
+    _FIELD_GROUPS.setdefault(_weight, []).append(_field)
+
+
+@lru_cache(maxsize=262144)
+def _term(word):
+    # Index term of a folded word (bytes), None for short words and stopwords
+    word = word.decode()
+    if len(word) < MIN_WORD_LENGTH or word in STOPWORDS:
+        return None
+    return stem(word)
+
+
+def stem(word):
+    """Light French stemmer on a folded word ('entrainements' -> 'entrain')"""
+    if len(word) <= 4:
+        return word
+    if word.endswith("aux"):
+        word = word[:-3] + "al"
+    elif word[-1] in "sx":
+        word = word[:-1]
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def _text(value):
+    return value if isinstance(value, str) else " ".join(value or ())
+
+
+def terms(text):
+    """Stemmed, accent-folded terms of a text (same folding as similarity.tokens)"""
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore")
+    return [term for term in map(_term, folded.translate(_SEPARATORS).split()) if term]
+
+
+def _weighted_terms(project):
+    """Terms of a project, each repeated as many times as its field weight"""
+    words = []
+    for weight, fields in _FIELD_GROUPS.items():
+        words.extend(terms(" ".join(_text(project[field]) for field in fields)) * weight)
+    return words
+
+
+class SearchIndex:
+    """
+    Inverted index of a portfolio's texts
+
+    Each term maps to the array of documents containing it and the array of
+    its weighted frequencies, so a query is a few vectorized gathers into
+    dense score arrays. New projects are appended to small pending postings;
+    removed ones are masked until compaction. Projects are tracked by
+    identity, like the other incremental indexes.
+    """
+
+    def __init__(self, projects=()):
+        self._build(list(projects))
+
+    def _build(self, projects):
+        n = len(projects)
+        self._docs = list(projects)
+        self._keys = {id(project): doc for doc, project in enumerate(projects)}
+        self._capacity = max(n, 16)
+        self._lengths = np.zeros(self._capacity, dtype=np.float32)
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._alive[:n] = True
+        self._dead = 0
+        self._postings = {}
+        self._pending = {}
+
+        # One flat term id per word; counting the distinct (term, document)
+        # pairs gives the postings already grouped by term
+        vocabulary = defaultdict(count().__next__)
+        term_ids, sizes = array("i"), array("i")
+        for project in projects:
+            words = _weighted_terms(project)
+            term_ids.extend(map(vocabulary.__getitem__, words))
+            sizes.append(len(words))
+        sizes = np.frombuffer(sizes, dtype=np.int32)
+        self._lengths[:n] = sizes
+        self._total_length = float(sizes.sum())
+        if not vocabulary:
+            return
+        doc_of_word = np.repeat(np.arange(n, dtype=np.int64), sizes)
+        pairs, weights = np.unique(np.frombuffer(term_ids, dtype=np.int32) * np.int64(n) + doc_of_word, return_counts=True)
+        docs = (pairs % n).astype(np.int32)
+        weights = weights.astype(np.float32)
+        bounds = np.searchsorted(pairs // n, np.arange(len(vocabulary) + 1))
+        for term, i in vocabulary.items():
+            self._postings[term] = (docs[bounds[i]:bounds[i + 1]], weights[bounds[i]:bounds[i + 1]])
+
+    def _reserve(self, size):
+        if size <= self._capacity:
+            return
+        self._capacity = max(size, 2 * self._capacity)
+        for name in ("_lengths", "_alive"):
+            column = getattr(self, name)
+            grown = np.zeros(self._capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def _postings_of(self, term):
+        """Documents and weights of a term, merging postings added since the last query"""
+        pending = self._pending.pop(term, None)
+        postings = self._postings.get(term)
+        if pending is not None:
+            docs = np.array(pending[0], dtype=np.int32)
+            weights = np.array(pending[1], dtype=np.float32)
+            if postings is not None:
+                docs = np.concatenate([postings[0], docs])
+                weights = np.concatenate([postings[1], weights])
+            postings = self._postings[term] = (docs, weights)
+        return postings
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def add(self, project):
+        """Index a new project"""
+        key = id(project)
+        if key in self._keys:
+            return self.update(project)
+        doc = len(self._docs)
+        self._reserve(doc + 1)
+        self._docs.append(project)
+        self._keys[key] = doc
+        words = _weighted_terms(project)
+        self._lengths[doc] = len(words)
+        self._alive[doc] = True
+        self._total_length += len(words)
+        counts = Counter(words)
+        for term, weight in counts.items():
+            pending = self._pending.setdefault(term, ([], []))
+            pending[0].append(doc)
+            pending[1].append(weight)
+
+    def remove(self, project):
+        """Drop a project from the results; its postings go at the next compaction"""
+        doc = self._keys.pop(id(project))
+        self._docs[doc] = None
+        self._alive[doc] = False
+        self._total_length -= float(self._lengths[doc])
+        self._dead += 1
+        if self._dead > COMPACT_SHARE * len(self._docs):
+            self._build([project for project in self._docs if project is not None])
+
+    def update(self, project):
+        """Re-index a project edited in place"""
+        self.remove(project)
+        self.add(project)
+
+    def sync(self, projects):
+        """
+        Follow a project list that gained, lost or replaced projects
+
+        Projects are matched by identity, so only the differences are
+        indexed. Returns the number of changes.
+        """
+        current = {id(project): project for project in projects}
+        removed = [self._docs[doc] for key, doc in self._keys.items() if key not in current]
+        added = [project for key, project in current.items() if key not in self._keys]
+        if len(removed) + len(added) > len(current) // 2 + 1:
+            self._build(list(projects))
+        else:
+            for project in removed:
+                self.remove(project)
+            for project in added:
+                self.add(project)
+        return len(removed) + len(added)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, project):
+        return id(project) in self._keys
+
+    def search(self, query, limit=20):
+        """
+        Projects containing every term of ``query``, best BM25 score first::
+
+            [(project, score), ...]
+        """
+        query_terms = list(dict.fromkeys(terms(query)))
+        if not query_terms or not self._keys:
+            return []
+        postings = []
+        for term in query_terms:
+            found = self._postings_of(term)
+            if found is None:
+                return []
+            postings.append(found)
+
+        # Candidates are the live documents of the rarest term; postings are
+        # sorted by document, so every other term is a binary search into its
+        # postings for the remaining candidates only
+        postings.sort(key=lambda found: len(found[0]))
+        docs, weights = postings[0]
+        if self._dead:
+            live = self._alive[docs]
+            docs, weights = docs[live], weights[live]
+        scores = self._bm25(postings[0][0], docs, weights)
+        for term_docs, term_weights in postings[1:]:
+            positions = np.minimum(np.searchsorted(term_docs, docs), len(term_docs) - 1)
+            found = term_docs[positions] == docs
+            docs, scores, positions = docs[found], scores[found], positions[found]
+            scores += self._bm25(term_docs, docs, term_weights[positions])
+
+        best = np.arange(len(docs))
+        if len(best) > limit:
+            best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(self._docs[docs[i]], float(scores[i])) for i in best]
+
+    def _bm25(self, term_docs, docs, weights):
+        """BM25 contribution of a term (posted in ``term_docs``) to ``docs``, whose frequencies are ``weights``"""
+        alive = len(self._keys)
+        frequency = np.count_nonzero(self._alive[term_docs]) if self._dead else len(term_docs)
+        idf = math.log(1 + (alive - frequency + 0.5) / (frequency + 0.5))
+        average = self._total_length / alive or 1.0
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[docs] / average)
+        return idf * weights * (BM25_K1 + 1) / (weights + norms)
+
+
+# ============================================================================
+# SNIPPETS
+# ============================================================================
+
+def snippet(project, query, before="**", after="**", escape=str, words=SNIPPET_WORDS):
+    """
+    Extract of the first field matching ``query`` with the matching words
+    wrapped in ``before``/``after``; returns (field, text) or (None, "")
+    """
+    wanted = set(terms(query))
+    for field in FIELDS:
+        text = _text(project[field])
+        if not text:
+            continue
+        spans = list(_WORD.finditer(text))
+        matched = [i for i, span in enumerate(spans) if set(terms(span.group())) & wanted]
+        if not matched:
+            continue
+        first = max(matched[0] - words, 0)
+        last = min(matched[0] + words, len(spans) - 1)
+        start, end = spans[first].start(), spans[last].end()
+        parts = ["… " if first else ""]
+        cursor = start
+        for i in matched:
+            if i < first or i > last:
+                continue
+            span = spans[i]
+            parts.append(escape(text[cursor:span.start()]) + before + escape(span.group()) + after)
+            cursor = span.end()
+        parts.append(escape(text[cursor:end]) + (" …" if last < len(spans) - 1 else ""))
+        return field, "".join(parts)
+    return None, ""
@@ -0,0 +1,382 @@
+"""
+Similar Project Search for RSE Sport Monitoring Platform
+Feature embeddings of projects (sports, SDGs, audiences, country, budget scale,
+TF-IDF of the description) and exact or approximate k-NN by batched dot products
+"""
+
+import math
+import re
+import unicodedata
+import zlib
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from analytics import parse_sdg_num
+from catalogs import ALL_SPORTS, COUNTRIES, SDGS, TARGET_AUDIENCES, fold
+
+# Weight of each feature block in the cosine similarity
+BLOCK_WEIGHTS = {
+    "sports": 1.0,
+    "sdgs": 1.0,
+    "audiences": 0.5,
+    "country": 0.75,
+    "budget": 0.5,
+    "text": 1.0,
+}
+
+# Budget scale: soft one-hot over half-decades from 1 k€ to 10 M€
+BUDGET_LOG_MIN = 3.0
+BUDGET_LOG_STEP = 0.5
+BUDGET_BINS = 9
+
+# Description words are hashed into a fixed number of TF-IDF buckets, so the
+# matrix stays dense and its width does not grow with the vocabulary
+TEXT_DIM = 128
+MIN_WORD_LENGTH = 3
+STOPWORDS = frozenset(
+    "les des une pour par avec dans sur aux est sont ces cette son ses leur leurs qui que "
+    "plus entre tous tout toute toutes ainsi afin mais comme elle ils elles nous vous du au "
+    "the and for with".split()
+)
+
+# Approximate search: candidates preselected on a random projection sketch,
+# then rescored exactly
+SKETCH_DIM = 64
+CANDIDATE_FACTOR = 50
+
+# Queries scored per matrix product (bounds the score matrix to n x QUERY_BATCH)
+QUERY_BATCH = 256
+
+# Document frequencies drift as projects are added; all rows are reweighted
+# once the corpus has changed size by this fraction since the last weighting
+IDF_REFRESH = 0.25
+
+_SPORT_COLUMNS = {fold(sport): i for i, sport in enumerate(ALL_SPORTS)}
+_AUDIENCE_COLUMNS = {audience: i for i, audience in enumerate(TARGET_AUDIENCES)}
+_COUNTRY_COLUMNS = {country: i for i, country in enumerate(COUNTRIES)}
+_WORDS = re.compile(r"[a-z0-9]+")
+
+_BLOCKS = (
+    ("sports", len(ALL_SPORTS)),
+    ("sdgs", len(SDGS)),
+    ("audiences", len(TARGET_AUDIENCES)),
+    ("country", len(COUNTRIES)),
+    ("budget", BUDGET_BINS),
+    ("text", TEXT_DIM),
+)
+_OFFSETS = {}
+_offset = 0
+for _name, _width in _BLOCKS:
+    _OFFSETS[_name] = (_offset, _offset + _width)
+    _offset += _width
+FEATURE_DIM = _offset
+
+_SKETCH = np.random.default_rng(2063).standard_normal((FEATURE_DIM, SKETCH_DIM)).astype(np.float32)
+
+
+def tokens(text):
+    """Accent-folded, lowercase description words worth indexing"""
+    # Same folding as catalogs.fold, done on the whole text by the codec: only
+    # ASCII words are kept anyway
+    folded = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode().lower()
+    return [
+        word for word in _WORDS.findall(folded)
+        if len(word) >= MIN_WORD_LENGTH and word not in STOPWORDS
+    ]
+
+
+@lru_cache(maxsize=4096)
+def _sport_column(sport):
+    return _SPORT_COLUMNS.get(fold(sport))
+
+
+def _bucket(word):
+    # crc32 rather than hash(): str hashes change from one process to the next
+    return zlib.crc32(word.encode()) % TEXT_DIM
+
+
+def _budget_bins(budgets):
+    """Soft one-hot of each budget: weight split between the two nearest half-decades"""
+    vectors = np.zeros((len(budgets), BUDGET_BINS), dtype=np.float32)
+    known = budgets > 0
+    positions = np.clip((np.log10(budgets[known]) - BUDGET_LOG_MIN) / BUDGET_LOG_STEP, 0, BUDGET_BINS - 1)
+    low = positions.astype(int)
+    high = np.minimum(low + 1, BUDGET_BINS - 1)
+    rows = np.flatnonzero(known)
+    vectors[rows, high] = positions - low
+    vectors[rows, low] += 1 - (positions - low)
+    return vectors
+
+
+class SimilarityIndex:
+    """
+    Unit-norm feature rows of a portfolio's projects, searched by dot product
+
+    Rows live in a preallocated float32 matrix that grows by doubling, so
+    adding, replacing or removing a project only rewrites one row. Cosine
+    similarity of a query against every project is a single matrix-vector
+    product; ``similar_many`` batches several queries into one product.
+    """
+
+    def __init__(self, projects=()):
+        self._capacity = 0
+        self._matrix = np.zeros((0, FEATURE_DIM), dtype=np.float32)
+        self._sketch = np.zeros((0, SKETCH_DIM), dtype=np.float32)
+        self._projects = []
+        self._positions = {}
+        self._words = {}
+        self._document_frequency = Counter()
+        self._weighted_size = 0
+        self._build(projects)
+
+    # ------------------------------------------------------------------
+    # Embedding
+    # ------------------------------------------------------------------
+
+    def _idf(self, word):
+        documents = len(self._projects) or 1
+        return math.log((1 + documents) / (1 + self._document_frequency[word])) + 1
+
+    def embed_many(self, projects, words=None):
+        """
+        Unit-norm feature rows of several projects, text weighted with the
+        current IDF
+
+        Non-zero entries are gathered as index arrays and scattered into the
+        matrix at once; blocks are then normalized and weighted column-wise.
+        """
+        if words is None:
+            words = [tokens(project['description']) for project in projects]
+        n = len(projects)
+        rows = np.zeros((n, FEATURE_DIM), dtype=np.float32)
+
+        # Categorical blocks: one (row, column) pair per selected value
+        indices, columns = [], []
+        sports_at, sdgs_at = _OFFSETS["sports"][0], _OFFSETS["sdgs"][0]
+        audiences_at, country_at = _OFFSETS["audiences"][0], _OFFSETS["country"][0]
+        for i, project in enumerate(projects):
+            selected = [sports_at + c for c in map(_sport_column, project['sports']) if c is not None]
+            selected += [sdgs_at + parse_sdg_num(sdg) - 1 for sdg in project['sdgs']]
+            selected += [audiences_at + _AUDIENCE_COLUMNS[a] for a in project['target_audience'] if a in _AUDIENCE_COLUMNS]
+            if project['country'] in _COUNTRY_COLUMNS:
+                selected.append(country_at + _COUNTRY_COLUMNS[project['country']])
+            indices += [i] * len(selected)
+            columns += selected
+        rows[np.array(indices, dtype=np.intp), np.array(columns, dtype=np.intp)] = 1
+
+        # Text block: term counts per (row, word) pair, sublinear TF times IDF,
+        # accumulated into the hashed buckets
+        vocabulary = {}
+        word_ids = [[vocabulary.setdefault(word, len(vocabulary)) for word in row_words] for row_words in words]
+        if vocabulary:
+            size = len(vocabulary)
+            lengths = np.fromiter(map(len, word_ids), dtype=np.int64, count=n)
+            flat = np.fromiter((w for row_ids in word_ids for w in row_ids), dtype=np.int64, count=int(lengths.sum()))
+            pairs, counts = np.unique(np.repeat(np.arange(n, dtype=np.int64), lengths) * size + flat, return_counts=True)
+            pair_rows, pair_words = np.divmod(pairs, size)
+            idf = np.fromiter(map(self._idf, vocabulary), dtype=np.float32, count=size)
+            buckets = np.fromiter(map(_bucket, vocabulary), dtype=np.intp, count=size)
+            np.add.at(
+                rows,
+                (pair_rows, _OFFSETS["text"][0] + buckets[pair_words]),
+                (1 + np.log(counts)) * idf[pair_words],
+            )
+
+        start, end = _OFFSETS["budget"]
+        rows[:, start:end] = _budget_bins(np.array([project['budget'] for project in projects], dtype=np.float64))
+
+        for name, (start, end) in _OFFSETS.items():
+            block = rows[:, start:end]
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            np.divide(block * BLOCK_WEIGHTS[name], norms, out=block, where=norms > 0)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        np.divide(rows, norms, out=rows, where=norms > 0)
+        return rows
+
+    def embed(self, project, words=None):
+        """Unit-norm feature row of one project"""
+        return self.embed_many([project], None if words is None else [words])[0]
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _reserve(self, size):
+        if size <= self._capacity:
+            return
+        capacity = max(size, 2 * self._capacity, 64)
+        kept = min(len(self._projects), self._capacity)
+        matrix = np.zeros((capacity, FEATURE_DIM), dtype=np.float32)
+        matrix[:kept] = self._matrix[:kept]
+        sketch = np.zeros((capacity, SKETCH_DIM), dtype=np.float32)
+        sketch[:kept] = self._sketch[:kept]
+        self._matrix, self._sketch, self._capacity = matrix, sketch, capacity
+
+    def _build(self, projects):
+        self._projects = list(projects)
+        self._positions = {id(project): i for i, project in enumerate(self._projects)}
+        self._words = {id(project): tokens(project['description']) for project in self._projects}
+        self._document_frequency = Counter(word for words in self._words.values() for word in set(words))
+        self._reserve(len(self._projects))
+        self._reweight()
+
+    def _reweight(self):
+        """Recompute every row with the current document frequencies"""
+        n = len(self._projects)
+        self._matrix[:n] = self.embed_many(self._projects, [self._words[id(project)] for project in self._projects])
+        self._sketch[:n] = self._matrix[:n] @ _SKETCH
+        self._weighted_size = n
+
+    def _write(self, position, project):
+        self._matrix[position] = self.embed(project, self._words[id(project)])
+        self._sketch[position] = self._matrix[position] @ _SKETCH
+
+    def _drifted(self):
+        n = len(self._projects)
+        return abs(n - self._weighted_size) > IDF_REFRESH * max(self._weighted_size, 1)
+
+    def add(self, project):
+        """Index a new project"""
+        key = id(project)
+        if key in self._positions:
+            return self.update(project)
+        self._words[key] = tokens(project['description'])
+        self._document_frequency.update(set(self._words[key]))
+        self._reserve(len(self._projects) + 1)
+        self._positions[key] = len(self._projects)
+        self._projects.append(project)
+        if self._drifted():
+            self._reweight()
+        else:
+            self._write(self._positions[key], project)
+
+    def remove(self, project):
+        """Drop a project; the last row moves into its place"""
+        key = id(project)
+        position = self._positions.pop(key)
+        self._document_frequency.subtract(set(self._words.pop(key)))
+        last = self._projects.pop()
+        if position < len(self._projects):
+            self._projects[position] = last
+            self._positions[id(last)] = position
+            self._matrix[position] = self._matrix[len(self._projects)]
+            self._sketch[position] = self._sketch[len(self._projects)]
+        if self._drifted():
+            self._reweight()
+
+    def update(self, project):
+        """Re-embed a project edited in place"""
+        key = id(project)
+        words = tokens(project['description'])
+        if words != self._words[key]:
+            self._document_frequency.subtract(set(self._words[key]))
+            self._document_frequency.update(set(words))
+            self._words[key] = words
+        self._write(self._positions[key], project)
+
+    def sync(self, projects):
+        """
+        Follow a project list that gained, lost or replaced projects
+
+        Projects are matched by identity, as in ``benchmarking.Benchmark``.
+        Returns the number of changes.
+        """
+        current = {id(project): project for project in projects}
+        removed = [project for project in self._projects if id(project) not in current]
+        added = [project for key, project in current.items() if key not in self._positions]
+        if len(removed) + len(added) > len(current) // 2 + 1:
+            self._build(projects)
+        else:
+            for project in removed:
+                self.remove(project)
+            for project in added:
+                self.add(project)
+        return len(removed) + len(added)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self._projects)
+
+    def __contains__(self, project):
+        return id(project) in self._positions
+
+    def _query_rows(self, projects):
+        rows = np.empty((len(projects), FEATURE_DIM), dtype=np.float32)
+        for i, project in enumerate(projects):
+            position = self._positions.get(id(project))
+            rows[i] = self._matrix[position] if position is not None else self.embed(project)
+        return rows
+
+    def _ranked(self, indices, scores):
+        order = np.argsort(-scores)
+        return [(self._projects[indices[i]], float(scores[i])) for i in order if scores[i] > -np.inf]
+
+    def similar_many(self, projects, k=5, approximate=False):
+        """
+        The k most similar projects of each query project, as lists of
+        ``(project, cosine similarity)`` pairs, best first
+
+        Queries are scored in one matrix product per batch. With
+        ``approximate`` the products are taken on the random projection sketch
+        and only the best ``CANDIDATE_FACTOR * k`` candidates are rescored
+        exactly.
+        """
+        n = len(self._projects)
+        if not n or not projects:
+            return [[] for _ in projects]
+        matrix = self._matrix[:n]
+        approximate = approximate and n > CANDIDATE_FACTOR * k
+        # One extra neighbour in case the query itself is among the best
+        depth = min(CANDIDATE_FACTOR * k if approximate else k + 1, n)
+        results = []
+        for start in range(0, len(projects), QUERY_BATCH):
+            batch = projects[start:start + QUERY_BATCH]
+            queries = self._query_rows(batch)
+            # One row of scores per query, so each partition runs on contiguous memory
+            scores = (queries @ _SKETCH) @ self._sketch[:n].T if approximate else queries @ matrix.T
+            for j, project in enumerate(batch):
+                position = self._positions.get(id(project))
+                if position is not None:
+                    scores[j, position] = -np.inf
+            best = np.argpartition(-scores, depth - 1, axis=1)[:, :depth]
+            for j in range(len(batch)):
+                candidates = best[j]
+                if approximate:
+                    exact = matrix[candidates] @ queries[j]
+                    exact[scores[j, candidates] == -np.inf] = -np.inf
+                else:
+                    exact = scores[j, candidates]
+                results.append(self._ranked(candidates, exact)[:k])
+        return results
+
+    def similar(self, project, k=5, approximate=False):
+        """The k projects most similar to ``project`` (itself excluded)"""
+        return self.similar_many([project], k, approximate)[0]
+
+    def similar_pairs(self, threshold=0.75, limit=10, other_country=False, batch_size=1024):
+        """
+        Most similar pairs of the portfolio, scanned in row batches
+
+        With ``other_country`` only pairs across countries are kept (pairs in
+        the same country are already covered by the country synergies).
+        """
+        n = len(self._projects)
+        matrix = self._matrix[:n]
+        countries = np.array([project['country'] for project in self._projects], dtype=object)
+        pairs = []
+        for start in range(0, n, batch_size):
+            scores = matrix[start:start + batch_size] @ matrix.T
+            rows, columns = np.nonzero(scores >= threshold)
+            rows += start
+            keep = columns > rows
+            if other_country:
+                keep &= countries[rows] != countries[columns]
+            for i, j in zip(rows[keep], columns[keep]):
+                pairs.append((float(scores[i - start, j]), i, j))
+            pairs = sorted(pairs, key=lambda pair: -pair[0])[:limit]
+        return [(self._projects[i], self._projects[j], score) for score, i, j in pairs[:limit]]
@@ -0,0 +1,177 @@
+"""
+Portfolio Snapshots for RSE Sport Monitoring Platform
+Immutable, versioned portfolio snapshots stored as columnar chunks shared
+between versions, and diffs between reporting periods (added, removed and
+changed projects, KPI deltas)
+"""
+
+import json
+import zlib
+from datetime import datetime
+
+from models import PROJECT_FIELDS, Project, ProjectTable
+
+# Chunk boundaries are placed where a project id hashes to 0 modulo
+# CHUNK_SIZE (content-defined), so inserting or removing a project only
+# rewrites the chunk around it instead of shifting every following chunk
+CHUNK_SIZE = 256
+MAX_CHUNK = 4 * CHUNK_SIZE
+
+KPI_FIELDS = ("total_projects", "total_budget", "total_beneficiaries", "unique_countries")
+
+
+def fingerprint(project):
+    """Content hash of a project, equal for equal contents within a process"""
+    if isinstance(project, Project):
+        return hash(tuple(getattr(project, name) for name in Project.__slots__))
+    return hash(json.dumps(project, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def _boundary(project_id):
+    return zlib.crc32(str(project_id).encode()) % CHUNK_SIZE == 0
+
+
+class _Chunk:
+    """Read-only columnar copy of consecutive projects and their partial KPIs"""
+
+    __slots__ = ("ids", "fingerprints", "table", "budget", "beneficiaries", "countries", "_projects")
+
+    def __init__(self, ids, fingerprints, projects):
+        self.ids = ids
+        self.fingerprints = fingerprints
+        self.table = ProjectTable.from_projects(
+            p if isinstance(p, Project) else Project.from_dict(p) for p in projects
+        )
+        for column in self.table.columns.values():
+            if hasattr(column, "flags"):
+                column.flags.writeable = False
+        self.table.impacts.flags.writeable = False
+        self.budget = float(self.table.column("budget").sum())
+        self.beneficiaries = int(self.table.column("beneficiaries").sum())
+        self.countries = frozenset(self.table.categories["country"])
+        self._projects = None
+
+    def projects(self):
+        """Decoded projects of the chunk (rebuilt once, only for diffs and lookups)"""
+        if self._projects is None:
+            self._projects = self.table.to_projects()
+        return self._projects
+
+
+class PortfolioSnapshot:
+    """
+    Immutable state of a portfolio at one version
+
+    Projects are split into chunks; taking a snapshot with ``previous``
+    reuses every chunk of the previous snapshot whose projects are unchanged,
+    so consecutive snapshots only store the chunks that were edited. KPIs are
+    summed from per-chunk partials.
+    """
+
+    def __init__(self, chunks, version=None, label=None, taken_at=None):
+        self.chunks = tuple(chunks)
+        self.version = version
+        self.label = label
+        self.taken_at = taken_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    @classmethod
+    def take(cls, projects, previous=None, version=None, label=None):
+        """Snapshot ``projects`` (Project records or dictionaries with an id)"""
+        reusable = {}
+        if previous is not None:
+            reusable = {(chunk.ids, chunk.fingerprints): chunk for chunk in previous.chunks}
+        chunks = []
+        ids, fingerprints, members = [], [], []
+
+        def close():
+            key = (tuple(ids), tuple(fingerprints))
+            chunks.append(reusable.get(key) or _Chunk(key[0], key[1], members))
+
+        for project in projects:
+            project_id = project.get("id")
+            ids.append(project_id)
+            fingerprints.append(fingerprint(project))
+            members.append(project)
+            if len(ids) >= MAX_CHUNK or _boundary(project_id):
+                close()
+                ids, fingerprints, members = [], [], []
+        if ids:
+            close()
+        return cls(chunks, version, label)
+
+    def __len__(self):
+        return sum(len(chunk.ids) for chunk in self.chunks)
+
+    def projects(self):
+        return [project for chunk in self.chunks for project in chunk.projects()]
+
+    def kpis(self):
+        """Same headline metrics as analytics.compute_kpis"""
+        return {
+            "total_projects": len(self),
+            "total_budget": sum(chunk.budget for chunk in self.chunks),
+            "total_beneficiaries": sum(chunk.beneficiaries for chunk in self.chunks),
+            "unique_countries": len(frozenset().union(*(chunk.countries for chunk in self.chunks))),
+        }
+
+    def shared_with(self, other):
+        """Number of chunks stored once for both snapshots"""
+        return len({id(chunk) for chunk in self.chunks} & {id(chunk) for chunk in other.chunks})
+
+
+# ============================================================================
+# DIFF
+# ============================================================================
+
+def kpi_deltas(before, after):
+    """``{kpi: {"before", "after", "delta"}}`` between two KPI dictionaries"""
+    return {
+        key: {"before": before[key], "after": after[key], "delta": after[key] - before[key]}
+        for key in KPI_FIELDS
+    }
+
+
+def _rows(snapshot, skipped):
+    return {
+        project_id: (chunk, i, print_)
+        for chunk in snapshot.chunks if id(chunk) not in skipped
+        for i, (project_id, print_) in enumerate(zip(chunk.ids, chunk.fingerprints))
+    }
+
+
+def diff(old, new):
+    """
+    Differences between two snapshots::
+
+        {"added": [{"id", "name"}], "removed": [...],
+         "changed": [{"id", "name", "fields": [...]}], "kpis": {...}}
+
+    Chunks shared by both snapshots are skipped without being read; only
+    projects whose fingerprints differ are decoded and compared field by field.
+    """
+    shared = {id(chunk) for chunk in old.chunks} & {id(chunk) for chunk in new.chunks}
+    before, after = _rows(old, shared), _rows(new, shared)
+
+    def summary(row):
+        project = row[0].projects()[row[1]]
+        return {"id": project["id"], "name": project["name"]}
+
+    changed = []
+    for project_id in before.keys() & after.keys():
+        old_row, new_row = before[project_id], after[project_id]
+        if old_row[2] == new_row[2]:
+            continue
+        old_project = old_row[0].projects()[old_row[1]]
+        new_project = new_row[0].projects()[new_row[1]]
+        fields = [field for field in PROJECT_FIELDS if old_project[field] != new_project[field]]
+        if fields:
+            changed.append({"id": project_id, "name": new_project["name"], "fields": fields})
+
+    return {
+        "from": old.label or old.version,
+        "to": new.label or new.version,
+        "added": sorted((summary(after[i]) for i in after.keys() - before.keys()), key=lambda p: p["name"]),
+        "removed": sorted((summary(before[i]) for i in before.keys() - after.keys()), key=lambda p: p["name"]),
+        "changed": sorted(changed, key=lambda c: c["name"]),
+        "kpis": kpi_deltas(old.kpis(), new.kpis()),
+    }
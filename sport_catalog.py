@@ -0,0 +1,169 @@
+"""
+Sport Catalog for RSE Sport Monitoring Platform
+Prebuilt exact / prefix / trigram index resolving known spellings of sport
+names ("Basket", "foot", "para natation") to canonical SPORTS_LIST entries
+and suggesting sports for free-typed searches
+"""
+
+import re
+from bisect import bisect_left
+from functools import lru_cache
+
+from catalogs import SPORTS_LIST, SPORT_ALIASES, fold
+
+MIN_SIMILARITY = 0.5
+
+_SEPARATORS = re.compile(r"[\s\-'’_/().]+")
+_PARA_SUFFIXES = (" handisport", " fauteuil")
+
+
+def search_key(text):
+    """Accent, case and punctuation insensitive key ('Tir à l'arc' -> 'tir a l arc')"""
+    return _SEPARATORS.sub(" ", fold(text)).strip()
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _para_variants(sport):
+    """Spellings of para-sports that users type in forms and spreadsheets"""
+    variants = []
+    if sport.startswith("Para-"):
+        base = sport[len("Para-"):]
+        variants += [f"para {base}", f"{base} handisport", f"{base} adapté"]
+    for suffix in _PARA_SUFFIXES:
+        if sport.endswith(suffix):
+            base = sport[:-len(suffix)]
+            variants += [f"para {base}", f"para-{base}", f"{base} adapté"]
+            if suffix == " fauteuil":
+                variants += [f"{base} en fauteuil", f"{base} fauteuil roulant"]
+    return variants
+
+
+class SportCatalog:
+    """
+    Resolve free text to canonical sport names
+
+    Indexes are built once: an exact dictionary over folded names and
+    aliases, sorted lists of keys and of their word suffixes for prefix and
+    word-prefix lookups (bisect) and a trigram posting list for fuzzy
+    matching. Only exact names and aliases resolve:
+    a prefix or a close spelling can be another sport ("Tennis de plage" is
+    not "Tennis de table"), so those only rank search suggestions.
+    Resolutions are memoized, so bulk imports that repeat the same spellings
+    pay the lookup cost once per spelling.
+    """
+
+    def __init__(self, sports_by_category, aliases=None):
+        self.categories = {}
+        self.ids = {}
+        self._exact = {}
+        for category, sports in sports_by_category.items():
+            for sport in sports:
+                self.categories.setdefault(sport, category)
+        # Canonical names first so they win over variants and aliases sharing a key
+        for sport in sorted(self.categories):
+            self.ids[sport] = len(self.ids)
+            self._add(sport, sport)
+        for sport in self.ids:
+            for variant in _para_variants(sport):
+                self._add(variant, sport)
+        for sport, names in (aliases or {}).items():
+            if sport in self.categories:
+                for name in names:
+                    self._add(name, sport)
+
+        self._keys = sorted(self._exact)
+        # Every key from each of its words on ("tir a l arc", "a l arc", ...)
+        self._word_suffixes = sorted(
+            (key[start:], position)
+            for position, key in enumerate(self._keys)
+            for start in [0] + [i + 1 for i, char in enumerate(key) if char == " "]
+        )
+        self._gram_counts = []
+        self._postings = {}
+        for position, key in enumerate(self._keys):
+            grams = _trigrams(key)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(position)
+        self.resolve = lru_cache(maxsize=65536)(self._resolve)
+
+    def _add(self, name, sport):
+        key = search_key(name)
+        if key:
+            self._exact.setdefault(key, sport)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _prefix_keys(self, key):
+        start = bisect_left(self._keys, key)
+        for position in range(start, len(self._keys)):
+            if not self._keys[position].startswith(key):
+                break
+            yield self._keys[position]
+
+    def _word_prefix_keys(self, key):
+        """Keys with a word starting with ``key``, in key order"""
+        positions = set()
+        for index in range(bisect_left(self._word_suffixes, (key,)), len(self._word_suffixes)):
+            suffix, position = self._word_suffixes[index]
+            if not suffix.startswith(key):
+                break
+            positions.add(position)
+        return [self._keys[position] for position in sorted(positions)]
+
+    def _fuzzy(self, key):
+        """Keys ranked by Dice similarity of their trigrams with ``key``"""
+        grams = _trigrams(key)
+        overlap = {}
+        for gram in grams:
+            for position in self._postings.get(gram, ()):
+                overlap[position] = overlap.get(position, 0) + 1
+        scored = []
+        for position, shared in overlap.items():
+            score = 2 * shared / (len(grams) + self._gram_counts[position])
+            scored.append((score, self._keys[position]))
+        scored.sort(key=lambda item: (-item[0], len(item[1])))
+        return scored
+
+    def _resolve(self, text):
+        """Canonical sport of a name or alias (case, accent and punctuation folded), or None"""
+        return self._exact.get(search_key(text))
+
+    def resolve_id(self, text):
+        """Integer id of the canonical sport, or None"""
+        sport = self.resolve(text)
+        return self.ids[sport] if sport is not None else None
+
+    def search(self, query, limit=10):
+        """Ranked canonical sports for a search box: exact, prefix, word prefix, fuzzy"""
+        key = search_key(query)
+        if not key:
+            return []
+        results = []
+
+        def add(sport):
+            if sport not in results:
+                results.append(sport)
+
+        if key in self._exact:
+            add(self._exact[key])
+        for candidate in sorted(self._prefix_keys(key), key=len):
+            add(self._exact[candidate])
+        for candidate in self._word_prefix_keys(key):
+            if len(results) >= limit:
+                break
+            add(self._exact[candidate])
+        for score, candidate in self._fuzzy(key):
+            if len(results) >= limit or score < MIN_SIMILARITY / 2:
+                break
+            add(self._exact[candidate])
+        return results[:limit]
+
+
+SPORT_CATALOG = SportCatalog(SPORTS_LIST, SPORT_ALIASES)
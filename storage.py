@@ -0,0 +1,591 @@
+"""
+Project Storage for RSE Sport Monitoring Platform
+Event-logged project store shared by the Streamlit app and the REST API: JSON
+snapshots plus the append-only log of the writes made since
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only hold within one process
+    fcntl = None
+
+from cache import CACHE_DIR, FileCache
+from history import EventLog, apply, change
+from models import PROJECT_FIELDS, Project, ProjectTable
+from validation import normalize_changes, normalize_project
+
+DEFAULT_DATA_DIR = os.environ.get("RSE_DATA_DIR", "rse_data")
+DEFAULT_TENANT = "default"
+MAX_ACTIVE_TENANTS = int(os.environ.get("RSE_MAX_ACTIVE_TENANTS", "32"))
+
+TENANT_ID_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+
+# Projects are locked through a fixed number of lock stripes (one lock file
+# each), so two writers only wait for each other when editing projects of the
+# same stripe
+LOCK_STRIPES = 64
+
+
+class ProjectNotFound(KeyError):
+    """Raised when a project id does not exist in the store"""
+
+
+class EditConflict(Exception):
+    """Raised when a project was changed by someone else on the same fields"""
+
+    def __init__(self, project_id, fields, current):
+        super().__init__(f"Modification concurrente du projet {project_id} : {', '.join(fields)}")
+        self.project_id = project_id
+        self.fields = fields
+        self.current = current
+
+
+def merge(base, mine, theirs):
+    """
+    Three-way merge of an edit made from ``base`` onto the current ``theirs``
+
+    Returns the changes to apply: the fields the edit really changed. Raises
+    EditConflict when one of them was also changed, differently, in
+    ``theirs``. Without a base every differing field is a conflict.
+    """
+    if base is None:
+        conflicts = [field for field, value in mine.items() if theirs.get(field) != value]
+    else:
+        conflicts = [
+            field for field, value in mine.items()
+            if value != base.get(field) and theirs.get(field) not in (base.get(field), value)
+        ]
+    if conflicts:
+        raise EditConflict(theirs.get("id"), conflicts, theirs)
+    return {field: value for field, value in mine.items() if base is None or value != base.get(field)}
+
+
+def _canonical(project_data):
+    """
+    Complete, canonical project (see validation.normalize_project); dictionaries
+    carrying every legacy field were normalized by the forms, the API or the
+    CSV import and are kept as they are
+    """
+    if all(field in project_data for field in PROJECT_FIELDS):
+        return dict(project_data)
+    return normalize_project(project_data)
+
+
+def _same_content(current, expected):
+    if current is None or expected is None:
+        return current is expected
+    return {**current, "revision": None} == {**expected, "revision": None}
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock shared with the other processes using the same file"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class ProjectStore:
+    """
+    Persist projects as a JSON snapshot plus an event log on disk
+
+    Every write is appended to the event log (see history.EventLog) and
+    bumps a monotonically increasing version number that callers use as a
+    cheap cache key (aggregates, HTTP ETags). The full JSON document is only
+    rewritten every SNAPSHOT_INTERVAL events. Derived results are kept in a
+    per-store cache that is dropped whenever the version changes and, with a
+    ``cache`` (see cache.FileCache), shared with the other processes.
+
+    Several processes can write to the same store. Each project carries a
+    ``revision`` number; updates and deletions can be made conditional on
+    it (compare-and-swap) and edits made from an older revision are merged
+    field by field. A project is locked while it is being written, and the
+    whole store only for the short catch-up and append of the event.
+    """
+
+    def __init__(self, path=None, cache=None):
+        self.path = path or os.path.join(DEFAULT_DATA_DIR, "projects.json")
+        self.shared_cache = cache
+        self._lock = threading.RLock()
+        self._projects = []
+        self._index = {}
+        self._cache = {}
+        self._cache_version = None
+        self.version = 0
+        self._mtime = None
+        self._log = EventLog(os.path.dirname(self.path) or ".")
+        self._row_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """Load the latest snapshot, then replay the events logged after it"""
+        payload = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                payload = json.load(f)
+            self._mtime = os.path.getmtime(self.path)
+        previous = {(p["id"], p.get("revision", 0)): p for p in self._projects}
+        self._projects = payload.get("projects", [])
+        self.version = payload.get("version", 0)
+        self._log.restore(self.version, payload.get("history"))
+        self._replay()
+        if previous:
+            # Projects whose revision did not change keep their dictionary, so
+            # readers tracking projects by identity only follow the written ones
+            self._projects[:] = [previous.get((p["id"], p.get("revision", 0)), p) for p in self._projects]
+
+    def _replay(self):
+        """Apply the events other processes appended since the last read"""
+        events = self._log.read_new()
+        if events and events[0]["version"] > self._log.version + 1:
+            # The log was rotated between our snapshot check and this read:
+            # the events we missed are in the new snapshot
+            self._load()
+            return
+        for event in events:
+            apply(self._projects, event["changes"])
+            self._log.track(event)
+        self.version = self._log.version
+        if events or len(self._index) != len(self._projects):
+            self._index = {p["id"]: i for i, p in enumerate(self._projects)}
+
+    def _save(self):
+        """Write a snapshot atomically so readers never see a partial file"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "projects": self._projects, "history": self._log.state()},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+    def refresh(self):
+        """Catch up with writes made by other processes"""
+        with self._lock:
+            if os.path.exists(self.path) and os.path.getmtime(self.path) != self._mtime:
+                # Another process took a snapshot (and rotated the log)
+                self._load()
+            else:
+                self._replay()
+
+    # ------------------------------------------------------------------
+    # Locking
+    # ------------------------------------------------------------------
+
+    def _lock_path(self, name):
+        directory = os.path.join(os.path.dirname(self.path) or ".", "locks")
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, name)
+
+    @contextmanager
+    def _exclusive(self):
+        """Store-wide write section: catch up with other processes, then append"""
+        with self._lock, _file_lock(self._lock_path("store.lock")):
+            self.refresh()
+            yield
+
+    @contextmanager
+    def _row(self, project_id):
+        """Lock one project (through its stripe) across threads and processes"""
+        stripe = zlib.crc32(str(project_id).encode()) % LOCK_STRIPES
+        with self._row_locks[stripe], _file_lock(self._lock_path(f"row-{stripe:02d}.lock")):
+            yield
+
+    def _commit(self, kind, changes, **details):
+        """Log a write; the snapshot is rewritten every SNAPSHOT_INTERVAL events"""
+        event = self._log.record(kind, changes, **details)
+        self.version = event["version"]
+        if self._log.snapshot_due():
+            self._save()
+            self._log.rotate()
+        return event
+
+    # ------------------------------------------------------------------
+    # Derived results cache
+    # ------------------------------------------------------------------
+
+    def cache_entries(self):
+        """Cache entries valid for the current version"""
+        with self._lock:
+            if self._cache_version != self.version:
+                self._cache_version = self.version
+                self._cache = {}
+            return self._cache
+
+    def cache_get(self, key):
+        """Cached value for the current version (from this process or another), None if missing"""
+        entries = self.cache_entries()
+        if key not in entries and self.shared_cache is not None:
+            value = self.shared_cache.get(self.version, key)
+            if value is not None:
+                entries[key] = value
+        return entries.get(key)
+
+    def cache_put(self, key, value, version=None, shared=True):
+        """
+        Cache a value computed at ``version`` (default: the current one);
+        ignored if the store has moved on meanwhile
+        """
+        if version is None:
+            version = self.version
+        entries = self.cache_entries()
+        if version != self.version:
+            return
+        entries[key] = value
+        if shared and self.shared_cache is not None:
+            self.shared_cache.put(version, key, value)
+
+    def cached(self, key, compute, shared=True):
+        """
+        Return a cached value for the current version, computing it once;
+        ``shared`` values are also cached for the other processes (they must
+        be picklable)
+        """
+        value = self.cache_get(key) if shared else self.cache_entries().get(key)
+        if value is None:
+            version = self.version
+            value = compute()
+            self.cache_put(key, value, version, shared)
+        return value
+
+    def table(self, records=None, version=None):
+        """
+        Read-only ProjectTable of the current version
+
+        With a shared cache, the first process asking for it saves it as a
+        columnar file next to the cached results and every process maps
+        that file: numeric columns are read without copy and share the page
+        cache. ``records`` are the projects of the store at ``version``
+        (dictionaries or Project records), used when they are current.
+        """
+        with self._lock:
+            current = self.version
+            table = self.cache_entries().get("table")
+            if table is not None:
+                return table
+            if records is None or version != current:
+                records = list(self._projects)
+
+        def build():
+            return ProjectTable.from_projects(p if isinstance(p, Project) else Project.from_dict(p) for p in records)
+
+        if self.shared_cache is None:
+            table = build()
+        else:
+            path = self.shared_cache.version_path(current, "table")
+            if not os.path.isdir(path):
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                build().save(tmp_path)
+                try:
+                    os.rename(tmp_path, path)
+                except OSError:
+                    # Another process saved it first
+                    shutil.rmtree(tmp_path, ignore_errors=True)
+                self.shared_cache.prune(current)
+            table = ProjectTable.open(path)
+        self.cache_put("table", table, current, shared=False)
+        return table
+
+    def memory_parts(self):
+        """Shallow copies of what the store keeps in memory (see workspace.memory_report)"""
+        with self._lock:
+            return {
+                "store": (list(self._projects), dict(self._index)),
+                "cache": dict(self._cache) if self._cache_version == self.version else {},
+            }
+
+    # ------------------------------------------------------------------
+    # CRUD
+    # ------------------------------------------------------------------
+
+    def list_projects(self):
+        """Return all projects (shared references, do not mutate)"""
+        with self._lock:
+            return list(self._projects)
+
+    def count(self):
+        with self._lock:
+            return len(self._projects)
+
+    def get(self, project_id):
+        with self._lock:
+            if project_id not in self._index:
+                raise ProjectNotFound(project_id)
+            return self._projects[self._index[project_id]]
+
+    def revision_of(self, project_id, revision):
+        """A project as it was at one of its revisions (None if no longer in the log)"""
+        with self._lock:
+            if project_id in self._index and self.get(project_id).get("revision", 0) == revision:
+                return self.get(project_id)
+            found = None
+            for event in self._log.events(0, project_id):
+                for _, _, after in event["changes"]:
+                    if after is not None and after["id"] == project_id and after.get("revision", 0) == revision:
+                        found = after
+            return found
+
+    def create(self, project_data):
+        """Add a project (normalized if needed) and return it with its generated id"""
+        project = _canonical(project_data)
+        with self._exclusive():
+            project.setdefault("id", uuid.uuid4().hex)
+            project.setdefault("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            project["revision"] = 1
+            self._index[project["id"]] = len(self._projects)
+            self._projects.append(project)
+            self._commit("create", [change(len(self._projects) - 1, None, project)])
+            return project
+
+    def create_many(self, projects_data):
+        """Add several projects as one write (undone at once); returns them"""
+        projects_data = [_canonical(project_data) for project_data in projects_data]
+        with self._exclusive():
+            start = len(self._projects)
+            projects = []
+            for project in projects_data:
+                project.setdefault("id", uuid.uuid4().hex)
+                project.setdefault("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+                project["revision"] = 1
+                self._index[project["id"]] = len(self._projects)
+                self._projects.append(project)
+                projects.append(project)
+            if projects:
+                self._commit("create", [change(start + i, None, p) for i, p in enumerate(projects)])
+            return projects
+
+    def update(self, project_id, changes, expected_revision=None, base=None):
+        """
+        Apply a partial update and return the updated project
+
+        With ``expected_revision``, the update was prepared from that revision
+        of the project: if it has changed since, the edit is merged with the
+        current state (``base`` is the project as the editor saw it, looked up
+        in the log when not given), or EditConflict is raised. Changes are
+        normalized like the API's (see validation.normalize_changes).
+        """
+        changes = normalize_changes(changes)
+        with self._row(project_id):
+            while True:
+                with self._exclusive():
+                    current = self.get(project_id)
+                merged = changes
+                if expected_revision is not None and current.get("revision", 0) != expected_revision:
+                    if base is None:
+                        base = self.revision_of(project_id, expected_revision)
+                    merged = merge(base, changes, current)
+                with self._exclusive():
+                    if self.get(project_id) is not current:
+                        # Changed by an undo or redo meanwhile: merge again
+                        continue
+                    updated = {**current, **merged, "id": project_id, "revision": current.get("revision", 0) + 1}
+                    position = self._index[project_id]
+                    self._projects[position] = updated
+                    self._commit("update", [change(position, current, updated)])
+                    return updated
+
+    def delete(self, project_id, expected_revision=None):
+        """Delete a project; with ``expected_revision``, only if it is still at that revision"""
+        with self._row(project_id), self._exclusive():
+            position = self._index.pop(project_id, None)
+            if position is None:
+                raise ProjectNotFound(project_id)
+            project = self._projects[position]
+            if expected_revision is not None and project.get("revision", 0) != expected_revision:
+                self._index[project_id] = position
+                raise EditConflict(project_id, ["revision"], project)
+            self._projects.pop(position)
+            self._index = {p["id"]: i for i, p in enumerate(self._projects)}
+            self._commit("delete", [change(position, project, None)])
+
+    def clear(self):
+        with self._exclusive():
+            changes = [change(i, p, None) for i, p in enumerate(self._projects)]
+            self._projects = []
+            self._index = {}
+            self._commit("clear", changes)
+
+    # ------------------------------------------------------------------
+    # History
+    # ------------------------------------------------------------------
+
+    def _current_changes(self, changes):
+        """
+        Rebase undo/redo changes on the current state: every project must be
+        as the changes expect it, and gets a new revision
+        """
+        rebased = []
+        for position, before, after in changes:
+            project_id = (before or after)["id"]
+            current = self.get(project_id) if project_id in self._index else None
+            if not _same_content(current, before):
+                raise EditConflict(project_id, ["revision"], current)
+            if after is not None:
+                revision = max(after.get("revision", 0), current.get("revision", 0) if current else 0)
+                after = {**after, "revision": revision + 1}
+            rebased.append(change(position, current, after))
+        return rebased
+
+    def _revert(self, event):
+        if event is None:
+            return None
+        apply(self._projects, event["changes"])
+        self._index = {p["id"]: i for i, p in enumerate(self._projects)}
+        self.version = event["version"]
+        if self._log.snapshot_due():
+            self._save()
+            self._log.rotate()
+        return event
+
+    def undo(self):
+        """
+        Revert the latest write (or redo); returns the logged event, None if
+        nothing to undo. Raises EditConflict if a project it touches has been
+        changed since.
+        """
+        with self._exclusive():
+            return self._revert(self._log.undo(self._current_changes))
+
+    def redo(self):
+        """Replay the latest undone write; returns the logged event, None if nothing to redo"""
+        with self._exclusive():
+            return self._revert(self._log.redo(self._current_changes))
+
+    def next_undo(self):
+        """Event the next undo would revert (None if nothing to undo)"""
+        with self._lock:
+            return self._log.next_undo()
+
+    def next_redo(self):
+        with self._lock:
+            return self._log.next_redo()
+
+    def history(self, since=0, project_id=None):
+        """Events logged after version ``since`` (audit trail), oldest first"""
+        with self._lock:
+            return list(self._log.events(since, project_id))
+
+    def projects_at(self, version):
+        """Projects as they were at ``version`` (point-in-time view)"""
+        with self._lock:
+            if not 0 <= version <= self.version:
+                raise ValueError(f"Version inconnue : {version}")
+            return self._log.rewind(self._projects, version)
+
+    # ------------------------------------------------------------------
+    # Reporting periods
+    # ------------------------------------------------------------------
+
+    @property
+    def _periods_path(self):
+        return os.path.join(os.path.dirname(self.path), "periods.json")
+
+    def periods(self):
+        """Named reporting periods: ``{label: {"version", "taken_at"}}``"""
+        if not os.path.exists(self._periods_path):
+            return {}
+        with open(self._periods_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def mark_period(self, label):
+        """Name the current version (e.g. "T3 2026") so it can be compared later"""
+        with self._exclusive():
+            periods = self.periods()
+            periods[label] = {"version": self.version, "taken_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+            directory = os.path.dirname(self._periods_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self._periods_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(periods, f, ensure_ascii=False)
+            os.replace(tmp_path, self._periods_path)
+            return periods[label]
+
+
+class TenantRegistry:
+    """
+    Partition projects per client portfolio (tenant)
+
+    Each tenant lives in its own file under ``<data_dir>/tenants/<tenant_id>/``
+    and is loaded on first access. Only the most recently used tenants are
+    kept in memory, so memory grows with active tenants rather than with the
+    total number of portfolios, and a large client never shares caches or
+    indexes with a small one.
+    """
+
+    def __init__(self, data_dir=None, max_active=MAX_ACTIVE_TENANTS):
+        self.root = os.path.join(data_dir or DEFAULT_DATA_DIR, "tenants")
+        self.max_active = max_active
+        self._stores = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, tenant_id):
+        if not TENANT_ID_PATTERN.match(tenant_id or ""):
+            raise ValueError(f"Identifiant de portefeuille invalide : {tenant_id!r}")
+        return os.path.join(self.root, tenant_id, "projects.json")
+
+    def get(self, tenant_id=DEFAULT_TENANT):
+        """Return the store of a tenant, loading it if needed"""
+        path = self._path(tenant_id)
+        with self._lock:
+            store = self._stores.get(tenant_id)
+            if store is not None:
+                self._stores.move_to_end(tenant_id)
+                return store
+
+        # Parse outside the registry lock so loading a large portfolio never
+        # blocks requests for tenants that are already in memory
+        loaded = ProjectStore(path, FileCache(os.path.join(os.path.dirname(path), CACHE_DIR)))
+        with self._lock:
+            store = self._stores.setdefault(tenant_id, loaded)
+            self._stores.move_to_end(tenant_id)
+            while len(self._stores) > self.max_active:
+                # Evicted tenants are simply reloaded from disk on next access
+                self._stores.popitem(last=False)
+            return store
+
+    def create(self, tenant_id):
+        """Create an empty tenant on disk (listed by every process) and return its store"""
+        os.makedirs(os.path.dirname(self._path(tenant_id)), exist_ok=True)
+        return self.get(tenant_id)
+
+    def list_tenants(self):
+        """All tenants known on disk, loaded or not"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if TENANT_ID_PATTERN.match(name) and os.path.isdir(os.path.join(self.root, name))
+        )
+
+    def active_tenants(self):
+        """Tenants currently held in memory, least recently used first"""
+        with self._lock:
+            return list(self._stores)
+
+    def unload(self, tenant_id):
+        with self._lock:
+            self._stores.pop(tenant_id, None)
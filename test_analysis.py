@@ -0,0 +1,28 @@
+"""
+Analysis Tests for RSE Sport Monitoring Platform
+Read-only SQL over the DuckDB portfolio connection
+"""
+
+import pytest
+
+from analysis import AnalysisError, PortfolioAnalysis
+from mock_data import generate_mock_projects
+
+
+@pytest.fixture(scope="module")
+def analysis():
+    return PortfolioAnalysis(generate_mock_projects(3))
+
+
+def test_sql_query_ending_with_a_comment(analysis):
+    result = analysis.sql("SELECT count(*) AS n FROM projects -- total")
+    assert result.column("n").to_pylist() == [3]
+
+
+def test_sql_rows_are_limited(analysis):
+    assert analysis.sql("SELECT * FROM projects", max_rows=2).num_rows == 2
+
+
+def test_sql_rejects_other_statements(analysis):
+    with pytest.raises(AnalysisError):
+        analysis.sql("DELETE FROM projects")
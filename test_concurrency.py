@@ -0,0 +1,171 @@
+"""
+Concurrency Tests for RSE Sport Monitoring Platform
+Concurrent edits of the shared project stores: field-level merge of
+non-overlapping edits, conflicts answered with 409, undo/redo across
+snapshot rotations seen by other processes, and tenants loading without
+holding up requests for the others
+"""
+
+import asyncio
+import threading
+
+import httpx
+
+import pytest
+from starlette.testclient import TestClient
+
+import api
+from history import SNAPSHOT_INTERVAL
+from storage import ProjectStore, TenantRegistry
+
+PROJECT = {"name": "Académie de football", "organization": "Durabilis", "sports": ["Football"], "budget": 45000}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "projects.json")
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(api, "tenants", TenantRegistry(str(tmp_path)))
+    return TestClient(api.app)
+
+
+def test_concurrent_non_overlapping_edits_are_merged(path):
+    project = ProjectStore(path).create(dict(PROJECT))
+    # Two processes editing different fields from the same revision
+    stores = [ProjectStore(path), ProjectStore(path)]
+    edits = [{"name": "Académie de football de Thiès"}, {"budget": 60000}]
+    start = threading.Barrier(len(stores))
+    errors = []
+
+    def edit(store, changes):
+        start.wait()
+        try:
+            store.update(project["id"], changes, expected_revision=project["revision"])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=edit, args=pair) for pair in zip(stores, edits)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    merged = ProjectStore(path).get(project["id"])
+    assert merged["name"] == "Académie de football de Thiès"
+    assert merged["budget"] == 60000
+    assert merged["revision"] == project["revision"] + 2
+
+
+def test_conflicting_edit_returns_409(client):
+    created = client.post("/projects", json=PROJECT)
+    project_id, etag = created.json()["id"], created.headers["etag"]
+
+    first = client.patch(f"/projects/{project_id}", json={"budget": 50000}, headers={"If-Match": etag})
+    assert first.status_code == 200
+    # Same field edited from the revision the first edit replaced
+    second = client.patch(f"/projects/{project_id}", json={"budget": 55000}, headers={"If-Match": etag})
+    assert second.status_code == 409
+    assert second.json()["fields"] == ["budget"]
+    assert second.json()["current"]["budget"] == 50000
+    assert client.get(f"/projects/{project_id}").json()["budget"] == 50000
+
+
+def test_undo_redo_across_snapshot_rotation(path):
+    store = ProjectStore(path)
+    project = store.create(dict(PROJECT))
+    # Enough edits to take a snapshot and rotate the log in the middle
+    for i in range(SNAPSHOT_INTERVAL + 5):
+        store.update(project["id"], {"budget": 1000 * (i + 1)})
+    last = 1000 * (SNAPSHOT_INTERVAL + 5)
+
+    # Another process starts from the snapshot plus the live log
+    other = ProjectStore(path)
+    assert other.get(project["id"])["budget"] == last
+    for _ in range(10):
+        assert other.undo() is not None
+    assert other.get(project["id"])["budget"] == last - 10 * 1000
+
+    # The first process reads those undos back and redoes one
+    store.refresh()
+    assert store.get(project["id"])["budget"] == last - 10 * 1000
+    assert store.redo() is not None
+    other.refresh()
+    assert other.get(project["id"])["budget"] == last - 9 * 1000
+    assert other.next_redo() is not None
+
+
+def test_refresh_between_snapshot_and_log_rotation(path):
+    writer, reader = ProjectStore(path), ProjectStore(path)
+    project = writer.create(dict(PROJECT))
+    rotate = writer._log.rotate
+
+    def rotate_after_reader(*args):
+        # The reader sees the new snapshot while the log is not rotated yet
+        reader.refresh()
+        rotate(*args)
+
+    writer._log.rotate = rotate_after_reader
+    for i in range(SNAPSHOT_INTERVAL):
+        writer.update(project["id"], {"budget": i})
+    writer._log.rotate = rotate
+
+    for budget in (70000, 80000):
+        writer.update(project["id"], {"budget": budget})
+        reader.refresh()
+        assert reader.version == writer.version
+        assert reader.get(project["id"])["budget"] == budget
+
+
+def test_undo_read_back_against_stacks_without_its_target(path):
+    store = ProjectStore(path)
+    project = store.create(dict(PROJECT))
+    store.update(project["id"], {"budget": 50000})
+    other = ProjectStore(path)
+    # As restored from a snapshot older than the edits being undone
+    other._log._undo = []
+    store.undo()
+    store.redo()
+    store.undo()
+
+    other.refresh()
+    assert other.get(project["id"])["budget"] == PROJECT["budget"]
+    assert other.next_redo()["version"] == store.next_redo()["version"]
+
+
+def test_slow_tenant_load_does_not_block_other_tenants(tmp_path, monkeypatch):
+    registry = TenantRegistry(str(tmp_path))
+    registry.create("small").create(dict(PROJECT))
+    registry.create("large")
+    registry.unload("large")
+    monkeypatch.setattr(api, "tenants", registry)
+
+    answered = threading.Event()
+    released = []
+    load = ProjectStore._load
+
+    def slow_load(store):
+        # The large portfolio loads until the small tenant has answered
+        if "large" in store.path:
+            released.append(answered.wait(2))
+        load(store)
+
+    monkeypatch.setattr(ProjectStore, "_load", slow_load)
+
+    async def requests():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            large = asyncio.ensure_future(client.get("/tenants/large/projects"))
+            await asyncio.sleep(0.1)
+            small = await client.get("/tenants/small/projects")
+            answered.set()
+            return small, await large
+
+    small, large = asyncio.run(requests())
+    assert released == [True]
+    assert small.status_code == 200
+    assert small.json()["total"] == 1
+    assert large.status_code == 200
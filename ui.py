@@ -0,0 +1,417 @@
+"""
+Streamlit Components for RSE Sport Monitoring Platform
+Branding, project form, CSV import and tenant registry shared by the Streamlit
+entry points (app.py and the data entry app, app_backup.py); everything that
+does not depend on a session is built once per process
+"""
+
+import os
+import re
+
+import pandas as pd
+import streamlit as st
+from datetime import datetime
+
+from catalogs import (
+    SPORTS_LIST, ALL_SPORTS, SDGS, SDG_OPTIONS, AGENDA_2063, COUNTRIES, SPORT_LEVELS, TARGET_AUDIENCES,
+    IMPACT_LEVELS, MONITORING_TOOLS, MONITORING_FREQUENCIES
+)
+from sport_catalog import SPORT_CATALOG
+from storage import TenantRegistry
+from validation import ValidationError, normalize_batch, normalize_project
+
+# ============================================================================
+# DURABILIS & CO BRANDING - FIXED SIDEBAR CONTRAST
+# ============================================================================
+
+DURABILIS_COLORS = {
+    "primary_blue": "#00A9E0",
+    "secondary_blue": "#2E3192",
+    "dark_grey": "#58595B",
+    "light_grey": "#BCBEC0",
+    "white": "#FFFFFF",
+    "accent": "#00A9E0"
+}
+
+BRANDING_CSS = f"""
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700&display=swap');
+    
+    * {{
+        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
+    }}
+    
+    .main {{
+        padding: 1.5rem 2rem;
+        background-color: #f8f9fa;
+    }}
+    
+    h1, h2, h3 {{
+        color: {DURABILIS_COLORS['secondary_blue']};
+        font-weight: 700;
+    }}
+    
+    /* CRITICAL FIX: Sidebar contrast */
+    [data-testid="stSidebar"] {{
+        background-color: {DURABILIS_COLORS['secondary_blue']};
+    }}
+    
+    [data-testid="stSidebar"] * {{
+        color: white !important;
+    }}
+    
+    [data-testid="stSidebar"] .stRadio > label {{
+        color: white !important;
+        font-weight: 600;
+    }}
+    
+    [data-testid="stSidebar"] .stRadio > div {{
+        background-color: rgba(255, 255, 255, 0.1);
+        padding: 0.5rem;
+        border-radius: 6px;
+    }}
+    
+    [data-testid="stSidebar"] .stRadio label[data-baseweb="radio"] {{
+        background-color: rgba(255, 255, 255, 0.15);
+        padding: 0.75rem;
+        border-radius: 6px;
+        margin: 0.25rem 0;
+        transition: all 0.3s ease;
+    }}
+    
+    [data-testid="stSidebar"] .stRadio label[data-baseweb="radio"]:hover {{
+        background-color: {DURABILIS_COLORS['primary_blue']};
+        transform: translateX(4px);
+    }}
+    
+    [data-testid="stSidebar"] .stRadio input:checked + div {{
+        background-color: {DURABILIS_COLORS['primary_blue']} !important;
+    }}
+    
+    [data-testid="stSidebar"] h1, 
+    [data-testid="stSidebar"] h2, 
+    [data-testid="stSidebar"] h3 {{
+        color: white !important;
+    }}
+    
+    [data-testid="stSidebar"] hr {{
+        border-color: rgba(255, 255, 255, 0.3);
+    }}
+    
+    /* Title banner */
+    .platform-title {{
+        background: linear-gradient(135deg, {DURABILIS_COLORS['secondary_blue']} 0%, {DURABILIS_COLORS['primary_blue']} 100%);
+        padding: 2rem;
+        border-radius: 12px;
+        color: white;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }}
+    
+    .platform-title h1 {{
+        color: white !important;
+        margin: 0;
+        font-size: 2.5rem;
+        font-weight: 700;
+    }}
+    
+    .platform-subtitle {{
+        color: rgba(255, 255, 255, 0.9);
+        font-size: 1.1rem;
+        margin-top: 0.5rem;
+    }}
+    
+    /* Buttons */
+    .stButton > button {{
+        background-color: {DURABILIS_COLORS['primary_blue']};
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 0.5rem 1.5rem;
+        font-weight: 600;
+        transition: all 0.3s ease;
+    }}
+    
+    .stButton > button:hover {{
+        background-color: {DURABILIS_COLORS['secondary_blue']};
+        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.15);
+    }}
+    
+    /* Tabs */
+    .stTabs [data-baseweb="tab-list"] {{
+        gap: 8px;
+    }}
+    
+    .stTabs [data-baseweb="tab"] {{
+        background-color: white;
+        border-radius: 6px 6px 0 0;
+        color: {DURABILIS_COLORS['dark_grey']};
+        font-weight: 600;
+    }}
+    
+    .stTabs [aria-selected="true"] {{
+        background-color: {DURABILIS_COLORS['primary_blue']};
+        color: white;
+    }}
+    
+    /* Metrics */
+    .metric-card {{
+        background: white;
+        padding: 1.5rem;
+        border-radius: 8px;
+        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.06);
+        border-left: 4px solid {DURABILIS_COLORS['primary_blue']};
+    }}
+    
+    @media (max-width: 768px) {{
+        .main {{
+            padding: 1rem;
+        }}
+        .platform-title h1 {{
+            font-size: 1.8rem;
+        }}
+    }}
+    </style>
+    """
+
+TITLE_BANNER = """
+    <div class="platform-title">
+        <h1>📊 Data Monitoring – Projet RSE & Sport</h1>
+        <p class="platform-subtitle">Plateforme de suivi et d'analyse des projets RSE dans le secteur sportif | Durabilis & Co</p>
+    </div>
+    """
+
+FOOTER = """
+<div style='text-align: center; color: #58595B; padding: 1rem;'>
+    <p><strong>Durabilis & Co</strong> - Data & Impact</p>
+    <p style='font-size: 0.9rem;'>💻 Plateforme optimisée pour Desktop, Tablette et Mobile</p>
+</div>
+"""
+
+
+_MARKDOWN_SPECIALS = re.compile(r"([\\`*_{}\[\]()#+\-.!|~<>$:])")
+
+
+def escape_markdown(text):
+    """Text shown as is by st.markdown (no emphasis, links, headings or HTML)"""
+    return _MARKDOWN_SPECIALS.sub(r"\\\1", str(text))
+
+
+def branding():
+    """Durabilis & Co styles and title banner, at the top of every page"""
+    st.markdown(BRANDING_CSS, unsafe_allow_html=True)
+    st.markdown(TITLE_BANNER, unsafe_allow_html=True)
+
+
+def footer():
+    st.markdown("---")
+    st.markdown(FOOTER, unsafe_allow_html=True)
+
+
+# ============================================================================
+# DATA ACCESS
+# ============================================================================
+
+# Sessions only hold UI state. Projects, their history, reporting periods
+# and derived results live in the tenant stores under RSE_DATA_DIR, shared
+# with the REST API and with every worker process, so the app can run as
+# several replicas behind a load balancer.
+@st.cache_resource
+def tenant_registry():
+    """Tenant stores of this worker process, shared by both entry points"""
+    return TenantRegistry(os.environ.get("RSE_DATA_DIR"))
+
+
+# ============================================================================
+# PROJECT FORM
+# ============================================================================
+
+SPORT_CATEGORY_CHOICES = ("",) + tuple(SPORTS_LIST)
+SDG_CHECKBOX_LABELS = tuple(f"ODD {sdg['num']}: {sdg['title'][:30]}..." for sdg in SDGS)
+
+
+def project_form():
+    """
+    Four-tab project creation form; returns the normalized project when it
+    is submitted and valid, None otherwise (problems are shown in the page)
+    """
+    tabs = st.tabs([
+        "1️⃣ Informations Générales",
+        "2️⃣ Sport & Discipline",
+        "3️⃣ Alignement ODD / Agenda 2063",
+        "4️⃣ Indicateurs & Suivi"
+    ])
+    
+    with tabs[0]:
+        st.subheader("📝 Informations Générales du Projet")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            project_name = st.text_input("Nom du Projet *", placeholder="Ex: Programme Jeunesse Sportive 2024")
+            project_country = st.selectbox("Pays *", COUNTRIES)
+            project_start_date = st.date_input("Date de début *")
+        
+        with col2:
+            project_organization = st.text_input("Organisation/Porteur du projet *")
+            project_location = st.text_input("Localisation *")
+            project_end_date = st.date_input("Date de fin prévue")
+        
+        project_description = st.text_area("Description du projet *", height=120)
+        project_budget = st.number_input("Budget (en €)", min_value=0, step=1000, value=0)
+        project_beneficiaries = st.number_input("Nombre de bénéficiaires estimés", min_value=0, step=10, value=0)
+    
+    with tabs[1]:
+        st.subheader("⚽ Sport & Discipline")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            sport_category = st.selectbox("Catégorie de sport *", SPORT_CATEGORY_CHOICES)
+            sport_query = st.text_input("🔍 Rechercher un sport", placeholder="Ex: basket, para natation, swimming")
+            
+            if sport_category:
+                selected_sports = st.multiselect("Sélectionner le(s) sport(s) *", SPORTS_LIST[sport_category])
+            elif sport_query:
+                selected_sports = st.multiselect("Résultats de la recherche", SPORT_CATALOG.search(sport_query, limit=15))
+            else:
+                selected_sports = st.multiselect("Ou rechercher dans tous les sports", ALL_SPORTS)
+        
+        with col2:
+            sport_level = st.multiselect("Niveau de pratique *", SPORT_LEVELS)
+            
+            target_audience = st.multiselect("Public cible *", TARGET_AUDIENCES)
+        
+        sport_infrastructure = st.text_area("Infrastructures utilisées", height=80)
+    
+    with tabs[2]:
+        st.subheader("🌍 Alignement ODD (Agenda 2030) & Agenda 2063")
+        
+        st.markdown("##### 🎯 Objectifs de Développement Durable (ODD)")
+        
+        sdg_cols = st.columns(3)
+        selected_sdgs = []
+        
+        for idx, sdg in enumerate(SDGS):
+            with sdg_cols[idx % 3]:
+                if st.checkbox(SDG_CHECKBOX_LABELS[idx], key=f"sdg_{sdg['num']}"):
+                    selected_sdgs.append(SDG_OPTIONS[idx])
+        
+        st.markdown("---")
+        
+        st.markdown("##### 🌍 Agenda 2063 de l'Union Africaine")
+        selected_agenda_2063 = st.multiselect("Aspirations de l'Agenda 2063", AGENDA_2063)
+        
+        alignment_description = st.text_area("Description de l'alignement stratégique", height=100)
+    
+    with tabs[3]:
+        st.subheader("📈 Indicateurs & Suivi")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**Indicateurs quantitatifs**")
+            indicator_participants = st.number_input("Nombre de participants", min_value=0, step=1)
+            indicator_sessions = st.number_input("Nombre de sessions/événements", min_value=0, step=1)
+            indicator_hours = st.number_input("Heures d'activité totales", min_value=0, step=1)
+            
+        with col2:
+            st.markdown("**Indicateurs qualitatifs**")
+            impact_social = st.select_slider("Impact social", options=IMPACT_LEVELS, value="Moyen")
+            impact_environmental = st.select_slider("Impact environnemental", options=IMPACT_LEVELS, value="Moyen")
+            impact_economic = st.select_slider("Impact économique", options=IMPACT_LEVELS, value="Moyen")
+        
+        monitoring_tools = st.multiselect("Outils de suivi utilisés", MONITORING_TOOLS)
+        
+        monitoring_frequency = st.selectbox("Fréquence de suivi", MONITORING_FREQUENCIES)
+        
+        additional_notes = st.text_area("Notes et commentaires additionnels", height=100)
+    
+    st.markdown("---")
+    
+    col1, col2, col3 = st.columns([1, 1, 1])
+    
+    with col2:
+        submit_button = st.button("💾 Enregistrer le Projet", use_container_width=True, type="primary")
+    
+    if submit_button:
+        if not project_name or not project_organization:
+            st.error("❌ Veuillez remplir au minimum le nom du projet et l'organisation.")
+        elif not selected_sports:
+            st.error("❌ Veuillez sélectionner au moins un sport.")
+        else:
+            project_data = {
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "name": project_name,
+                "organization": project_organization,
+                "country": project_country,
+                "location": project_location,
+                "start_date": project_start_date,
+                "end_date": project_end_date,
+                "description": project_description,
+                "budget": project_budget,
+                "beneficiaries": project_beneficiaries,
+                "sports": selected_sports,
+                "sport_level": sport_level,
+                "target_audience": target_audience,
+                "infrastructure": sport_infrastructure,
+                "sdgs": selected_sdgs,
+                "agenda_2063": selected_agenda_2063,
+                "alignment_description": alignment_description,
+                "indicator_participants": indicator_participants,
+                "indicator_sessions": indicator_sessions,
+                "indicator_hours": indicator_hours,
+                "impact_social": impact_social,
+                "impact_environmental": impact_environmental,
+                "impact_economic": impact_economic,
+                "monitoring_tools": monitoring_tools,
+                "monitoring_frequency": monitoring_frequency,
+                "additional_notes": additional_notes
+            }
+            
+            try:
+                return normalize_project(project_data)
+            except ValidationError as e:
+                st.error(f"❌ Données invalides : {e}")
+    return None
+
+
+# ============================================================================
+# CSV IMPORT
+# ============================================================================
+
+def csv_import(store):
+    """Upload, preview and import a CSV of projects as one write; returns the number imported"""
+    uploaded_file = st.file_uploader(
+        "Choisir un fichier CSV",
+        type=["csv"],
+        help="Importez un fichier CSV contenant vos projets RSE (par exemple un export de la plateforme)"
+    )
+    
+    if not uploaded_file:
+        st.info("""
+        **Format CSV attendu:**
+        - Une ligne par projet
+        - Colonnes suggérées: name, organization, country, budget, beneficiaries, sports, sdgs, agenda_2063, etc.
+        """)
+        return 0
+    
+    try:
+        df = pd.read_csv(uploaded_file)
+    except Exception as e:
+        st.error(f"❌ Erreur lors du chargement du fichier: {str(e)}")
+        return 0
+    
+    st.success(f"✅ Fichier chargé avec succès! {len(df)} projets trouvés.")
+    st.dataframe(df, use_container_width=True)
+    
+    if not st.button("📂 Importer ces projets"):
+        return 0
+    
+    projects, rejected = normalize_batch(df)
+    if projects:
+        store.create_many(projects)
+        st.success(f"{len(projects)} projet(s) importé(s) dans le portefeuille.")
+    for row, errors in rejected:
+        st.warning(f"Ligne {row} ignorée : {'; '.join(errors)}")
+    return len(projects)
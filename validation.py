@@ -0,0 +1,343 @@
+"""
+Project Validation for RSE Sport Monitoring Platform
+Single normalization pipeline applied wherever projects enter the platform
+(creation form, edit form, mock data, CSV import, REST API)
+"""
+
+import re
+from datetime import date, datetime
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from catalogs import SDG_OPTIONS, AGENDA_2063, IMPACT_LEVELS, fold
+from models import PROJECT_FIELDS
+from sport_catalog import SPORT_CATALOG
+
+REQUIRED_FIELDS = ("name", "organization")
+LIST_SEPARATORS = re.compile(r"\s*[;,|]\s*")
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d", "%d.%m.%Y")
+
+_SDG_NUMBER = re.compile(r"^(?:ODD|SDG|OBJECTIF)?\s*(\d{1,2})\b", re.IGNORECASE)
+_ASPIRATION_NUMBER = re.compile(r"^(?:ASPIRATION)?\s*(\d)\b", re.IGNORECASE)
+_NUMBER_NOISE = re.compile(r"[\s\u00a0\u202f€$]|EUR|FCFA", re.IGNORECASE)
+
+
+class ValidationError(ValueError):
+    """Raised when a project cannot be normalized; carries every problem found"""
+
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+_IMPACTS = {fold(level): level for level in IMPACT_LEVELS}
+
+
+# ============================================================================
+# FIELD COERCERS
+# ============================================================================
+
+def _is_missing(value):
+    if value is None:
+        return True
+    if isinstance(value, float) and value != value:
+        return True
+    return isinstance(value, str) and not value.strip()
+
+
+def coerce_text(value):
+    return "" if _is_missing(value) else str(value).strip()
+
+
+def coerce_list(value):
+    """Accept lists, tuples or separated strings ('Football; Basketball', exported "('Football', 'Basketball')")"""
+    if _is_missing(value):
+        return []
+    if isinstance(value, str):
+        value = value.strip().strip("[]()")
+        items = (item.strip().strip("'\"") for item in LIST_SEPARATORS.split(value))
+        return [item for item in items if item]
+    return [str(item).strip() for item in value if not _is_missing(item)]
+
+
+def _grouped(text, separator):
+    """Whether ``text`` is an integer written with ``separator`` between groups of three digits"""
+    return re.fullmatch(rf"[+-]?[1-9]\d{{0,2}}(?:{re.escape(separator)}\d{{3}})+", text) is not None
+
+
+def parse_number(value):
+    """
+    Parse '45 000 €', '45,000', '1.234.567,89' or '45000,5'; NaN when
+    unreadable or ambiguous
+
+    A separator followed by groups of exactly three digits separates
+    thousands; otherwise a single separator is the decimal point. With both
+    separators, the last one is the decimal point.
+    """
+    if _is_missing(value):
+        return 0
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    cleaned = _NUMBER_NOISE.sub("", str(value))
+    separators = {c for c in cleaned if c in ",."}
+    if len(separators) == 2:
+        decimal = "," if cleaned.rindex(",") > cleaned.rindex(".") else "."
+        thousands = "." if decimal == "," else ","
+        integer, _, fraction = cleaned.rpartition(decimal)
+        if not fraction.isdigit() or not _grouped(integer, thousands):
+            return float("nan")
+        cleaned = f"{integer.replace(thousands, '')}.{fraction}"
+    elif separators:
+        separator = separators.pop()
+        if _grouped(cleaned, separator):
+            cleaned = cleaned.replace(separator, "")
+        elif cleaned.count(separator) == 1:
+            cleaned = cleaned.replace(separator, ".")
+        else:
+            return float("nan")
+    try:
+        return float(cleaned)
+    except ValueError:
+        return float("nan")
+
+
+def coerce_number(value, field):
+    number = parse_number(value)
+    if number != number:
+        raise ValidationError([f"{field} : valeur numérique invalide ({value!r})"])
+    if number < 0:
+        raise ValidationError([f"{field} : la valeur ne peut pas être négative"])
+    return int(number) if float(number).is_integer() else float(number)
+
+
+def coerce_date(value, field):
+    """Return an ISO 'YYYY-MM-DD' string (empty when unknown)"""
+    if _is_missing(value) or str(value).strip() in ("None", "NaT"):
+        return ""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value).strip()[:10]
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    raise ValidationError([f"{field} : date invalide ({value!r})"])
+
+
+def _catalog_labels(values, pattern, options):
+    labels = []
+    for value in coerce_list(values) if not isinstance(values, int) else [values]:
+        match = pattern.match(str(value).strip())
+        if match and 1 <= int(match.group(1)) <= len(options):
+            label = options[int(match.group(1)) - 1]
+            if label not in labels:
+                labels.append(label)
+    return labels
+
+
+def coerce_sdgs(values):
+    """Map 3, '3', 'ODD 3', 'SDG 3' or the full label to the canonical label"""
+    return _catalog_labels(values, _SDG_NUMBER, SDG_OPTIONS)
+
+
+def coerce_aspirations(values):
+    return _catalog_labels(values, _ASPIRATION_NUMBER, AGENDA_2063)
+
+
+def coerce_sports(values):
+    """Canonical catalog sport for a known name or alias ('Basket'), input kept as typed otherwise"""
+    sports = []
+    for value in coerce_list(values):
+        sport = SPORT_CATALOG.resolve(value) or value
+        if sport not in sports:
+            sports.append(sport)
+    return sports
+
+
+def coerce_impact(value):
+    return _IMPACTS.get(fold(value), "Moyen") if not _is_missing(value) else "Moyen"
+
+
+NUMBER_FIELDS = ("budget", "beneficiaries", "indicator_participants", "indicator_sessions", "indicator_hours")
+DATE_FIELDS = ("start_date", "end_date")
+MAPPED_FIELDS = {
+    "sports": coerce_sports,
+    "sport_level": coerce_list,
+    "target_audience": coerce_list,
+    "sdgs": coerce_sdgs,
+    "agenda_2063": coerce_aspirations,
+    "impact_social": coerce_impact,
+    "impact_environmental": coerce_impact,
+    "impact_economic": coerce_impact,
+    "monitoring_tools": coerce_list,
+}
+
+
+def _compile():
+    """Field -> coercer table, built once at import time in the legacy field order"""
+    coercers = {}
+    for field in PROJECT_FIELDS:
+        if field in NUMBER_FIELDS:
+            coercers[field] = partial(coerce_number, field=field)
+        elif field in DATE_FIELDS:
+            coercers[field] = partial(coerce_date, field=field)
+        else:
+            coercers[field] = MAPPED_FIELDS.get(field, coerce_text)
+    return coercers
+
+
+FIELD_COERCERS = _compile()
+_COMPILED = tuple(FIELD_COERCERS.items())
+
+
+# ============================================================================
+# SINGLE RECORD
+# ============================================================================
+
+def _check_required(project, errors):
+    for field in REQUIRED_FIELDS:
+        if not project[field]:
+            errors.append(f"{field} : champ obligatoire")
+    if not project["sports"]:
+        errors.append("sports : au moins un sport est requis")
+
+
+def normalize_project(data, require=True):
+    """
+    Return a complete, canonical project dictionary
+
+    Every legacy field is present with its canonical type, so consumers can
+    index it directly instead of defending with ``.get(..., default)``.
+    """
+    project = {}
+    errors = []
+    for field, coerce in _COMPILED:
+        try:
+            project[field] = coerce(data.get(field))
+        except ValidationError as e:
+            errors.extend(e.errors)
+    if not project["timestamp"]:
+        project["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if require and not errors:
+        _check_required(project, errors)
+    if errors:
+        raise ValidationError(errors)
+    if data.get("id") is not None:
+        project["id"] = data.get("id")
+    return project
+
+
+def normalize_changes(changes):
+    """Normalize a partial update (only the provided fields)"""
+    normalized = {}
+    errors = []
+    for field, value in changes.items():
+        if field not in FIELD_COERCERS:
+            continue
+        try:
+            normalized[field] = FIELD_COERCERS[field](value)
+        except ValidationError as e:
+            errors.extend(e.errors)
+    for field in REQUIRED_FIELDS + ("sports",):
+        if field in normalized and not normalized[field]:
+            errors.append(f"{field} : champ obligatoire")
+    if errors:
+        raise ValidationError(errors)
+    return normalized
+
+
+# ============================================================================
+# BATCH (CSV IMPORT)
+# ============================================================================
+
+def _map_unique(series, coerce):
+    """Apply a coercer once per distinct value (imports repeat values a lot)"""
+    try:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    except TypeError:
+        # Unhashable cells (lists coming from JSON): fall back to a keyed cache
+        cache = {}
+
+        def lookup(value):
+            key = tuple(value) if isinstance(value, list) else value
+            if key not in cache:
+                cache[key] = coerce(value)
+            return cache[key]
+
+        return series.map(lookup)
+    # The extra trailing slot is selected by the -1 code of missing cells
+    coerced = np.empty(len(uniques) + 1, dtype=object)
+    coerced[:] = [coerce(value) for value in uniques] + [coerce(None)]
+    return pd.Series(coerced[codes], index=series.index, dtype=object)
+
+
+def _numeric_column(series):
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.fillna(0).astype("float64")
+    return _map_unique(series, parse_number).astype("float64")
+
+
+def _date_column(series):
+    text = series.astype("string").str.strip().str[:10]
+    parsed = pd.to_datetime(text, format="%Y-%m-%d", errors="coerce")
+    for fmt in DATE_FORMATS[1:]:
+        missing = parsed.isna() & text.notna() & (text != "")
+        if not missing.any():
+            break
+        parsed = parsed.fillna(pd.to_datetime(text.where(missing), format=fmt, errors="coerce"))
+    invalid = parsed.isna() & text.notna() & (text != "")
+    return parsed.dt.strftime("%Y-%m-%d").fillna(""), invalid
+
+
+def normalize_batch(frame):
+    """
+    Normalize an imported table column by column
+
+    Returns ``(projects, rejected)`` where ``projects`` is a list of complete
+    project dictionaries and ``rejected`` a list of ``(row_number, errors)``.
+    """
+    df = frame if isinstance(frame, pd.DataFrame) else pd.DataFrame(list(frame))
+    df = df.reset_index(drop=True)
+    out = pd.DataFrame(index=df.index)
+    errors = pd.Series([[] for _ in range(len(df))], index=df.index, dtype=object)
+
+    def column(field):
+        return df[field] if field in df.columns else pd.Series([None] * len(df), index=df.index, dtype=object)
+
+    for field in PROJECT_FIELDS:
+        series = column(field)
+        if field in MAPPED_FIELDS:
+            out[field] = _map_unique(series, MAPPED_FIELDS[field])
+        elif field in DATE_FIELDS:
+            out[field], invalid = _date_column(series)
+            for row in invalid[invalid].index:
+                errors[row].append(f"{field} : date invalide ({series[row]!r})")
+        elif field in NUMBER_FIELDS:
+            numbers = _numeric_column(series)
+            for row in numbers[numbers.isna() | (numbers < 0)].index:
+                errors[row].append(f"{field} : valeur numérique invalide ({series[row]!r})")
+            numbers = numbers.fillna(0).clip(lower=0)
+            integral = (numbers % 1 == 0).all()
+            out[field] = numbers.astype("int64") if integral else numbers.astype("float64")
+        else:
+            out[field] = series.astype("string").str.strip().fillna("").astype(object)
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    out["timestamp"] = out["timestamp"].where(out["timestamp"] != "", now)
+    for field in REQUIRED_FIELDS:
+        for row in out.index[out[field] == ""]:
+            errors[row].append(f"{field} : champ obligatoire")
+    for row in out.index[out["sports"].map(len) == 0]:
+        errors[row].append("sports : au moins un sport est requis")
+
+    valid = errors.map(len) == 0
+    kept = out.loc[valid]
+    columns = [kept[field].tolist() for field in PROJECT_FIELDS]
+    projects = [dict(zip(PROJECT_FIELDS, row)) for row in zip(*columns)]
+    rejected = [(row + 1, errors[row]) for row in errors.index[~valid]]
+    return projects, rejected
@@ -0,0 +1,235 @@
+"""
+Worker Workspace for RSE Sport Monitoring Platform
+Per-process view of the shared tenant stores for the Streamlit app: projects,
+incremental indexes and period snapshots, brought up to date with the writes
+of every worker at each rerun, counted per viewing session
+"""
+
+import os
+import sys
+import threading
+import types
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from benchmarking import Benchmark
+from scoring import ImpactModel
+from search import SearchIndex
+from similarity import SimilarityIndex
+from snapshots import PortfolioSnapshot
+
+# Same incremental indexes and snapshot cache size as the REST API
+INDEXES = {
+    "benchmark": Benchmark, "similarity": SimilarityIndex, "search": SearchIndex, "impact": ImpactModel,
+}
+SNAPSHOT_CACHE = 8
+
+_workspaces = weakref.WeakKeyDictionary()
+_workspaces_lock = threading.Lock()
+# Workspace each session handle is attached to
+_attached = weakref.WeakKeyDictionary()
+
+
+class PortfolioHandle:
+    """
+    What a session keeps of a portfolio: its tenant and the store version it
+    last read. The projects themselves stay in the shared Workspace, which
+    counts the live handles attached to it.
+    """
+
+    __slots__ = ("tenant_id", "version", "__weakref__")
+
+    def __init__(self, tenant_id, version=None):
+        self.tenant_id = tenant_id
+        self.version = version
+
+    def __repr__(self):
+        return f"PortfolioHandle({self.tenant_id!r}, version={self.version})"
+
+
+class Workspace:
+    """
+    Read-only projects of one tenant store, shared by the sessions of a
+    worker process
+
+    Sessions only keep UI state and send every write to the store, so all
+    workers behind a load balancer see it at their next rerun. Projects are
+    the store's own dictionaries (one copy per process); the store keeps
+    the dictionary of a project whose revision did not change, so the
+    identity-tracked indexes only follow the projects actually written.
+    Indexes are shared by the sessions: query them under ``lock``.
+
+    Sessions attach a PortfolioHandle (kept in their session state) instead
+    of holding projects, so a portfolio costs the same whatever the number
+    of viewers. Handles are only weakly referenced: a handle dropped with
+    its session no longer counts, and the indexes and snapshots of a
+    workspace nobody views are released (see release_idle).
+    """
+
+    def __init__(self):
+        self.version = None
+        self.projects = ()
+        self._indexes = {}
+        self._snapshots = OrderedDict()
+        self._viewers = weakref.WeakSet()
+        self.lock = threading.RLock()
+
+    def sync(self, store):
+        """Catch up with the store and return the current projects (a read-only tuple)"""
+        with self.lock:
+            store.refresh()
+            if store.version != self.version:
+                self.projects = tuple(store.list_projects())
+                self.version = store.version
+            return self.projects
+
+    def open(self, store, handle):
+        """Attach a session handle (moving it from its previous workspace), sync and return the projects"""
+        with _workspaces_lock:
+            previous = _attached.get(handle)
+            if previous is not self:
+                if previous is not None:
+                    previous._viewers.discard(handle)
+                _attached[handle] = self
+                self._viewers.add(handle)
+        projects = self.sync(store)
+        handle.version = self.version
+        return projects
+
+    @property
+    def viewers(self):
+        """Number of live session handles attached"""
+        return len(self._viewers)
+
+    def release(self):
+        """Drop the indexes and snapshots (rebuilt at the next sync)"""
+        with self.lock:
+            self.version = None
+            self.projects = ()
+            self._indexes = {}
+            self._snapshots = OrderedDict()
+
+    def index(self, kind):
+        """Benchmark, similarity, search index or impact model of the projects of the last sync"""
+        with self.lock:
+            entry = self._indexes.get(kind)
+            if entry is None:
+                entry = self._indexes[kind] = [self.version, INDEXES[kind](self.projects)]
+            elif entry[0] != self.version:
+                entry[1].sync(self.projects)
+                entry[0] = self.version
+            return entry[1]
+
+    def table(self, store):
+        """Memory-mapped ProjectTable of the current version (see ProjectStore.table)"""
+        with self.lock:
+            projects, version = self.projects, self.version
+        return store.table(projects, version)
+
+    def snapshot(self, store, version):
+        """Portfolio snapshot at ``version``, sharing chunks with the cached ones"""
+        with self.lock:
+            snapshot = self._snapshots.get(version)
+            if snapshot is not None:
+                self._snapshots.move_to_end(version)
+                return snapshot
+            projects = store.list_projects() if version == store.version else store.projects_at(version)
+            cache = self._snapshots
+            previous = cache[min(cache, key=lambda v: abs(v - version))] if cache else None
+            snapshot = cache[version] = PortfolioSnapshot.take(projects, previous, version)
+            while len(cache) > SNAPSHOT_CACHE:
+                cache.popitem(last=False)
+            return snapshot
+
+
+def workspace(store):
+    """Workspace of a tenant store (dropped with the store when its tenant is unloaded)"""
+    with _workspaces_lock:
+        found = _workspaces.get(store)
+        if found is None:
+            found = _workspaces[store] = Workspace()
+        return found
+
+
+def release_idle():
+    """Release the workspaces no session views any more; returns how many were"""
+    with _workspaces_lock:
+        candidates = [found for found in _workspaces.values() if found.version is not None]
+    released = 0
+    for found in candidates:
+        # A session attaching meanwhile syncs under the lock after us
+        with found.lock:
+            if not found.viewers:
+                found.release()
+                released += 1
+    return released
+
+
+# ============================================================================
+# MEMORY ACCOUNTING
+# ============================================================================
+
+def footprint(obj, seen=None):
+    """
+    Approximate bytes held by ``obj`` and everything it references, skipping
+    the objects already in ``seen`` (ids) so shared objects count once
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, (type, types.ModuleType, weakref.ref)):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, np.ndarray):
+            # Views report their header only: count the data of their base
+            if item.base is not None:
+                pending.append(item.base)
+            continue
+        if isinstance(item, (str, bytes, bytearray, int, float, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        else:
+            pending.extend(getattr(item, "__dict__", {}).values())
+            for name in getattr(type(item), "__slots__", ()):
+                if name != "__weakref__" and hasattr(item, name):
+                    pending.append(getattr(item, name))
+    return total
+
+
+def memory_report():
+    """
+    Memory held by this process per tenant::
+
+        [{"tenant", "version", "viewers", "projects", "store", "cache",
+          "indexes", "snapshots"}, ...]   # sizes in bytes
+
+    Objects shared between parts count once, in the first one listed
+    (indexes referencing the store's projects do not count them again).
+    """
+    with _workspaces_lock:
+        entries = list(_workspaces.items())
+    report = []
+    for store, found in entries:
+        parts = store.memory_parts()
+        with found.lock:
+            seen = set()
+            report.append({
+                "tenant": os.path.basename(os.path.dirname(store.path)),
+                "version": found.version,
+                "viewers": found.viewers,
+                "projects": len(found.projects),
+                "store": footprint(parts["store"], seen),
+                "cache": footprint(parts["cache"], seen),
+                "indexes": footprint(found._indexes, seen),
+                "snapshots": footprint(found._snapshots, seen),
+            })
+    return sorted(report, key=lambda entry: entry["tenant"])